@@ -1,30 +1,58 @@
+import asyncio
 import logging
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters import Command
 from aiogram.types import Message
-from bot.utils.chat_manager import get_chat_list
-from bot.config.flags import ANNOUNCE_ENABLE
+from bot.utils.chat_manager import get_active_chats, sync_chats
+from bot.utils.announce_jobs import (AnnounceJob,
+                                     LeaseLost,
+                                     autosave_job,
+                                     claim_job,
+                                     create_job,
+                                     hold_job,
+                                     list_jobs,
+                                     load_job,
+                                     prune_jobs,
+                                     release_job,
+                                     save_job)
+from bot.utils.broadcast import broadcast, report_progress
+from bot.utils.rate_limit import limiter
+from bot.utils.scheduler import cancel_tasks
+from bot.utils.stream_reply import split_text
+from bot.config.flags import ANNOUNCE_ENABLE, ANNOUNCE_STATUS_ENABLE
+from bot.config.settings import (BOT_ADMIN_IDS,
+                                 ANNOUNCE_MAX_CONCURRENT,
+                                 ANNOUNCE_PROGRESS_INTERVAL,
+                                 ANNOUNCE_JOB_SAVE_INTERVAL,
+                                 ANNOUNCE_JOBS_KEEP)
+
+logger = logging.getLogger(__name__)
+
+# Выполняющиеся задания рассылки: {job_id: AnnounceJob}
+active_jobs = {}
+# Фоновые задачи возобновлённых рассылок
+_background_tasks = set()
 
 
 async def send_announce_to_chat(chat,
                                 bot,
                                 announce_message=None,
-                                reply_to_message=None):
+                                forward_from=None):
     """
     Отправляет текст и/или пересылает сообщение в указанный чат.
+    Ошибки отправки пробрасываются вызывающему.
     :param chat: Словарь с информацией о чате {'id': <int>, 'title': <str>}
     :param bot: Экземпляр бота
     :param announce_message: Текст для отправки
-    :param reply_to_message: Сообщение для пересылки
+    :param forward_from: Кортеж (chat_id, message_id) сообщения для пересылки
     """
     chat_id = chat['id']
-    try:
-        if announce_message:
-            await bot.send_message(chat_id, announce_message)
-        if reply_to_message:
-            await reply_to_message.forward(chat_id)
-    except Exception as e:
-        logging.warning(f"Не удалось отправить сообщение в чат "
-                        f"{chat_id} ({chat['title']}): {e}")
+    if announce_message:
+        await limiter.call(chat_id, bot.send_message,
+                           chat_id, announce_message)
+    if forward_from:
+        await limiter.call(chat_id, bot.forward_message,
+                           chat_id, *forward_from)
 
 
 async def prepare_announce(message: Message):
@@ -52,34 +80,183 @@ async def prepare_announce(message: Message):
     return announce_message, reply_to_message
 
 
-async def send_announcements(chat_list,
-                             bot,
-                             announce_message,
-                             reply_to_message):
+async def run_announce_job(bot, job: AnnounceJob, status=None):
     """
-    Отправляет сообщения во все активные чаты.
-    :param chat_list: Список чатов
+    Выполняет рассылку по чатам задания, которые ещё не обработаны.
+    Состояние доставки периодически сохраняется на диск.
     :param bot: Экземпляр бота
-    :param announce_message: Текст для рассылки
-    :param reply_to_message: Сообщение для пересылки
+    :param job: Задание рассылки
+    :param status: Сообщение для отображения прогресса (необязательно)
+    :return: Задание с итоговым состоянием
+    :raises LeaseLost: Если задание перешло к другой копии бота;
+                       отправка при этом прекращается
     """
-    for chat in chat_list:
+    active_jobs[job.id] = job
+    holder = asyncio.create_task(hold_job(job))
+    tasks = [holder, asyncio.create_task(
+        autosave_job(job, ANNOUNCE_JOB_SAVE_INTERVAL))]
+    if status:
+        tasks.append(asyncio.create_task(
+            report_progress(status, job, ANNOUNCE_PROGRESS_INTERVAL)))
+
+    async def send(chat):
         await send_announce_to_chat(chat,
                                     bot,
-                                    announce_message,
-                                    reply_to_message)
+                                    job.data["announce_message"],
+                                    job.data["forward_from"])
+
+    delivery = asyncio.create_task(
+        broadcast(job.pending_chats(), send, job, ANNOUNCE_MAX_CONCURRENT))
+    tasks.append(delivery)
+    try:
+        await asyncio.wait([delivery, holder],
+                           return_when=asyncio.FIRST_COMPLETED)
+        if not delivery.done():
+            # Владение потеряно: hold_job завершилась с LeaseLost
+            delivery.cancel()
+            holder.result()
+        await delivery
+        job.finish()
+    finally:
+        await cancel_tasks(tasks)
+        save_job(job)
+        active_jobs.pop(job.id, None)
+        await release_job(job)
+    return job
+
+
+async def edit_status(status, text: str) -> bool:
+    """
+    Заменяет текст сообщения с прогрессом рассылки.
+    :param status: Сообщение с прогрессом или None
+    :param text: Новый текст
+    :return: True, если сообщение обновлено
+    """
+    if status is None:
+        return False
+    try:
+        await status.edit_text(text)
+    except TelegramAPIError as e:
+        logger.warning(f"Не удалось обновить статус рассылки: {e}")
+        return False
+    return True
+
+
+async def report_announce_result(bot, job: AnnounceJob, status=None):
+    """
+    Сообщает отправителю итог рассылки и список ошибок доставки.
+    :param bot: Экземпляр бота
+    :param job: Завершённое задание рассылки
+    :param status: Сообщение с прогрессом рассылки
+    """
+    chat_id = job.data["report_chat_id"]
+    summary = job.format()
+    if not job.failed:
+        summary += "\nСообщение отправлено во все активные чаты."
+    if not await edit_status(status, summary):
+        await bot.send_message(chat_id, summary)
+
+    if job.failed:
+        for part in split_text(job.format_failures()):
+            await bot.send_message(chat_id, part)
+
+
+async def run_and_report(bot, job: AnnounceJob, status=None):
+    """
+    Выполняет рассылку и сообщает итог. Если задание перешло
+    к другой копии бота, итог сообщит она.
+    """
+    try:
+        await run_announce_job(bot, job, status)
+    except LeaseLost as e:
+        logger.warning(str(e))
+        await edit_status(status, f"Рассылка {job.id} продолжается "
+                                  f"другой копией бота.")
+        return
+    await report_announce_result(bot, job, status)
+
+
+async def resume_job(bot, job: AnnounceJob):
+    """
+    Продолжает незавершённую рассылку после перезапуска бота.
+    """
+    logger.info(f"Возобновление рассылки {job.id}: "
+                f"осталось {job.remaining} чатов.")
+    status = None
+    try:
+        status = await bot.send_message(job.data["report_chat_id"],
+                                        f"Возобновляю рассылку {job.id}...")
+    except Exception as e:
+        logger.warning(f"Не удалось уведомить о возобновлении "
+                       f"рассылки {job.id}: {e}")
+    await run_and_report(bot, job, status)
+
+
+async def resume_announce_jobs(bot):
+    """
+    Запускает в фоне незавершённые задания рассылки, которые удалось
+    закрепить за этой копией бота.
+    :param bot: Экземпляр бота
+    """
+    for job in list_jobs():
+        if job.finished:
+            continue
+        # Файлы заданий общие: рассылку продолжает одна копия бота
+        if not await claim_job(job):
+            logger.info(f"Рассылка {job.id} выполняется другой копией бота.")
+            continue
+        task = asyncio.create_task(resume_job(bot, job))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+def check_access(message: Message, enabled: bool,
+                 admin_only: bool = True):
+    """
+    Проверяет доступ к командам рассылки (/announce, /announce_status).
+    :param message: Сообщение от пользователя
+    :param enabled: Флаг включения команды
+    :param admin_only: Команда только для администраторов бота
+                       (BOT_ADMIN_IDS)
+    :return: Текст отказа или None, если команда разрешена
+    """
+    if not enabled:
+        return "Команда временно отключена."
+    if admin_only and message.from_user.id not in BOT_ADMIN_IDS:
+        logger.warning(f"Попытка вызвать {message.text.split()[0]} "
+                       f"пользователем {message.from_user.id}.")
+        return "Команда доступна только администраторам бота."
+    if message.chat.type != "private":
+        return "Команда доступна только в личном чате с ботом."
+    return None
+
+
+def can_view_job(user_id: int, job: AnnounceJob) -> bool:
+    """
+    Состояние рассылки видят администраторы бота и её автор.
+    """
+    return user_id in BOT_ADMIN_IDS or job.data["created_by"] == user_id
+
+
+async def stop_announce_jobs():
+    """
+    Прерывает возобновлённые рассылки при остановке бота. Состояние
+    доставки сохраняется, и рассылка продолжится после перезапуска.
+    """
+    await cancel_tasks(list(_background_tasks))
 
 
 async def handle_announce(message: Message):
     """
     Обрабатывает команду /announce.
     """
-    if not ANNOUNCE_ENABLE:
-        return await message.answer("Команда временно отключена.")
+    refusal = check_access(message, ANNOUNCE_ENABLE)
+    if refusal:
+        return await message.answer(refusal)
 
     # Получаем список активных чатов
-    chat_list = [chat for chat in get_chat_list() if
-                 not chat.get("deleted", False)]
+    await sync_chats()
+    chat_list = get_active_chats()
     if not chat_list:
         return await message.answer("Нет активных чатов для отправки.")
 
@@ -87,16 +264,75 @@ async def handle_announce(message: Message):
     if not announce_message and not reply_to_message:
         return
 
-    await send_announcements(chat_list,
-                             message.bot,
-                             announce_message,
-                             reply_to_message)
-    await message.answer("Сообщение отправлено во все активные чаты.")
+    forward_from = None
+    if reply_to_message:
+        forward_from = (reply_to_message.chat.id, reply_to_message.message_id)
+    job = create_job(chat_list,
+                     created_by=message.from_user.id,
+                     report_chat_id=message.chat.id,
+                     announce_message=announce_message,
+                     forward_from=forward_from)
+    prune_jobs(ANNOUNCE_JOBS_KEEP)
+    await claim_job(job)
+
+    status = await message.answer(f"Начинаю рассылку {job.id} "
+                                  f"в {len(chat_list)} чатов...")
+    await run_and_report(message.bot, job, status)
+
+
+def format_job_status(job: AnnounceJob) -> str:
+    """
+    Формирует подробное описание состояния задания рассылки.
+    """
+    state = "завершена" if job.finished else "выполняется"
+    lines = [job.format(),
+             f"Статус: {state}",
+             f"Создана: {job.data['created_at']}"]
+    if job.failed:
+        lines.append(job.format_failures())
+    return "\n".join(lines)
+
+
+async def handle_announce_status(message: Message):
+    """
+    Обрабатывает команду /announce_status [job_id].
+    Без аргумента показывает последние рассылки.
+    """
+    refusal = check_access(message, ANNOUNCE_STATUS_ENABLE, admin_only=False)
+    if refusal:
+        return await message.answer(refusal)
+
+    user_id = message.from_user.id
+    args = message.text.split(maxsplit=1)
+    if len(args) > 1:
+        return await send_job_status(message, args[1].strip())
+
+    jobs = [active_jobs.get(job.id, job) for job in list_jobs()
+            if can_view_job(user_id, job)][:5]
+    if not jobs:
+        return await message.answer("Рассылок пока не было.")
+    await message.answer("Последние рассылки:\n"
+                         + "\n".join(job.format() for job in jobs))
+
+
+async def send_job_status(message: Message, job_id: str):
+    """
+    Отправляет подробное состояние рассылки, если она доступна
+    пользователю. Чужая рассылка считается ненайденной.
+    """
+    job = active_jobs.get(job_id) or load_job(job_id)
+    if not job or not can_view_job(message.from_user.id, job):
+        return await message.answer(f"Рассылка {job_id} не найдена.")
+    for part in split_text(format_job_status(job)):
+        await message.answer(part)
 
 
 def register_announce_handler(dp):
     """
-    Регистрирует обработчик команды /announce.
+    Регистрирует обработчики команд /announce и /announce_status.
     :param dp: Экземпляр Dispatcher
     """
     dp.message.register(handle_announce, Command(commands=["announce"]))
+    dp.message.register(handle_announce_status,
+                        Command(commands=["announce_status"]))
+    dp.shutdown.register(stop_announce_jobs)
@@ -1,57 +1,34 @@
 import random
-import json
-from pathlib import Path
 from datetime import datetime, timezone
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.utils.markdown import hlink
 from bot.config.flags import BEST_QA_ENABLE
+from bot.utils.storage import get_storage
+from bot.utils.admin_cache import get_chat_admins
+from bot.utils.participants import participant_index
+from bot.utils.state_backend import get_backend
 
-# Путь к файлам
-BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
-STATS_FILE = DATA_DIR / "best_qa_stats.json"
-LAST_WINNER_FILE = DATA_DIR / "last_winner.json"
-
-
-def ensure_config_directory():
-    """
-    Создаёт папку config, если её нет.
-    """
-    DATA_DIR.mkdir(exist_ok=True)
-
-
-def load_json(file_path):
-    """
-    Загружает данные из JSON-файла.
-    """
-    ensure_config_directory()
-    try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-
-def save_json(file_path, data):
-    """
-    Сохраняет данные в JSON-файл.
-    """
-    ensure_config_directory()
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
+# Последние победители по чатам: {chat_id: данные победителя или None}
+_last_winners = {}
 
 
 def update_last_winner(chat_id, chat_title, user_id, full_name, username):
     """
-    Обновляет данные о последнем победителе в JSON-файле.
+    Обновляет данные о последнем победителе в хранилище и в кэше.
     """
-    last_winner = load_json(LAST_WINNER_FILE)
-
-    chat_id = str(chat_id)
-    last_winner[chat_id] = {
+    last_datetime = datetime.now(timezone.utc).isoformat()
+    get_storage().set_last_winner(
+        chat_id=chat_id,
+        chat_title=chat_title,
+        last_datetime=last_datetime,
+        user_id=user_id,
+        full_name=full_name,
+        username=username
+    )
+    _last_winners[chat_id] = {
         "chat_title": chat_title,
-        "last_datetime": datetime.now(timezone.utc).isoformat(),
+        "last_datetime": last_datetime,
         "winner": {
             "user_id": user_id,
             "full_name": full_name,
@@ -59,39 +36,23 @@ def update_last_winner(chat_id, chat_title, user_id, full_name, username):
         }
     }
 
-    save_json(LAST_WINNER_FILE, last_winner)
-
 
 def update_stats(chat_id, chat_title, user_id, full_name, username):
     """
-    Обновляет статистику победителей в JSON-файле.
+    Обновляет статистику победителей в хранилище.
     """
-    stats = load_json(STATS_FILE)
-
-    chat_id = str(chat_id)
-    if chat_id not in stats:
-        stats[chat_id] = {"chat_title": chat_title, "winners": {}}
-
-    winners = stats[chat_id]["winners"]
-    user_key = str(user_id)
-
-    if user_key not in winners:
-        winners[user_key] = {
-            "full_name": full_name,
-            "username": username or "",
-            "wins": 0
-        }
-
-    winners[user_key]["wins"] += 1
-    save_json(STATS_FILE, stats)
+    get_storage().record_win(chat_id, chat_title, user_id,
+                             full_name, username)
 
 
 def get_last_winner(chat_id):
     """
-    Получает данные о последнем победителе из JSON-файла.
+    Получает данные о последнем победителе.
+    Хранилище читается только при первом обращении к чату.
     """
-    last_winner = load_json(LAST_WINNER_FILE)
-    return last_winner.get(str(chat_id))
+    if chat_id not in _last_winners:
+        _last_winners[chat_id] = get_storage().get_last_winner(chat_id)
+    return _last_winners[chat_id]
 
 
 def is_new_day(chat_id):
@@ -117,10 +78,16 @@ def is_new_day(chat_id):
 
 async def get_random_participant(bot, chat_id):
     """
-    Выбирает случайного участника из всех участников чата (исключая ботов).
+    Выбирает случайного участника среди недавно активных в чате.
+    Если активность ещё не накоплена, выбирает из администраторов
+    (исключая ботов).
     """
+    participant = participant_index.choose(chat_id)
+    if participant:
+        return participant
+
     members = []
-    admin_list = await bot.get_chat_administrators(chat_id)
+    admin_list = await get_chat_admins(bot, chat_id)
 
     for member in admin_list:
         if not member.user.is_bot:
@@ -129,6 +96,39 @@ async def get_random_participant(bot, chat_id):
     return random.choice(members) if members else None
 
 
+async def draw_best_qa(bot, chat_id, chat_title):
+    """
+    Выбирает лучшего тестировщика дня, если он ещё не выбран.
+    Одновременные вызовы для одного чата (в том числе из разных
+    копий бота) выполняются по очереди.
+    :return: Новый победитель или None, если победитель уже выбран
+             или участников не нашлось
+    """
+    backend = get_backend()
+    async with backend.lock(f"best_qa:{chat_id}"):
+        if backend.shared:
+            # Победителя могла выбрать другая копия бота
+            _last_winners.pop(chat_id, None)
+        if not is_new_day(chat_id):
+            return None
+        best_qa = await get_random_participant(bot, chat_id)
+        if not best_qa:
+            return None
+        update_last_winner(chat_id, chat_title, best_qa.id,
+                           best_qa.full_name, best_qa.username)
+        update_stats(chat_id, chat_title, best_qa.id,
+                     best_qa.full_name, best_qa.username)
+        return best_qa
+
+
+def format_winner(best_qa) -> str:
+    """
+    Формирует поздравление победителя (HTML).
+    """
+    mention = hlink(best_qa.full_name, f"tg://user?id={best_qa.id}")
+    return f"Сегодня лучший тестировщик {mention} 🎉"
+
+
 async def check_group_chat(message: Message):
     """
     Проверяет, выполняется ли команда в групповом чате.
@@ -161,31 +161,18 @@ async def select_best_qa(message: Message):
     """
     Выбирает случайного участника и уведомляет чат.
     """
-    best_qa = await get_random_participant(message.bot, message.chat.id)
+    best_qa = await draw_best_qa(message.bot,
+                                 message.chat.id,
+                                 message.chat.title or "Личный чат")
 
     if not best_qa:
+        if not is_new_day(message.chat.id):  # Выбран параллельным вызовом
+            await notify_best_qa(message)
+            return
         await message.reply("Не нашёл участников для выбора.")
         return
 
-    update_last_winner(
-        chat_id=message.chat.id,
-        chat_title=message.chat.title or "Личный чат",
-        user_id=best_qa.id,
-        full_name=best_qa.full_name,
-        username=best_qa.username
-    )
-
-    update_stats(
-        chat_id=message.chat.id,
-        chat_title=message.chat.title or "Личный чат",
-        user_id=best_qa.id,
-        full_name=best_qa.full_name,
-        username=best_qa.username
-    )
-
-    mention = hlink(best_qa.full_name, f"tg://user?id={best_qa.id}")
-    await message.answer(f"Сегодня лучший тестировщик "
-                         f"{mention} 🎉", parse_mode="HTML")
+    await message.answer(format_winner(best_qa), parse_mode="HTML")
 
 
 async def handle_best_qa(message: Message):
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from datetime import time
+from aiogram.filters import Command
+from aiogram.types import Message
+from bot.commands.best_qa import draw_best_qa, format_winner
+from bot.config.flags import BEST_QA_AUTO_ENABLE
+from bot.config.settings import (BEST_QA_DRAW_TIME_UTC,
+                                 BEST_QA_DRAW_BATCH_SIZE,
+                                 BEST_QA_DRAW_BATCH_PAUSE)
+from bot.utils.chat_manager import is_user_admin
+from bot.utils.rate_limit import limiter
+from bot.utils.scheduler import cancel_tasks, run_daily
+from bot.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+_draw_task = None
+
+
+async def announce_winner(bot, chat):
+    """
+    Выбирает лучшего тестировщика в чате и объявляет его.
+    Чаты, где победитель уже выбран, пропускаются.
+    :param bot: Экземпляр бота
+    :param chat: Словарь с информацией о чате {'id': <int>, 'title': <str>}
+    """
+    best_qa = await draw_best_qa(bot, chat["id"], chat["title"])
+    if best_qa is None:
+        return
+    await limiter.call(chat["id"], bot.send_message, chat["id"],
+                       format_winner(best_qa), parse_mode="HTML")
+
+
+async def run_daily_draw(bot):
+    """
+    Проводит выбор во всех чатах с включённым автоматическим выбором.
+    Чаты обрабатываются партиями; ошибка в одном чате
+    не влияет на остальные.
+    :param bot: Экземпляр бота
+    """
+    chats = get_storage().get_auto_draw_chats()
+    failed = 0
+    for start in range(0, len(chats), BEST_QA_DRAW_BATCH_SIZE):
+        batch = chats[start:start + BEST_QA_DRAW_BATCH_SIZE]
+        results = await asyncio.gather(
+            *(announce_winner(bot, chat) for chat in batch),
+            return_exceptions=True)
+        for chat, result in zip(batch, results):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.warning(f"Не удалось выбрать лучшего тестировщика "
+                               f"в чате {chat['id']} ({chat['title']}): "
+                               f"{result}")
+        await asyncio.sleep(BEST_QA_DRAW_BATCH_PAUSE)
+    logger.info(f"Ежедневный выбор завершён: чатов {len(chats)}, "
+                f"ошибок {failed}.")
+
+
+async def handle_best_qa_auto(message: Message):
+    """
+    Обработчик команды /best_qa_auto on|off.
+    Включает или выключает ежедневный автоматический выбор в чате.
+    """
+    if not BEST_QA_AUTO_ENABLE:
+        return await message.answer("Команда временно отключена.")
+
+    if message.chat.type == "private":
+        return await message.reply("Автоматический выбор возможен "
+                                   "только в групповых чатах.")
+
+    if not await is_user_admin(message):
+        return await message.reply("Команда доступна только "
+                                   "администраторам чата.")
+
+    args = message.text.split()[1:]
+    enabled = not args or args[0].lower() != "off"
+    get_storage().set_auto_draw(
+        message.chat.id,
+        message.chat.title,
+        enabled,
+        message.from_user.username or message.from_user.full_name
+    )
+    if enabled:
+        await message.answer(f"Лучший тестировщик будет выбираться "
+                             f"автоматически каждый день в "
+                             f"{BEST_QA_DRAW_TIME_UTC} UTC.")
+    else:
+        await message.answer("Автоматический выбор выключен.")
+
+
+async def start_daily_draw(bot):
+    """
+    Запускает расписание ежедневного выбора при старте бота.
+    Если сегодняшний выбор был пропущен, он выполняется сразу.
+    """
+    global _draw_task
+    _draw_task = asyncio.create_task(
+        run_daily(time.fromisoformat(BEST_QA_DRAW_TIME_UTC),
+                  run_daily_draw, bot, run_if_missed=True))
+
+
+async def stop_daily_draw():
+    """
+    Останавливает расписание ежедневного выбора при остановке бота.
+    """
+    global _draw_task
+    await cancel_tasks([_draw_task])
+    _draw_task = None
+
+
+def register_best_qa_auto_handler(dp):
+    """
+    Регистрирует обработчик команды /best_qa_auto и расписание выбора.
+    """
+    dp.message.register(handle_best_qa_auto,
+                        Command(commands=["best_qa_auto"]))
+    dp.startup.register(start_daily_draw)
+    dp.shutdown.register(stop_daily_draw)
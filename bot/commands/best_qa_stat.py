@@ -1,49 +1,127 @@
-import json
+import asyncio
 import logging
-from pathlib import Path
 from aiogram.filters import Command
-from aiogram.types import Message
+from aiogram.types import (CallbackQuery,
+                           InlineKeyboardButton,
+                           InlineKeyboardMarkup,
+                           Message)
 from bot.config.flags import BEST_QA_STAT_ENABLE
+from bot.config.settings import (BEST_QA_STAT_PAGE_SIZE,
+                                 BEST_QA_COMPACTION_INTERVAL_HOURS)
+from bot.utils.storage import (get_storage,
+                               GLOBAL_CHAT_ID,
+                               DAY, WEEK, MONTH, ALL_TIME)
+from bot.utils.scheduler import cancel_tasks
 
-# Путь к директории данных
-BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
-STATS_FILE = DATA_DIR / "best_qa_stats.json"
+logger = logging.getLogger(__name__)
 
-# Логирование
-logging.basicConfig(level=logging.DEBUG)
 
+# Области рейтинга
+CHAT_SCOPE = "chat"
+GLOBAL_SCOPE = "global"
 
-def ensure_data_directory():
+# Аргументы команды для выбора периода и их подписи
+PERIOD_ARGS = {"day": DAY, "день": DAY,
+               "week": WEEK, "неделя": WEEK,
+               "month": MONTH, "месяц": MONTH,
+               "all": ALL_TIME, "всё": ALL_TIME, "все": ALL_TIME}
+PERIOD_TITLES = {DAY: "за сегодня",
+                 WEEK: "за неделю",
+                 MONTH: "за месяц",
+                 ALL_TIME: "за всё время"}
+
+_compaction_task = None
+
+
+def get_leaderboard_page(scope: str, period: str, chat_id: int, page: int):
     """
-    Убедиться, что папка data существует.
+    Загружает одну страницу рейтинга.
+    :param scope: Область рейтинга (чат или все чаты)
+    :param period: Период рейтинга
+    :param chat_id: ID текущего чата
+    :param page: Номер страницы (с нуля)
+    :return: Кортеж (заголовок, строки страницы, всего победителей)
     """
-    DATA_DIR.mkdir(exist_ok=True, parents=True)
-    logging.debug(f"Папка {DATA_DIR} проверена или создана.")
+    storage = get_storage()
+    if scope == GLOBAL_SCOPE:
+        chat_id = GLOBAL_CHAT_ID
+        title = "Общий рейтинг победителей по всем чатам"
+    else:
+        title = (f"Статистика победителей для чата: "
+                 f"{storage.get_chat_title(chat_id)}")
+    rows = storage.get_leaderboard(chat_id, BEST_QA_STAT_PAGE_SIZE,
+                                   page * BEST_QA_STAT_PAGE_SIZE, period)
+    return (f"{title} {PERIOD_TITLES[period]}:", rows,
+            storage.count_winners(chat_id, period))
 
 
-def load_stats():
+def format_leaderboard(title: str, rows: list, page: int, pages: int) -> str:
     """
-    Загружает статистику из JSON-файла.
-    :return: Словарь статистики или пустой словарь.
+    Формирует текст страницы рейтинга.
     """
-    ensure_data_directory()
-    try:
-        with open(STATS_FILE, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        logging.warning(f"Файл {STATS_FILE} не найден. "
-                        f"Возвращён пустой словарь.")
-        return {}
-    except json.JSONDecodeError as e:
-        logging.error(f"Ошибка декодирования JSON в {STATS_FILE}: {e}")
-        return {}
+    stat_message = [title]
+    offset = page * BEST_QA_STAT_PAGE_SIZE
+    for place, winner in enumerate(rows, start=offset + 1):
+        username = f" (@{winner['username']})" if winner.get("username") else ""
+        stat_message.append(f"{place}. {winner['full_name']}{username}: "
+                            f"{winner['wins']} побед(ы)")
+    if pages > 1:
+        stat_message.append(f"\nСтраница {page + 1} из {pages}")
+    return "\n".join(stat_message)
+
+
+def create_pagination_keyboard(scope: str, period: str,
+                               page: int, pages: int):
+    """
+    Создаёт кнопки перехода между страницами рейтинга.
+    :return: InlineKeyboardMarkup или None, если страница одна
+    """
+    buttons = []
+    prefix = f"qa_stat:{scope}:{period}"
+    if page > 0:
+        buttons.append(InlineKeyboardButton(
+            text="⬅️", callback_data=f"{prefix}:{page - 1}"))
+    if page + 1 < pages:
+        buttons.append(InlineKeyboardButton(
+            text="➡️", callback_data=f"{prefix}:{page + 1}"))
+    return InlineKeyboardMarkup(inline_keyboard=[buttons]) if buttons else None
+
+
+def build_leaderboard(scope: str, period: str, chat_id: int, page: int = 0):
+    """
+    Формирует страницу рейтинга с кнопками навигации.
+    :return: Кортеж (текст, клавиатура) или (None, None), если рейтинг пуст
+    """
+    title, rows, total = get_leaderboard_page(scope, period, chat_id, page)
+    if not total:
+        return None, None
+    pages = -(-total // BEST_QA_STAT_PAGE_SIZE)
+    if not rows:  # Страница вышла за пределы рейтинга
+        page = pages - 1
+        title, rows, total = get_leaderboard_page(scope, period,
+                                                  chat_id, page)
+    return (format_leaderboard(title, rows, page, pages),
+            create_pagination_keyboard(scope, period, page, pages))
+
+
+def parse_args(message: Message):
+    """
+    Определяет область и период рейтинга по аргументам команды.
+    Пример: /best_qa_stat global week
+    :return: Кортеж (область, период)
+    """
+    args = [arg.lower() for arg in message.text.split()[1:]]
+    scope = GLOBAL_SCOPE if GLOBAL_SCOPE in args else CHAT_SCOPE
+    period = next((PERIOD_ARGS[arg] for arg in args if arg in PERIOD_ARGS),
+                  ALL_TIME)
+    return scope, period
 
 
 async def handle_best_qa_stat(message: Message):
     """
-    Обработчик команды /best_qa_stat.
-    Показывает статистику победителей текущего чата.
+    Обработчик команды /best_qa_stat [global] [day|week|month|all].
+    Показывает рейтинг победителей текущего чата или всех чатов
+    за выбранный период.
     """
     if not BEST_QA_STAT_ENABLE:
         await message.answer("Команда временно отключена.")
@@ -54,28 +132,70 @@ async def handle_best_qa_stat(message: Message):
         await message.answer("Статистика доступна только для групповых чатов.")
         return
 
-    stats = load_stats()
-    chat_id = str(message.chat.id)
-
-    # Проверка наличия данных для текущего чата
-    chat_stats = stats.get(chat_id)
-    if not chat_stats or not chat_stats.get("winners"):
+    scope, period = parse_args(message)
+    text, keyboard = build_leaderboard(scope, period, message.chat.id)
+    if not text:
         await message.answer("Статистика по лучшим тестировщикам пока пуста.")
         return
 
-    # Формируем и отправляем текст статистики
-    stat_message = [f"Статистика победителей для чата: "
-                    f"{chat_stats['chat_title']}:"]
-    for winner in chat_stats["winners"].values():
-        username = f" (@{winner['username']})" if winner.get("username") else ""
-        stat_message.append(f"• {winner['full_name']}{username}: "
-                            f"{winner['wins']} побед(ы)")
+    await message.answer(text, reply_markup=keyboard)
+
+
+async def handle_best_qa_stat_page(callback: CallbackQuery):
+    """
+    Обрабатывает переключение страниц рейтинга.
+    """
+    try:
+        _, scope, period, page = callback.data.split(":")
+        text, keyboard = build_leaderboard(scope, period,
+                                           callback.message.chat.id,
+                                           int(page))
+        if text:
+            await callback.message.edit_text(text, reply_markup=keyboard)
+        await callback.answer()
+    except Exception as e:
+        logger.error(f"Ошибка при переключении страницы рейтинга: {e}")
+        await callback.answer("Произошла ошибка. Попробуйте снова.",
+                              show_alert=True)
+
+
+async def compact_history_periodically():
+    """
+    Периодически сжимает журнал побед. Работает до отмены задачи.
+    """
+    while True:
+        try:
+            get_storage().compact_history()
+        except Exception as e:
+            logger.error(f"Ошибка при сжатии журнала побед: {e}")
+        await asyncio.sleep(BEST_QA_COMPACTION_INTERVAL_HOURS * 60 * 60)
+
 
-    await message.answer("\n".join(stat_message))
+async def start_history_compaction():
+    """
+    Запускает периодическое сжатие журнала побед при старте бота.
+    """
+    global _compaction_task
+    _compaction_task = asyncio.create_task(compact_history_periodically())
+
+
+async def stop_history_compaction():
+    """
+    Останавливает сжатие журнала побед при остановке бота.
+    """
+    global _compaction_task
+    await cancel_tasks([_compaction_task])
+    _compaction_task = None
 
 
 def register_best_qa_stat_handler(dp):
     """
-    Регистрирует обработчик команды /best_qa_stat.
+    Регистрирует обработчики команды /best_qa_stat и кнопок рейтинга.
     """
     dp.message.register(handle_best_qa_stat, Command(commands=["best_qa_stat"]))
+    dp.callback_query.register(
+        handle_best_qa_stat_page,
+        lambda callback: callback.data.startswith("qa_stat:")
+    )
+    dp.startup.register(start_history_compaction)
+    dp.shutdown.register(stop_history_compaction)
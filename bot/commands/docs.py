@@ -1,43 +1,38 @@
 from aiogram.filters import Command
 from aiogram.types import Message
-from bot.modules.menu import create_menu
+from bot.modules.menu import get_menu, MAIN_MENU_TEXT
 from bot.config.flags import DOCS_ENABLE
 import logging
 
+logger = logging.getLogger(__name__)
 
-async def handle_docs(message: Message, state):
+
+async def handle_docs(message: Message):
     """
     Обрабатывает команду /docs.
     """
-    logging.debug(f"Команда /docs вызвана пользователем: "
-                  f"{message.from_user.id}")
+    logger.debug("Команда /docs вызвана пользователем: %s",
+                 message.from_user.id)
 
     if not DOCS_ENABLE:
-        logging.warning("Команда /docs временно отключена.")
+        logger.warning("Команда /docs временно отключена.")
         return await message.answer("Команда временно отключена.")
 
     try:
-        menu, _ = create_menu(user_id=message.from_user.id)  # Распаковка
+        menu, _ = get_menu()  # Готовое меню из кэша
         if not menu.inline_keyboard:
-            logging.warning("Главное меню пустое. "
-                            "Проверьте настройки LINKS.")
+            logger.warning("Главное меню пустое. "
+                           "Проверьте настройки LINKS.")
             return await message.answer("Меню временно недоступно. "
                                         "Обратитесь к администратору.")
 
-        # Формируем текст главного меню
-        main_menu_text = ("Вот какие ссылки я знаю."
-                          "\nВыберите из меню ниже:")
-
-        # Сохраняем текст главного меню в состоянии пользователя
-        await state.update_data(main_menu_text=main_menu_text)
-
         await message.answer(
-            main_menu_text,
+            MAIN_MENU_TEXT,
             reply_markup=menu,
         )
     except Exception as e:
-        logging.error(f"Ошибка при обработке команды /docs "
-                      f"для пользователя {message.from_user.id}: {e}")
+        logger.error(f"Ошибка при обработке команды /docs "
+                     f"для пользователя {message.from_user.id}: {e}")
         await message.reply(f"Произошла ошибка: {e}")
 
 
@@ -46,5 +41,5 @@ def register_docs_handler(dp):
     Регистрирует обработчик команды /docs.
     :param dp: Экземпляр Dispatcher
     """
-    logging.debug("Регистрация обработчика команды /docs")
+    logger.debug("Регистрация обработчика команды /docs")
     dp.message.register(handle_docs, Command(commands=["docs"]))
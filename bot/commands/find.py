@@ -0,0 +1,40 @@
+from aiogram.filters import Command
+from aiogram.types import Message
+from bot.config.flags import FIND_ENABLE
+from bot.config.settings import FIND_RESULTS_LIMIT
+from bot.utils.link_search import find_links
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_find(message: Message):
+    """
+    Обрабатывает команду /find.
+    Ищет ссылки по запросу с учётом опечаток и транслитерации.
+    :param message: Сообщение от пользователя
+    """
+    if not FIND_ENABLE:
+        return await message.answer("Команда временно отключена.")
+
+    query = message.text.split(maxsplit=1)
+    if len(query) < 2:
+        return await message.answer("Пожалуйста, укажите, что найти.\n"
+                                    "Пример: /find чарльз")
+
+    results = find_links(query[1], limit=FIND_RESULTS_LIMIT)
+    logger.debug("/find '%s': найдено %s ссылок.", query[1], len(results))
+    if not results:
+        return await message.answer("Ничего не нашёл. "
+                                    "Попробуйте другой запрос или /docs.")
+
+    await message.answer("Вот что удалось найти:\n" + "\n".join(
+        f"{name}: {url}" for name, url in results))
+
+
+def register_find_handler(dp):
+    """
+    Регистрирует обработчик команды /find.
+    :param dp: Экземпляр Dispatcher
+    """
+    dp.message.register(handle_find, Command(commands=["find"]))
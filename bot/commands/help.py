@@ -3,6 +3,8 @@ from aiogram.filters import Command
 from aiogram.types import Message
 from bot.modules.commands_list import get_all_commands
 
+logger = logging.getLogger(__name__)
+
 
 async def handle_help(message: Message):
     """
@@ -14,7 +16,7 @@ async def handle_help(message: Message):
     commands = get_all_commands()
 
     # Логирование всех команд
-    logging.debug(f"Все команды: {commands}")
+    logger.debug("Все команды: %s", commands)
 
     # Определяем тип чата
     chat_type = "private_chat" \
@@ -27,7 +29,7 @@ async def handle_help(message: Message):
     ]
 
     # Логирование доступных команд
-    logging.debug(f"Доступные команды для {chat_type}: {visible_commands}")
+    logger.debug("Доступные команды для %s: %s", chat_type, visible_commands)
 
     # Если список команд пустой
     if not visible_commands:
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from datetime import datetime
+from aiogram import Dispatcher
+from aiogram.filters import Command
+from aiogram.types import BufferedInputFile, Message
+from bot.config.flags import PROFILE_ENABLE
+from bot.config.settings import (BOT_ADMIN_IDS,
+                                 PROFILE_DEFAULT_SECONDS,
+                                 PROFILE_MAX_SECONDS)
+from bot.utils.profiler import ProfileSession
+
+logger = logging.getLogger(__name__)
+
+USAGE = ("Использование: /profile [секунд] [обновлений]\n"
+         "Пример: /profile 60 500 — профилировать 60 секунд "
+         "или до 500 обновлений.")
+
+# Текущий сеанс профилирования (одновременно выполняется один)
+_session = None
+_background_tasks = set()
+
+
+def parse_profile_args(args: list):
+    """
+    Разбирает аргументы команды /profile.
+    :param args: Аргументы после команды
+    :return: Кортеж (секунд, максимум обновлений или None)
+    :raises ValueError: Если аргументы некорректны
+    """
+    if len(args) > 2:
+        raise ValueError("Слишком много аргументов")
+    seconds = int(args[0]) if args else PROFILE_DEFAULT_SECONDS
+    max_updates = int(args[1]) if len(args) > 1 else None
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        raise ValueError("Длительность вне допустимого диапазона")
+    if max_updates is not None and max_updates <= 0:
+        raise ValueError("Количество обновлений должно быть положительным")
+    return seconds, max_updates
+
+
+async def run_profile(bot, chat_id: int, session: ProfileSession,
+                      seconds: int, max_updates: int = None):
+    """
+    Выполняет сеанс профилирования и отправляет отчёт файлом.
+    :param bot: Экземпляр бота
+    :param chat_id: ID чата, куда отправляется отчёт
+    :param session: Сеанс профилирования
+    :param seconds: Максимальная длительность, сек
+    :param max_updates: Максимум обработанных обновлений
+    """
+    global _session
+    try:
+        report = await session.run(seconds, max_updates)
+    except Exception as e:
+        logger.exception("Ошибка профилирования")
+        await bot.send_message(chat_id, f"Профилирование прервано: {e}")
+        return
+    finally:
+        _session = None
+
+    filename = f"profile-{datetime.now():%Y%m%d-%H%M%S}.txt"
+    await bot.send_document(
+        chat_id,
+        BufferedInputFile(report.encode("utf-8"), filename=filename),
+        caption=report.split("\n", 1)[0]
+    )
+    logger.info(f"Отчёт профилирования отправлен в чат {chat_id}.")
+
+
+def check_access(message: Message):
+    """
+    Проверяет, можно ли запустить профилирование.
+    :param message: Сообщение от пользователя
+    :return: Текст отказа или None, если запуск разрешён
+    """
+    if not PROFILE_ENABLE:
+        return "Команда временно отключена."
+    if message.from_user.id not in BOT_ADMIN_IDS:
+        logger.warning(f"Попытка запустить /profile пользователем "
+                       f"{message.from_user.id}.")
+        return "Команда доступна только администраторам бота."
+    if message.chat.type != "private":
+        return "Команда доступна только в личном чате с ботом."
+    if _session is not None:
+        return "Профилирование уже выполняется."
+    return None
+
+
+async def handle_profile(message: Message, dispatcher: Dispatcher):
+    """
+    Обработчик команды /profile [секунд] [обновлений].
+    Запускает профилирование бота и присылает отчёт администратору.
+    """
+    global _session
+    refusal = check_access(message)
+    if refusal:
+        return await message.answer(refusal)
+
+    try:
+        seconds, max_updates = parse_profile_args(message.text.split()[1:])
+    except ValueError:
+        return await message.answer(USAGE)
+
+    _session = ProfileSession(dispatcher)
+    limit = f" или до {max_updates} обновлений" if max_updates else ""
+    await message.answer(f"Профилирование запущено на {seconds} сек{limit}. "
+                         f"Отчёт придёт файлом.")
+    logger.info(f"Профилирование запущено пользователем "
+                f"{message.from_user.id}: {seconds} сек{limit}.")
+    task = asyncio.create_task(run_profile(message.bot, message.chat.id,
+                                           _session, seconds, max_updates))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def register_profile_handler(dp):
+    """
+    Регистрирует обработчик команды /profile.
+    :param dp: Экземпляр Dispatcher
+    """
+    # Диспетчер нужен обработчику для подключения профилировщика
+    dp["dispatcher"] = dp
+    dp.message.register(handle_profile, Command(commands=["profile"]))
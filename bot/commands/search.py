@@ -1,12 +1,32 @@
+import asyncio
 import logging
-import openai
 from aiogram.filters import Command
 from aiogram.types import Message
-from bot.config.tokens import OPENAI_API_KEY
-from bot.config.gpt_prompt import PROMPT
+from bot.config.flags import SEARCH_STREAM_ENABLE
+from bot.utils.gpt_client import ask_gpt, stream_gpt, GptBusyError
+from bot.utils.stream_reply import StreamingReply, split_text
 
-# Настройка OpenAI API
-openai.api_key = OPENAI_API_KEY
+logger = logging.getLogger(__name__)
+
+
+async def answer_query(message: Message, status: Message, user_query: str):
+    """
+    Получает ответ модели и отправляет его пользователю.
+    В потоковом режиме ответ постепенно дописывается в сообщение status.
+    :param message: Сообщение от пользователя
+    :param status: Сообщение бота о начале обработки
+    :param user_query: Текст запроса
+    """
+    if SEARCH_STREAM_ENABLE:
+        reply = StreamingReply(status)
+        async for chunk in stream_gpt(user_query):
+            await reply.append(chunk)
+        await reply.finish()
+        return
+
+    answer = await ask_gpt(user_query)
+    for part in split_text(answer):
+        await message.answer(part)
 
 
 async def handle_search(message: Message):
@@ -24,29 +44,25 @@ async def handle_search(message: Message):
         return
 
     user_query = query[1]
-    await message.answer("Обрабатываю ваш запрос...")
+    status = await message.answer("Обрабатываю ваш запрос...")
 
     try:
         # Отправляем запрос в OpenAI GPT
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": PROMPT},
-                {"role": "user", "content": user_query}
-            ],
-            max_tokens=500,
-            temperature=0.7
-        )
-
-        # Извлекаем ответ из результата
-        answer = response.choices[0].message.content
-        await message.answer(answer)
+        await answer_query(message, status, user_query)
 
+    except GptBusyError:
+        await message.answer("Сейчас обрабатывается слишком много "
+                             "запросов. Попробуйте позже.")
+        logger.warning("Лимит одновременных запросов к OpenAI исчерпан.")
+    except asyncio.TimeoutError:
+        await message.answer("Запрос обрабатывается слишком долго. "
+                             "Попробуйте позже.")
+        logger.warning(f"Таймаут запроса к OpenAI: {user_query}")
     except Exception as e:
         await message.answer("Произошла "
                              "ошибка при обработке запроса. "
                              "Попробуйте позже.")
-        logging.error(f"Ошибка при запросе к OpenAI: {e}")
+        logger.error(f"Ошибка при запросе к OpenAI: {e}")
 
 
 def register_search_handler(dp):
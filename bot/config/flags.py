@@ -2,13 +2,33 @@
 KEYWORD_RESPONSES_ENABLE = True
 TIMEOUT_RESPONSES_ENABLE = True
 WHO_REQUEST_ENABLE = True
+# Нечёткий поиск ссылок, если регулярные выражения не сработали
+FUZZY_KEYWORD_RESPONSES_ENABLE = False
+
+# Кэш ответов /search
+SEARCH_CACHE_ENABLE = True
+SEARCH_CACHE_PERSIST_ENABLE = True
+
+# Потоковый вывод ответа /search
+SEARCH_STREAM_ENABLE = True
+
+# Метрики Prometheus (/metrics на отдельном порту)
+METRICS_ENABLE = True
+
+# Сохранение медленных обновлений для воспроизведения
+SLOW_UPDATE_CAPTURE_ENABLE = True
 
 # Commands
 ADD_CHAT_ENABLE = True
 REMOVE_CHAT_ENABLE = True
 ANNOUNCE_ENABLE = True
+ANNOUNCE_STATUS_ENABLE = True
 DOCS_ENABLE = True
+FIND_ENABLE = True
+INLINE_ENABLE = True
 HELP_ENABLE = True
 SEARCH_ENABLE = True
 BEST_QA_ENABLE = True
+BEST_QA_AUTO_ENABLE = True
 BEST_QA_STAT_ENABLE = True
+PROFILE_ENABLE = True
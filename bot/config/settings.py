@@ -0,0 +1,119 @@
+# Режим получения обновлений: "polling" или "webhook"
+BOT_MODE = "polling"
+
+# Webhook: публичный адрес бота (без пути) и адрес встроенного сервера
+WEBHOOK_BASE_URL = ""
+WEBHOOK_PATH = "/webhook"
+WEBHOOK_HOST = "0.0.0.0"
+WEBHOOK_PORT = 8080
+
+# Логирование
+LOG_LEVEL = "INFO"
+# Уровни отдельных подсистем, например {"bot.modules.messages": "DEBUG"}
+LOG_LEVELS = {
+    "aiogram.event": "WARNING",  # Запись о каждом обработанном обновлении
+}
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOG_JSON = False  # Вывод в формате JSON (одна запись — одна строка)
+# Подсистемы, которые пишут DEBUG на каждое сообщение: частота
+# таких записей ограничивается для каждого места вызова
+LOG_SAMPLED_LOGGERS = (
+    "bot.modules.messages",
+    "bot.modules.buttons",
+    "bot.modules.menu",
+    "bot.utils.message_parse",
+    "bot.utils.recent_links",
+    "bot.utils.who_request",
+)
+LOG_SAMPLE_PER_SECOND = 5
+
+# Общее состояние копий бота: "memory" (одна копия) или "redis"
+STATE_BACKEND = "memory"
+REDIS_URL = "redis://127.0.0.1:6379/0"
+STATE_KEY_PREFIX = "smb_bot:"
+LOCK_TTL_SECONDS = 30  # Блокировка снимается сама, если владелец завис
+LOCK_TIMEOUT_SECONDS = 10  # Максимальное ожидание блокировки
+# Режим журнала SQLite (bot/data/bot.db): "WAL" работает только для копий
+# на одной машине; для тома без общей памяти (mmap) задайте "DELETE"
+SQLITE_JOURNAL_MODE = "WAL"
+
+# /search (OpenAI GPT)
+SEARCH_MODEL = "gpt-3.5-turbo"
+SEARCH_MAX_TOKENS = 500
+SEARCH_TEMPERATURE = 0.7
+SEARCH_MAX_CONCURRENT = 4  # Одновременных запросов к OpenAI
+SEARCH_TIMEOUT_SECONDS = 30  # Таймаут одного запроса
+
+# Кэш ответов /search
+SEARCH_CACHE_MAX_SIZE = 500
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+SEARCH_CACHE_FLUSH_DELAY_SECONDS = 30  # Новые ответы пишутся на диск пачкой
+
+# Потоковый вывод /search
+SEARCH_STREAM_EDIT_INTERVAL = 1.5  # Минимальный интервал между правками, сек
+
+# Каталог ссылок (относительно каталога bot); по умолчанию LINKS из
+# bot/config/links.py. Поддерживаются файлы .json и .toml
+LINKS_FILE = "data/links.json"
+LINKS_RELOAD_INTERVAL = 5  # Интервал проверки изменений файла, сек
+
+# Нечёткий поиск ссылок /find
+FIND_RESULTS_LIMIT = 5
+FIND_MESSAGE_MIN_SCORE = 0.6  # Порог для ответов на сообщения в чате
+
+# Inline-режим (@bot запрос)
+INLINE_RESULTS_LIMIT = 10
+INLINE_CACHE_TIME = 300  # Кэширование ответа на стороне Telegram и бота, сек
+INLINE_CACHE_MAX_SIZE = 1000  # Запросов в кэше бота
+
+# Сервер метрик Prometheus
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9100
+METRICS_PATH = "/metrics"
+
+# Администраторы бота: Telegram ID пользователей, которым доступны
+# /profile и /announce
+BOT_ADMIN_IDS = []
+
+# Профилирование /profile
+PROFILE_DEFAULT_SECONDS = 30
+PROFILE_MAX_SECONDS = 600
+PROFILE_SAMPLE_INTERVAL = 0.005  # Интервал выборок стека, сек
+PROFILE_TOP_N = 25  # Строк в каждом разделе отчёта
+PROFILE_TRACEMALLOC_FRAMES = 10  # Глубина стека выделений памяти
+
+# Сохранение медленных обновлений (относительно каталога bot)
+SLOW_UPDATE_THRESHOLD_SECONDS = 2.0
+SLOW_UPDATES_FILE = "data/slow_updates.jsonl"
+SLOW_UPDATES_KEEP = 200  # Сколько последних обновлений хранить
+
+# Ограничения Telegram
+MESSAGE_MAX_LENGTH = 4096
+SEND_GLOBAL_RATE = 25  # Сообщений в секунду для всего бота
+SEND_CHAT_RATE = 1  # Сообщений в секунду для одного чата
+SEND_MAX_RETRIES = 3  # Повторов после TelegramRetryAfter
+
+# Рассылка /announce
+ANNOUNCE_MAX_CONCURRENT = 20  # Одновременных отправок
+ANNOUNCE_PROGRESS_INTERVAL = 3  # Интервал обновления прогресса, сек
+ANNOUNCE_JOB_SAVE_INTERVAL = 1  # Интервал сохранения состояния рассылки, сек
+ANNOUNCE_JOBS_KEEP = 50  # Сколько последних рассылок хранить
+ANNOUNCE_JOB_LEASE_SECONDS = 60  # Срок владения рассылкой одной копией бота
+
+# Кэш администраторов чатов
+ADMIN_CACHE_TTL_SECONDS = 10 * 60
+ADMIN_CACHE_MAX_CHATS = 5000
+
+# Индекс активных участников для /best_qa
+PARTICIPANTS_MAX_PER_CHAT = 500
+PARTICIPANTS_MAX_CHATS = 10000
+PARTICIPANTS_MAX_AGE_DAYS = 30
+
+# Рейтинг /best_qa_stat
+BEST_QA_STAT_PAGE_SIZE = 10
+BEST_QA_COMPACTION_INTERVAL_HOURS = 24  # Интервал сжатия журнала побед
+
+# Ежедневный автоматический выбор /best_qa
+BEST_QA_DRAW_TIME_UTC = "00:00"
+BEST_QA_DRAW_BATCH_SIZE = 20  # Чатов в одной партии
+BEST_QA_DRAW_BATCH_PAUSE = 1  # Пауза между партиями, сек
@@ -5,5 +5,8 @@
 # prod bot
 API_TOKEN = ""
 
+# Webhook secret token (X-Telegram-Bot-Api-Secret-Token)
+WEBHOOK_SECRET = ""
+
 # GPT parametrs
 OPENAI_API_KEY = ""
@@ -1,52 +1,41 @@
 from aiogram.types import CallbackQuery
-from aiogram.fsm.context import FSMContext
-from bot.modules.menu import create_menu
+from bot.modules.menu import (get_menu, parse_menu_callback,
+                              MAIN_MENU_KEY, MAIN_MENU_TEXT)
 import logging
 
+logger = logging.getLogger(__name__)
 
-async def handle_button(callback: CallbackQuery, state: FSMContext):
+
+async def handle_button(callback: CallbackQuery):
     """
     Обрабатывает нажатие на кнопки меню.
+    Меню берётся из кэша готовых клавиатур.
     """
     try:
-        data = callback.data.split(":")
-        if len(data) < 3:
+        menu_key = parse_menu_callback(callback.data)
+        if menu_key is None:
             await callback.answer("Некорректные данные кнопки.")
-            logging.error(f"Некорректные данные callback_data: {callback.data}")
+            logger.error(f"Некорректные данные callback_data: {callback.data}")
             return
 
-        user_id = data[1]
-        menu_key = data[2]
-
-        if menu_key == "main":  # Главное меню
-            logging.debug(f"Открытие главного меню для user_id={user_id}")
-            menu, _ = create_menu(user_id=user_id)
-
-            # Получаем текст главного меню из контекста
-            user_data = await state.get_data()
-            main_menu_text = user_data.get("main_menu_text", "Главное меню:")
+        logger.debug("Открытие меню '%s' для user_id=%s",
+                     menu_key, callback.from_user.id)
+        menu = get_menu(menu_key)
+        if menu is None:
+            logger.error(f"Раздел '{menu_key}' отсутствует в LINKS.")
+            await callback.answer("Этот раздел пуст.",
+                                  show_alert=True)
+            return
 
-            await callback.message.edit_text(
-                main_menu_text,
-                reply_markup=menu,
-            )
+        keyboard, section_name = menu
+        if menu_key == MAIN_MENU_KEY:  # Главное меню
+            text = MAIN_MENU_TEXT
         else:  # Подменю
-            logging.debug(f"Открытие подменю "
-                          f"'{menu_key}' для user_id={user_id}")
-            menu, section_name = create_menu(menu_key=menu_key,
-                                             user_id=user_id)
-            if menu.inline_keyboard:
-                await callback.message.edit_text(
-                    f"Раздел: {section_name}:\n"
-                    f"Выберите из меню ниже:",
-                    reply_markup=menu,
-                )
-            else:
-                await callback.answer("Этот раздел пуст.",
-                                      show_alert=True)
+            text = f"Раздел: {section_name}:\nВыберите из меню ниже:"
+        await callback.message.edit_text(text, reply_markup=keyboard)
 
     except Exception as e:
-        logging.error(f"Ошибка при обработке кнопки: {e}")
+        logger.error(f"Ошибка при обработке кнопки: {e}")
         await callback.answer("Произошла ошибка. "
                               "Попробуйте снова.",
                               show_alert=True)
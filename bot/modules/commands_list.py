@@ -60,12 +60,24 @@ def get_all_commands():
                 private_chat=True,
                 group_chat=True,
                 visible_in_help=True)
+    add_command(commands, "find",
+                "Найти ссылку",
+                flags.FIND_ENABLE,
+                private_chat=True,
+                group_chat=True,
+                visible_in_help=True)
     add_command(commands, "announce",
                 "Сделать объявление",
                 flags.ANNOUNCE_ENABLE,
                 private_chat=True,
                 group_chat=False,
                 visible_in_help=True)
+    add_command(commands, "announce_status",
+                "Статус рассылок",
+                flags.ANNOUNCE_STATUS_ENABLE,
+                private_chat=True,
+                group_chat=False,
+                visible_in_help=True)
     add_command(commands, "search",
                 "Спросить chatGPT о тестировании",
                 flags.SEARCH_ENABLE,
@@ -90,12 +102,24 @@ def get_all_commands():
                 private_chat=False,
                 group_chat=True,
                 visible_in_help=True)
+    add_command(commands, "best_qa_auto",
+                "Ежедневный автоматический выбор (on/off)",
+                flags.BEST_QA_AUTO_ENABLE,
+                private_chat=False,
+                group_chat=True,
+                visible_in_help=True)
     add_command(commands, "best_qa_stat",
                 "Получить список победителей тестировщика дня",
                 flags.BEST_QA_STAT_ENABLE,
                 private_chat=False,
                 group_chat=True,
                 visible_in_help=True)
+    add_command(commands, "profile",
+                "Профилирование бота (для администраторов)",
+                flags.PROFILE_ENABLE,
+                private_chat=False,
+                group_chat=False,
+                visible_in_help=False)
     return commands
 
 
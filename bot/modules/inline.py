@@ -0,0 +1,104 @@
+import hashlib
+import logging
+from aiogram.types import (InlineQuery, InlineQueryResultArticle,
+                           InputTextMessageContent)
+from bot.config.flags import INLINE_ENABLE
+from bot.config.settings import (INLINE_CACHE_TIME,
+                                 INLINE_RESULTS_LIMIT,
+                                 INLINE_CACHE_MAX_SIZE)
+from bot.utils.link_search import get_index, normalize
+from bot.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Готовые результаты по нормализованному запросу
+_results_cache = TTLCache(INLINE_CACHE_MAX_SIZE, INLINE_CACHE_TIME)
+_articles = {}  # {узел: InlineQueryResultArticle}
+_cached_index = None
+
+
+def build_results(query: str) -> list:
+    """
+    Ищет ссылки по запросу и формирует результаты inline-режима.
+    Пустой запрос возвращает первые ссылки каталога.
+    :param query: Нормализованный запрос
+    :return: Список InlineQueryResultArticle
+    """
+    index = get_index()
+    if query:
+        nodes = [node for _, node in index.search(query,
+                                                  INLINE_RESULTS_LIMIT)]
+    else:
+        nodes = index.tree.leaves[:INLINE_RESULTS_LIMIT]
+    return [_get_article(node) for node in nodes]
+
+
+def get_results(query: str) -> list:
+    """
+    Возвращает результаты из кэша или строит их.
+    Кэш сбрасывается, если каталог ссылок был перезагружен.
+    :param query: Текст inline-запроса
+    :return: Список InlineQueryResultArticle
+    """
+    global _cached_index
+    index = get_index()
+    if index is not _cached_index:
+        _results_cache.clear()
+        _articles.clear()
+        _cached_index = index
+
+    key = normalize(query)
+    results = _results_cache.get(key)
+    if results is None:
+        results = build_results(key)
+        _results_cache.set(key, results)
+    return results
+
+
+def _get_article(node) -> InlineQueryResultArticle:
+    """
+    Возвращает результат inline-режима для ссылки (строится один раз).
+    """
+    article = _articles.get(node)
+    if article is None:
+        article = _articles[node] = _make_article(node)
+    return article
+
+
+def _make_article(node) -> InlineQueryResultArticle:
+    """
+    Формирует результат inline-режима для ссылки.
+    """
+    result_id = hashlib.md5(f"{node.name}|{node.url}".encode()).hexdigest()
+    return InlineQueryResultArticle(
+        id=result_id,
+        title=node.name,
+        description=node.parent.breadcrumbs() or node.url,
+        url=node.url,
+        input_message_content=InputTextMessageContent(
+            message_text=f"{node.name}: {node.url}"),
+    )
+
+
+async def handle_inline_query(inline_query: InlineQuery):
+    """
+    Обрабатывает inline-запрос (@bot запрос) поиском по каталогу ссылок.
+    """
+    if not INLINE_ENABLE:
+        return await inline_query.answer([], cache_time=INLINE_CACHE_TIME)
+
+    try:
+        results = get_results(inline_query.query)
+        await inline_query.answer(results, cache_time=INLINE_CACHE_TIME,
+                                  is_personal=False)
+    except Exception as e:
+        logger.error(f"Ошибка при обработке inline-запроса "
+                     f"'{inline_query.query}': {e}")
+
+
+def register_inline_handlers(dp):
+    """
+    Регистрирует обработчик inline-запросов.
+    :param dp: Экземпляр Dispatcher
+    """
+    dp.inline_query.register(handle_inline_query)
@@ -1,93 +1,168 @@
+from types import MappingProxyType
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from bot.config.links import LINKS
+from bot.utils.link_tree import get_tree, ROOT_KEY, ROOT_NAME
 import logging
 
+logger = logging.getLogger(__name__)
 
-def create_main_menu(user_id):
+# Ключ главного меню в callback_data
+MAIN_MENU_KEY = ROOT_KEY
+MAIN_MENU_TITLE = ROOT_NAME
+MAIN_MENU_TEXT = "Вот какие ссылки я знаю.\nВыберите из меню ниже:"
+
+
+class MenuCache:
+    """
+    Готовые клавиатуры меню /docs, построенные один раз по дереву ссылок.
+    Меню хранятся по ключу раздела в неизменяемом словаре, поэтому
+    открытие меню сводится к поиску по ключу без обхода LINKS.
+    """
+
+    def __init__(self, tree):
+        """
+        :param tree: Дерево ссылок (LinkTree)
+        """
+        self.tree = tree
+        self.menus = MappingProxyType({
+            key: (_build_keyboard(node), _menu_title(node))
+            for key, node in tree.index.items() if node.is_section
+        })  # {ключ: (клавиатура, название)}
+
+    def get(self, menu_key=None):
+        """
+        Возвращает готовое меню.
+        :param menu_key: Ключ раздела (None для главного меню)
+        :return: Кортеж (клавиатура, название) или None, если раздела нет
+        """
+        return self.menus.get(menu_key or MAIN_MENU_KEY)
+
+
+def _menu_title(node):
     """
-    Создаёт главное меню на основе LINKS.
-    :param user_id: ID пользователя (для уникальных callback_data)
-    :return: InlineKeyboardMarkup с кнопками и название меню
+    Возвращает название меню: путь к разделу или название главного меню.
+    """
+    return node.breadcrumbs() or MAIN_MENU_TITLE
+
+
+def _build_keyboard(node, user_id=None):
+    """
+    Строит клавиатуру раздела.
+    Во вложенных разделах добавляется кнопка возврата к родителю.
+    :param node: Узел дерева ссылок
+    :param user_id: ID пользователя для callback_data (необязательно)
+    :return: InlineKeyboardMarkup
     """
-    logging.debug(f"Создание главного меню. user_id={user_id}")
     keyboard = InlineKeyboardMarkup(inline_keyboard=[])
 
-    for section, content in LINKS.items():
-        key = content.get("key")
-        url = content.get("url")
-        if "subsections" not in content and url:  # Нет подразделов, есть ссылка
+    for child in node.children:
+        if not child.is_section:  # Нет подразделов, есть ссылка
             keyboard.inline_keyboard.append(
-                [InlineKeyboardButton(text=section,
-                                      url=url)]
+                [InlineKeyboardButton(text=child.name,
+                                      url=child.url)]
             )
-        elif key:  # Есть подразделы или просто ключ
-            callback_data = f"menu:{user_id}:{key}"
+        elif child.key:  # Есть подразделы или просто ключ
             keyboard.inline_keyboard.append(
-                [InlineKeyboardButton(text=section,
-                                      callback_data=callback_data)]
+                [InlineKeyboardButton(text=child.name,
+                                      callback_data=menu_callback(child.key,
+                                                                  user_id))]
             )
         else:
-            logging.warning(f"Пропущен раздел "
-                            f"'{section}' из-за некорректной структуры.")
+            logger.warning(f"Пропущен раздел "
+                           f"'{child.name}' из-за некорректной структуры.")
+
+    if node.parent is not None:
+        keyboard.inline_keyboard.append(
+            [InlineKeyboardButton(text="⬅️ Назад",
+                                  callback_data=menu_callback(
+                                      _back_key(node), user_id))]
+        )
 
-    return keyboard, "Главное меню"
+    return keyboard
 
 
-def create_submenu(menu_key, user_id):
+def _back_key(node):
     """
-    Создаёт подменю для указанного раздела.
+    Возвращает ключ ближайшего родителя, в меню которого можно вернуться.
+    """
+    parent = node.parent
+    while parent.parent is not None and not parent.key:
+        parent = parent.parent
+    return parent.key or MAIN_MENU_KEY
+
+
+def menu_callback(menu_key, user_id=None):
+    """
+    Формирует callback_data кнопки меню.
     :param menu_key: Ключ раздела
-    :param user_id: ID пользователя (для уникальных callback_data)
-    :return: InlineKeyboardMarkup с кнопками и название раздела
+    :param user_id: ID пользователя (необязательно)
+    :return: Строка вида menu:<ключ> или menu:<user_id>:<ключ>
     """
-    logging.debug(f"Создание подменю. menu_key={menu_key}, user_id={user_id}")
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[])
+    if user_id is None:
+        return f"menu:{menu_key}"
+    return f"menu:{user_id}:{menu_key}"
 
-    # Поиск данных для подменю
-    data = next((v for k, v in LINKS.items() if v.get("key") == menu_key), None)
-    section_name = next((k for k, v in LINKS.items() if
-                         v.get("key") == menu_key), menu_key)
 
-    if not data:
-        logging.error(f"Раздел '{menu_key}' отсутствует в LINKS.")
-        return keyboard, section_name
+def parse_menu_callback(callback_data):
+    """
+    Извлекает ключ раздела из callback_data.
+    Поддерживает и прежний формат с ID пользователя.
+    :param callback_data: Строка callback_data
+    :return: Ключ раздела или None, если данные некорректны
+    """
+    parts = callback_data.split(":")
+    if len(parts) not in (2, 3) or parts[0] != "menu" or not parts[-1]:
+        return None
+    return parts[-1]
+
+
+_menus = None
 
-    subsections = data.get("subsections", {})
-    for subsection, content in subsections.items():
-        url = content.get("url")
-        key = content.get("key")
-        if url:  # Ссылка в подразделе
-            keyboard.inline_keyboard.append(
-                [InlineKeyboardButton(text=subsection,
-                                      url=url)]
-            )
-        elif key:  # Подраздел с ключом
-            callback_data = f"menu:{user_id}:{key}"
-            keyboard.inline_keyboard.append(
-                [InlineKeyboardButton(text=subsection,
-                                      callback_data=callback_data)]
-            )
-        else:
-            logging.warning(f"Пропущен подраздел "
-                            f"'{subsection}' из-за некорректной структуры.")
 
-    # Добавляем кнопку "Назад", если это подменю
-    keyboard.inline_keyboard.append(
-        [InlineKeyboardButton(text="⬅️ Назад",
-                              callback_data=f"menu:{user_id}:main")]
-    )
+def get_menus():
+    """
+    Возвращает кэш меню для текущего дерева ссылок.
+    После перестроения дерева меню строятся заново один раз.
+    """
+    global _menus
+    tree = get_tree()
+    if _menus is None or _menus.tree is not tree:
+        _menus = MenuCache(tree)
+    return _menus
+
 
-    return keyboard, section_name
+def set_menus(menus):
+    """
+    Подменяет кэш меню готовым (построенным для нового дерева).
+    """
+    global _menus
+    _menus = menus
+
+
+def get_menu(menu_key=None):
+    """
+    Возвращает готовое меню из кэша.
+    :param menu_key: Ключ раздела (None для главного меню)
+    :return: Кортеж (клавиатура, название) или None, если раздела нет
+    """
+    return get_menus().get(menu_key)
 
 
 def create_menu(menu_key=None, user_id=None):
     """
-    Создаёт меню (главное или подменю) на основе LINKS.
+    Возвращает меню (главное или подменю) на основе LINKS.
+    Без user_id возвращается общее меню из кэша; с user_id меню
+    строится заново с ID пользователя в callback_data.
     :param menu_key: Ключ раздела для подменю (None для главного меню)
-    :param user_id: ID пользователя (для уникальных callback_data)
+    :param user_id: ID пользователя (необязательно)
     :return: InlineKeyboardMarkup с кнопками и название раздела
     """
-    logging.debug(f"Создание меню. menu_key={menu_key}, user_id={user_id}")
-    if menu_key is None:
-        return create_main_menu(user_id)
-    return create_submenu(menu_key, user_id)
+    logger.debug("Создание меню. menu_key=%s, user_id=%s", menu_key, user_id)
+    menus = get_menus()
+    menu = menus.get(menu_key)
+    if menu is None:
+        logger.error(f"Раздел '{menu_key}' отсутствует в LINKS.")
+        return InlineKeyboardMarkup(inline_keyboard=[]), menu_key
+    if user_id is None:
+        return menu
+    node = menus.tree.get(menu_key or MAIN_MENU_KEY)
+    return _build_keyboard(node, user_id=user_id), menu[1]
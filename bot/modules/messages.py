@@ -1,37 +1,56 @@
 import asyncio
 from aiogram.types import Message
-from datetime import datetime, timedelta
 from bot.utils.message_parse import find_links_by_keyword
+from bot.utils.link_search import find_links_in_text
+from bot.utils.recent_links import RecentLinks
+from bot.utils.participants import participant_index
 from bot.utils.who_request import handle_who_request
+from bot.utils.state_backend import get_backend
+from bot.utils.scheduler import cancel_tasks
+from bot.utils.metrics import KEYWORD_MESSAGES, LINK_MATCHES
+from bot.config.settings import FIND_MESSAGE_MIN_SCORE
 from bot.config.flags import (KEYWORD_RESPONSES_ENABLE,
+                              FUZZY_KEYWORD_RESPONSES_ENABLE,
                               TIMEOUT_RESPONSES_ENABLE,
                               WHO_REQUEST_ENABLE)
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 # Настройка времени таймаута (в минутах)
 TIMEOUT_MINUTES = 5
+# Ограничения размера хранилища недавних ссылок
+MAX_RECENT_LINKS_PER_CHAT = 100
+MAX_RECENT_CHATS = 10000
+# Интервал очистки просроченных ссылок (в секундах)
+SWEEP_INTERVAL_SECONDS = 60
 
 # Хранилище для предотвращения повторных ответов (по чатам)
-recent_links = {}  # Формат: {chat_id: {"url": время последнего ответа}}
+recent_links = RecentLinks(ttl=TIMEOUT_MINUTES * 60,
+                           max_links_per_chat=MAX_RECENT_LINKS_PER_CHAT,
+                           max_chats=MAX_RECENT_CHATS)
+_sweeper_task = None
 
 
 async def handle_message(message: Message):
     """
     Основная функция для обработки текстовых сообщений пользователя.
     """
+    # Учитываем активность участника для /best_qa
+    track_participant(message)
 
     # Проверка триггеров модуля who_request
     await handle_who_request(message, WHO_REQUEST_ENABLE)
 
     # Проверка включения функции обработки сообщений
     if not KEYWORD_RESPONSES_ENABLE:
-        logging.debug("Функция парсинга сообщений отключена")
+        logger.debug("Функция парсинга сообщений отключена")
         return
 
     # Проверяем, содержит ли сообщение текст
     if not message.text:
-        logging.debug("Сообщение не содержит текста, обработка пропущена.")
+        logger.debug("Сообщение не содержит текста, обработка пропущена.")
         return
 
     # Проверка на команду
@@ -43,11 +62,37 @@ async def handle_message(message: Message):
     if not keyword:
         return
 
-    results = find_links_by_keyword(keyword)
+    results = find_links(keyword)
     if results:
         await process_results(message, results)
     else:
-        logging.debug("Совпадений не найдено.")
+        logger.debug("Совпадений не найдено.")
+
+
+def find_links(keyword: str) -> list:
+    """
+    Ищет ссылки по регулярным выражениям LINKS, а при отсутствии
+    совпадений (если включено) — нечётким поиском по словам сообщения.
+    :param keyword: Текст сообщения в нижнем регистре
+    :return: Список кортежей (название, ссылка)
+    """
+    results, method = find_links_by_keyword(keyword), "regex"
+    if not results and FUZZY_KEYWORD_RESPONSES_ENABLE:
+        results = find_links_in_text(keyword, FIND_MESSAGE_MIN_SCORE)
+        method = "fuzzy"
+    KEYWORD_MESSAGES.inc("hit" if results else "miss")
+    for name, _ in results:
+        LINK_MATCHES.inc(name, method)
+    return results
+
+
+def track_participant(message: Message) -> None:
+    """
+    Добавляет автора сообщения в индекс активных участников группы.
+    :param message: Сообщение от пользователя
+    """
+    if message.chat.type != "private":
+        participant_index.touch(message.chat.id, message.from_user)
 
 
 def is_command(message: Message) -> bool:
@@ -57,8 +102,8 @@ def is_command(message: Message) -> bool:
     :return: True, если это команда; иначе False
     """
     if message.text and message.text.startswith("/"):
-        logging.debug(f"Сообщение {message.text} "
-                      f"игнорируется, так как это команда.")
+        logger.debug("Сообщение %s игнорируется, так как это команда.",
+                     message.text)
         return True
     return False
 
@@ -70,10 +115,10 @@ def extract_keyword(message: Message) -> str:
     :return: Ключевое слово в нижнем регистре
     """
     if not message.text:
-        logging.debug(f"Сообщение не содержит текста: {message}")
+        logger.debug("Сообщение не содержит текста: %s", message)
         return ""
     keyword = message.text.strip().lower()
-    logging.debug(f"Извлечённое ключевое слово: {keyword}")
+    logger.debug("Извлечённое ключевое слово: %s", keyword)
     return keyword
 
 
@@ -83,45 +128,35 @@ async def process_results(message: Message, results: list):
     :param message: Сообщение от пользователя
     :param results: Найденные ссылки
     """
-    filtered_results = filter_recent_links(message.chat.id,
-                                           results) if (
+    filtered_results = await filter_recent_links(message.chat.id,
+                                                 results) if (
         TIMEOUT_RESPONSES_ENABLE) else (
         results)
 
     if filtered_results:
         response = format_response(filtered_results)
-        logging.debug(f"Отправка ссылки: {response}")
+        logger.debug("Отправка ссылки: %s", response)
         await message.answer(response, reply_to_message_id=message.message_id)
-
-        # Планируем удаление ссылок из recent_links
-        # через таймаут, если он включён
-        if TIMEOUT_RESPONSES_ENABLE:
-            for _, url in filtered_results:
-                asyncio.create_task(remove_link_after_timeout(message.chat.id,
-                                                              url))
     else:
-        logging.debug("Все ссылки уже были отправлены недавно.")
+        logger.debug("Все ссылки уже были отправлены недавно.")
 
 
-def filter_recent_links(chat_id: int, results: list) -> list:
+async def filter_recent_links(chat_id: int, results: list) -> list:
     """
     Фильтрует ссылки, которые уже были отправлены недавно для конкретного чата.
+    Если состояние разделяется между копиями бота, отметка об отправке
+    ставится в общем хранилище: ссылку отправит только одна копия.
     :param chat_id: ID чата
     :param results: Список найденных ссылок
     :return: Отфильтрованный список ссылок
     """
-    filtered_results = []
-    chat_recent_links = recent_links.setdefault(chat_id, {})
-    for name, url in results:
-        if (url in chat_recent_links and datetime.now() - chat_recent_links[url]
-                < timedelta(minutes=TIMEOUT_MINUTES)):
-            logging.debug(f"Пропуск отправки ссылки '{url}' "
-                          f"для чата {chat_id}, так как она "
-                          f"отправлялась недавно.")
-        else:
-            filtered_results.append((name, url))
-            chat_recent_links[url] = datetime.now()
-    return filtered_results
+    backend = get_backend()
+    if not backend.shared:
+        return recent_links.filter(chat_id, results)
+    return [(name, url) for name, url in results
+            if await backend.set(f"recent_link:{chat_id}:{url}", "1",
+                                 ttl=TIMEOUT_MINUTES * 60,
+                                 only_if_missing=True)]
 
 
 def format_response(results: list) -> str:
@@ -134,17 +169,22 @@ def format_response(results: list) -> str:
         f"{name}: {url}" for name, url in results])
 
 
-async def remove_link_after_timeout(chat_id: int, url: str):
+async def start_recent_links_sweeper():
     """
-    Удаляет ссылку из recent_links для конкретного чата через указанный таймаут.
-    :param chat_id: ID чата
-    :param url: URL ссылки
+    Запускает периодическую очистку недавних ссылок при старте бота.
+    """
+    global _sweeper_task
+    _sweeper_task = asyncio.create_task(
+        recent_links.run_sweeper(SWEEP_INTERVAL_SECONDS))
+
+
+async def stop_recent_links_sweeper():
+    """
+    Останавливает очистку недавних ссылок при остановке бота.
     """
-    await asyncio.sleep(TIMEOUT_MINUTES * 60)
-    chat_recent_links = recent_links.get(chat_id, {})
-    if url in chat_recent_links:
-        del chat_recent_links[url]
-        logging.debug(f"Ссылка '{url}' удалена из кэша для чата {chat_id}.")
+    global _sweeper_task
+    await cancel_tasks([_sweeper_task])
+    _sweeper_task = None
 
 
 def register_message_handlers(dp):
@@ -153,3 +193,5 @@ def register_message_handlers(dp):
     :param dp: Экземпляр Dispatcher
     """
     dp.message.register(handle_message)
+    dp.startup.register(start_recent_links_sweeper)
+    dp.shutdown.register(stop_recent_links_sweeper)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from aiogram.types import ChatMemberUpdated
+from bot.config.settings import ADMIN_CACHE_TTL_SECONDS, ADMIN_CACHE_MAX_CHATS
+from bot.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class AdminCache:
+    """
+    Кэш списков администраторов чатов.
+    Одновременные запросы одного чата объединяются в один вызов Bot API.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        """
+        :param ttl: Время жизни списка в секундах
+        :param maxsize: Максимальное количество чатов в кэше
+        """
+        self._cache = TTLCache(maxsize, ttl)
+        self._pending = {}  # {chat_id: Future со списком администраторов}
+
+    async def get(self, bot, chat_id: int) -> list:
+        """
+        Возвращает список администраторов чата.
+        :param bot: Экземпляр бота
+        :param chat_id: ID чата
+        :return: Список ChatMember
+        """
+        admins = self._cache.get(chat_id)
+        if admins is not None:
+            return admins
+
+        pending = self._pending.get(chat_id)
+        if pending is not None:
+            return await self._wait(bot, chat_id, pending)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._pending[chat_id] = pending
+        try:
+            admins = await bot.get_chat_administrators(chat_id)
+        except Exception as e:
+            self._resolve(chat_id, pending, error=e)
+            raise
+        else:
+            self._resolve(chat_id, pending, admins=admins)
+            return admins
+        finally:
+            # Запрос отменён: ожидающие не должны ждать вечно
+            if not pending.done():
+                self._abandon(chat_id, pending)
+
+    async def _wait(self, bot, chat_id: int, pending) -> list:
+        """
+        Ожидает результат запроса, выполняемого другой задачей.
+        Если тот запрос был отменён, выполняет запрос заново.
+        """
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise  # Отменена сама ожидающая задача
+        return await self.get(bot, chat_id)
+
+    def invalidate(self, chat_id: int) -> None:
+        """
+        Сбрасывает список администраторов чата.
+        Результат уже выполняющегося запроса не будет закэширован.
+        """
+        self._cache.pop(chat_id)
+        self._pending.pop(chat_id, None)
+
+    def _abandon(self, chat_id, pending) -> None:
+        """
+        Снимает незавершённый запрос и отменяет его Future.
+        """
+        if self._pending.get(chat_id) is pending:
+            del self._pending[chat_id]
+        pending.cancel()
+
+    def _resolve(self, chat_id, pending, admins=None, error=None) -> None:
+        """
+        Передаёт результат ожидающим и кэширует его, если чат
+        не был сброшен во время запроса.
+        """
+        if self._pending.get(chat_id) is pending:
+            del self._pending[chat_id]
+            if error is None:
+                self._cache.set(chat_id, admins)
+        if error is not None:
+            pending.set_exception(error)
+            pending.exception()  # Ожидающих может не быть
+        else:
+            pending.set_result(admins)
+
+
+admin_cache = AdminCache(ADMIN_CACHE_TTL_SECONDS, ADMIN_CACHE_MAX_CHATS)
+
+
+async def get_chat_admins(bot, chat_id: int) -> list:
+    """
+    Возвращает список администраторов чата из общего кэша.
+    """
+    return await admin_cache.get(bot, chat_id)
+
+
+async def handle_chat_member_update(event: ChatMemberUpdated):
+    """
+    Сбрасывает кэш администраторов при изменении участников чата.
+    """
+    logger.debug("Изменение участника в чате %s: %s -> %s",
+                 event.chat.id, event.old_chat_member.status,
+                 event.new_chat_member.status)
+    admin_cache.invalidate(event.chat.id)
+
+
+def register_admin_cache_handlers(dp):
+    """
+    Регистрирует обработчики обновлений chat_member и my_chat_member.
+    :param dp: Экземпляр Dispatcher
+    """
+    dp.chat_member.register(handle_chat_member_update)
+    dp.my_chat_member.register(handle_chat_member_update)
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from bot.utils.broadcast import BroadcastProgress
+from bot.utils.state_backend import get_backend
+from bot.config.settings import ANNOUNCE_JOB_LEASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Путь к каталогу с заданиями рассылки
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+JOBS_DIR = DATA_DIR / "announce_jobs"
+
+# Состояния доставки в чат
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# Состояния задания
+RUNNING = "running"
+DONE = "done"
+
+# Формат ID задания (см. create_job)
+JOB_ID_RE = re.compile(r"[0-9a-f]{8}")
+
+# Идентификатор этой копии бота — владельца выполняемых рассылок
+INSTANCE_ID = uuid.uuid4().hex
+
+
+class LeaseLost(Exception):
+    """
+    Задание рассылки перешло к другой копии бота.
+    """
+
+
+class AnnounceJob(BroadcastProgress):
+    """
+    Задание рассылки с состоянием доставки по каждому чату.
+    Хранится в отдельном JSON-файле и переживает перезапуск бота.
+    """
+
+    def __init__(self, data: dict):
+        """
+        :param data: Словарь задания (см. create_job)
+        """
+        self.data = data
+        self.dirty = False
+        deliveries = data["deliveries"].values()
+        super().__init__(len(data["deliveries"]))
+        self.sent = sum(1 for d in deliveries if d["state"] == SENT)
+        self.failed = [({"id": int(chat_id), "title": d["title"]}, d["error"])
+                       for chat_id, d in data["deliveries"].items()
+                       if d["state"] == FAILED]
+
+    @property
+    def id(self) -> str:
+        return self.data["id"]
+
+    @property
+    def finished(self) -> bool:
+        return self.data["status"] == DONE
+
+    def pending_chats(self) -> list:
+        """
+        Возвращает чаты, доставка в которые ещё не выполнялась.
+        """
+        return [{"id": int(chat_id), "title": d["title"]}
+                for chat_id, d in self.data["deliveries"].items()
+                if d["state"] == PENDING]
+
+    def record(self, chat: dict, error: str = None) -> None:
+        """
+        Учитывает результат отправки и помечает задание для сохранения.
+        """
+        super().record(chat, error)
+        delivery = self.data["deliveries"][str(chat["id"])]
+        delivery["state"] = SENT if error is None else FAILED
+        delivery["error"] = error
+        self.dirty = True
+
+    def finish(self) -> None:
+        """
+        Помечает задание завершённым.
+        """
+        self.data["status"] = DONE
+        self.data["finished_at"] = datetime.now(timezone.utc).isoformat()
+        self.dirty = True
+
+    def format(self) -> str:
+        return f"[{self.id}] {super().format()}"
+
+
+def create_job(chat_list, created_by: int, report_chat_id: int,
+               announce_message=None, forward_from=None) -> AnnounceJob:
+    """
+    Создаёт и сохраняет новое задание рассылки.
+    :param chat_list: Список чатов для рассылки
+    :param created_by: ID пользователя, создавшего рассылку
+    :param report_chat_id: ID чата для отчёта о прогрессе
+    :param announce_message: Текст для рассылки
+    :param forward_from: Кортеж (chat_id, message_id) сообщения для пересылки
+    :return: Новое задание
+    """
+    job = AnnounceJob({
+        "id": uuid.uuid4().hex[:8],
+        "status": RUNNING,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "finished_at": None,
+        "created_by": created_by,
+        "report_chat_id": report_chat_id,
+        "announce_message": announce_message,
+        "forward_from": list(forward_from) if forward_from else None,
+        "deliveries": {
+            str(chat["id"]): {"title": chat.get("title"),
+                              "state": PENDING,
+                              "error": None}
+            for chat in chat_list
+        }
+    })
+    save_job(job)
+    return job
+
+
+def save_job(job: AnnounceJob) -> None:
+    """
+    Атомарно сохраняет задание в файл.
+    """
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    job_file = JOBS_DIR / f"{job.id}.json"
+    tmp_file = job_file.with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump(job.data, file, ensure_ascii=False)
+    os.replace(tmp_file, job_file)
+    job.dirty = False
+
+
+def load_job(job_id: str):
+    """
+    Загружает задание по ID.
+    :return: Задание или None, если ID некорректен, файл не найден
+             или повреждён
+    """
+    if not JOB_ID_RE.fullmatch(job_id):
+        return None
+    try:
+        with open(JOBS_DIR / f"{job_id}.json", "r", encoding="utf-8") as file:
+            return AnnounceJob(json.load(file))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        logger.error(f"Ошибка чтения задания рассылки {job_id}: {e}")
+        return None
+
+
+def list_jobs(limit: int = None) -> list:
+    """
+    Возвращает задания, начиная с самых новых.
+    :param limit: Максимальное количество заданий
+    """
+    if not JOBS_DIR.exists():
+        return []
+    job_files = sorted(JOBS_DIR.glob("*.json"),
+                       key=lambda path: path.stat().st_mtime,
+                       reverse=True)
+    jobs = (load_job(path.stem) for path in job_files[:limit])
+    return [job for job in jobs if job is not None]
+
+
+def prune_jobs(keep: int) -> None:
+    """
+    Удаляет старые завершённые задания, оставляя keep последних.
+    """
+    for job in list_jobs()[keep:]:
+        if job.finished:
+            (JOBS_DIR / f"{job.id}.json").unlink(missing_ok=True)
+
+
+def _lease_key(job: AnnounceJob) -> str:
+    return f"announce_job:{job.id}"
+
+
+async def claim_job(job: AnnounceJob,
+                    lease: float = ANNOUNCE_JOB_LEASE_SECONDS) -> bool:
+    """
+    Закрепляет задание за этой копией бота в общем хранилище
+    состояния, чтобы рассылку выполняла только одна копия.
+    :param job: Задание рассылки
+    :param lease: Срок владения в секундах (продлевается hold_job)
+    :return: True, если задание принадлежит этой копии
+    """
+    backend = get_backend()
+    key = _lease_key(job)
+    if await backend.set(key, INSTANCE_ID, ttl=lease, only_if_missing=True):
+        return True
+    return await backend.get(key) == INSTANCE_ID
+
+
+async def hold_job(job: AnnounceJob,
+                   lease: float = ANNOUNCE_JOB_LEASE_SECONDS) -> None:
+    """
+    Продлевает владение заданием, пока задача не будет отменена.
+    :raises LeaseLost: Если заданием завладела другая копия бота
+    """
+    while True:
+        await asyncio.sleep(lease / 3)
+        if not await claim_job(job, lease):
+            raise LeaseLost(f"Рассылка {job.id} перешла к другой копии бота.")
+        await get_backend().set(_lease_key(job), INSTANCE_ID, ttl=lease)
+
+
+async def release_job(job: AnnounceJob) -> None:
+    """
+    Снимает владение заданием.
+    """
+    await get_backend().release_lock(_lease_key(job), INSTANCE_ID)
+
+
+async def autosave_job(job: AnnounceJob, interval: float) -> None:
+    """
+    Периодически сохраняет изменённое задание. Работает до отмены задачи.
+    :param job: Задание рассылки
+    :param interval: Интервал сохранения в секундах
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if job.dirty:
+            save_job(job)
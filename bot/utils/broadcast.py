@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from aiogram.types import Message
+from bot.utils.metrics import ANNOUNCE_DELIVERIES
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastProgress:
+    """
+    Счётчики рассылки: отправлено, ошибки и остаток.
+    """
+
+    def __init__(self, total: int):
+        """
+        :param total: Общее количество чатов
+        """
+        self.total = total
+        self.sent = 0
+        self.failed = []  # [(чат, причина)]
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.sent - len(self.failed)
+
+    def record(self, chat: dict, error: str = None) -> None:
+        """
+        Учитывает результат отправки в чат.
+        :param chat: Словарь с информацией о чате
+        :param error: Причина ошибки или None при успехе
+        """
+        if error is None:
+            self.sent += 1
+            ANNOUNCE_DELIVERIES.inc("sent")
+        else:
+            self.failed.append((chat, error))
+            ANNOUNCE_DELIVERIES.inc("failed")
+
+    def format(self) -> str:
+        """
+        Формирует текст с текущим состоянием рассылки.
+        """
+        return (f"Рассылка: отправлено {self.sent}, "
+                f"ошибок {len(self.failed)}, осталось {self.remaining} "
+                f"из {self.total}.")
+
+    def format_failures(self) -> str:
+        """
+        Формирует список чатов, в которые не удалось отправить сообщение.
+        """
+        lines = ["Не удалось отправить в чаты:"]
+        for chat, error in self.failed:
+            lines.append(f"• {chat.get('title')} ({chat['id']}): {error}")
+        return "\n".join(lines)
+
+
+async def broadcast(chat_list, send, progress: BroadcastProgress,
+                    max_concurrent: int) -> BroadcastProgress:
+    """
+    Параллельно выполняет отправку во все чаты.
+    Ошибка в одном чате не прерывает отправку в остальные.
+    :param chat_list: Список чатов
+    :param send: Асинхронная функция отправки send(chat)
+    :param progress: Счётчики рассылки (обновляются по ходу)
+    :param max_concurrent: Максимум одновременных отправок
+    :return: Итоговые счётчики рассылки
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def deliver(chat):
+        async with semaphore:
+            try:
+                await send(chat)
+            except Exception as e:
+                logger.warning(f"Не удалось отправить сообщение в чат "
+                               f"{chat['id']} ({chat.get('title')}): {e}")
+                progress.record(chat, str(e))
+                return
+        progress.record(chat)
+
+    await asyncio.gather(*(deliver(chat) for chat in chat_list))
+    return progress
+
+
+async def report_progress(status: Message, progress: BroadcastProgress,
+                          interval: float) -> None:
+    """
+    Периодически обновляет сообщение с прогрессом рассылки.
+    Работает до отмены задачи.
+    :param status: Сообщение бота, которое редактируется
+    :param progress: Счётчики рассылки
+    :param interval: Интервал обновления в секундах
+    """
+    shown = status.text
+    while True:
+        await asyncio.sleep(interval)
+        text = progress.format()
+        if text == shown:
+            continue
+        try:
+            await status.edit_text(text)
+            shown = text
+        except Exception as e:
+            logger.debug("Не удалось обновить прогресс рассылки: %s", e)
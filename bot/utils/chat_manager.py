@@ -1,53 +1,65 @@
-import json
 import logging
-from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from aiogram.types import Message
+from bot.utils.chat_registry import get_registry
+from bot.utils.admin_cache import get_chat_admins
 
-# Настройка логирования
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
-# Абсолютный путь к файлу chat_list.json
-BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
-CHAT_LIST_FILE = DATA_DIR / "chat_list.json"
 
-
-def ensure_data_directory():
+async def sync_chats() -> None:
     """
-    Убедиться, что папка данных существует.
+    Подтягивает изменения реестра, сделанные другими копиями бота.
     """
-    DATA_DIR.mkdir(exist_ok=True)
+    await get_registry().refresh()
 
 
 def get_chat_list() -> List[Dict[str, Any]]:
     """
-    Загружает список чатов из файла.
-    :return: Список чатов или пустой список,
-    если файл отсутствует или повреждён.
+    Возвращает список всех чатов из реестра.
+    :return: Список чатов
     """
-    ensure_data_directory()
-    try:
-        with open(CHAT_LIST_FILE, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        logging.debug(f"Файл {CHAT_LIST_FILE} не найден. "
-                      f"Возвращён пустой список.")
-        return []
-    except json.JSONDecodeError:
-        logging.error(f"Ошибка чтения файла {CHAT_LIST_FILE}. "
-                      f"Возвращён пустой список.")
-        return []
+    return get_registry().all()
+
+
+def get_active_chats() -> List[Dict[str, Any]]:
+    """
+    Возвращает чаты, не помеченные как удалённые.
+    """
+    return get_registry().active_chats()
+
+
+def get_chat(chat_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает чат по ID или None, если чат не найден.
+    """
+    return get_registry().get(chat_id)
+
+
+def save_chat(chat: Dict[str, Any]) -> None:
+    """
+    Сохраняет один чат (запись в хранилище выполняется отложенно).
+    """
+    get_registry().save(chat)
+    logger.debug("Чат %s сохранён в реестре.", chat['id'])
+
+
+async def update_chat(chat_id: int, change) -> bool:
+    """
+    Изменяет чат по актуальным данным реестра (см. ChatRegistry.update).
+    :return: True, если чат изменён
+    """
+    return await get_registry().update(chat_id, change)
 
 
 def save_chat_list(chat_list: List[Dict[str, Any]]) -> None:
     """
-    Сохраняет список чатов в файл.
+    Сохраняет список чатов (запись в хранилище выполняется отложенно).
     """
-    ensure_data_directory()
-    with open(CHAT_LIST_FILE, "w", encoding="utf-8") as file:
-        json.dump(chat_list, file, indent=4, ensure_ascii=False)
-    logging.debug(f"Список чатов сохранён в файл {CHAT_LIST_FILE}.")
+    registry = get_registry()
+    for chat in chat_list:
+        registry.save(chat)
+    logger.debug("Список чатов сохранён в реестре.")
 
 
 async def is_user_admin(message: Message) -> bool:
@@ -55,10 +67,10 @@ async def is_user_admin(message: Message) -> bool:
     Проверяет, является ли пользователь администратором чата.
     """
     try:
-        chat_administrators = await message.bot.get_chat_administrators(
-            message.chat.id)
+        chat_administrators = await get_chat_admins(message.bot,
+                                                    message.chat.id)
         return any(admin.user.id == message.from_user.id for
                    admin in chat_administrators)
     except Exception as e:
-        logging.error(f"Ошибка при проверке администратора: {e}")
+        logger.error(f"Ошибка при проверке администратора: {e}")
         return False
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from bot.utils.storage import get_storage
+from bot.utils.state_backend import get_backend
+
+logger = logging.getLogger(__name__)
+
+# Задержка перед записью изменений (изменения за это время объединяются)
+FLUSH_DELAY_SECONDS = 2
+# Счётчик изменений реестра в общем хранилище состояния
+VERSION_KEY = "chat_registry:version"
+
+
+class ChatRegistry:
+    """
+    Реестр чатов в памяти процесса.
+    Загружается из хранилища один раз, хранит чаты по ID и
+    готовый список активных чатов. Изменения записываются в
+    хранилище отложенно одной транзакцией.
+    Если состояние разделяется между копиями бота, запись выполняется
+    под общей блокировкой, а реестр перечитывается из хранилища,
+    когда другая копия записала изменения.
+    """
+
+    def __init__(self, storage, flush_delay: float = FLUSH_DELAY_SECONDS,
+                 backend=None):
+        """
+        :param storage: Хранилище с методами get_chats и save_chats
+        :param flush_delay: Задержка отложенной записи в секундах
+        :param backend: Хранилище общего состояния (StateBackend)
+        """
+        self.storage = storage
+        self.flush_delay = flush_delay
+        self.backend = backend
+        self.version = None
+        self._chats = {chat["id"]: chat for chat in storage.get_chats()}
+        self._active = None
+        self._dirty = set()
+        self._flush_task = None
+
+    def get(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает копию данных чата или None.
+        """
+        chat = self._chats.get(chat_id)
+        return dict(chat) if chat else None
+
+    def all(self) -> List[Dict[str, Any]]:
+        """
+        Возвращает все чаты, включая удалённые.
+        """
+        return list(self._chats.values())
+
+    def active_chats(self) -> List[Dict[str, Any]]:
+        """
+        Возвращает чаты, не помеченные как удалённые.
+        Список пересчитывается только после изменений.
+        """
+        if self._active is None:
+            self._active = [chat for chat in self._chats.values()
+                            if not chat.get("deleted", False)]
+        return self._active
+
+    def save(self, chat: Dict[str, Any]) -> None:
+        """
+        Добавляет или обновляет чат и планирует запись в хранилище.
+        """
+        self._chats[chat["id"]] = dict(chat)
+        self._active = None
+        self._dirty.add(chat["id"])
+        self._schedule_flush()
+
+    async def update(self, chat_id: int, change) -> bool:
+        """
+        Изменяет чат по актуальным данным. При общем состоянии реестр
+        перечитывается, изменяется и записывается под одной блокировкой,
+        поэтому одновременные изменения из разных копий бота не теряются.
+        :param change: Функция, которая получает копию чата (или None)
+                       и возвращает новые данные чата или None,
+                       если менять ничего не нужно
+        :return: True, если чат изменён
+        """
+        if self.backend is None or not self.backend.shared:
+            return self._apply(chat_id, change)
+        async with self.backend.lock("chat_registry"):
+            await self.refresh()
+            if not self._apply(chat_id, change):
+                return False
+            await self._flush_locked()
+        return True
+
+    def _apply(self, chat_id: int, change) -> bool:
+        chat = change(self.get(chat_id))
+        if chat is None:
+            return False
+        self.save(chat)
+        return True
+
+    def flush(self) -> None:
+        """
+        Записывает накопленные изменения в хранилище одной транзакцией.
+        """
+        if not self._dirty:
+            return
+        chats = [self._chats[chat_id] for chat_id in self._dirty]
+        self.storage.save_chats(chats)
+        self._dirty.clear()
+        logger.debug("Реестр чатов: записано изменений %s.", len(chats))
+
+    async def flush_shared(self) -> None:
+        """
+        Записывает изменения; при общем состоянии — под блокировкой
+        и с увеличением счётчика изменений для других копий бота.
+        """
+        if not self._dirty:
+            return
+        if self.backend is None or not self.backend.shared:
+            self.flush()
+            return
+        async with self.backend.lock("chat_registry"):
+            await self._flush_locked()
+
+    async def _flush_locked(self) -> None:
+        self.flush()
+        await self.backend.incr(VERSION_KEY)
+
+    async def refresh(self) -> None:
+        """
+        Перечитывает реестр из хранилища, если другая копия бота
+        изменила его. Несохранённые локальные изменения остаются.
+        """
+        if self.backend is None or not self.backend.shared:
+            return
+        version = await self.backend.get(VERSION_KEY)
+        if version == self.version:
+            return
+        chats = {chat["id"]: chat for chat in self.storage.get_chats()}
+        for chat_id in self._dirty:
+            chats[chat_id] = self._chats[chat_id]
+        self._chats = chats
+        self._active = None
+        self.version = version
+        logger.debug("Реестр чатов перечитан (версия %s).", version)
+
+    def _schedule_flush(self) -> None:
+        """
+        Запускает отложенную запись, если она ещё не запланирована.
+        Вне цикла событий изменения записываются сразу.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush_shared()
+        except Exception as e:
+            logger.error(f"Не удалось записать реестр чатов: {e}")
+
+
+_registry = None
+
+
+def get_registry() -> ChatRegistry:
+    """
+    Возвращает общий реестр чатов, загружая его при первом вызове.
+    """
+    global _registry
+    if _registry is None:
+        _registry = ChatRegistry(get_storage(), backend=get_backend())
+    return _registry
+
+
+async def flush_registry() -> None:
+    """
+    Записывает несохранённые изменения реестра (при остановке бота).
+    """
+    if _registry is not None:
+        await _registry.flush_shared()
@@ -0,0 +1,57 @@
+import json
+from typing import Any, Dict, Optional
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (BaseStorage, DefaultKeyBuilder,
+                                      StorageKey)
+from aiogram.fsm.storage.memory import MemoryStorage
+from bot.utils.state_backend import StateBackend, get_backend
+
+
+class BackendStorage(BaseStorage):
+    """
+    Хранилище FSM aiogram поверх общего хранилища состояния,
+    чтобы состояние пользователя было видно всем копиям бота.
+    """
+
+    def __init__(self, backend: StateBackend):
+        """
+        :param backend: Хранилище состояния
+        """
+        self.backend = backend
+        self.key_builder = DefaultKeyBuilder(with_destiny=True)
+
+    async def set_state(self, key: StorageKey, state=None) -> None:
+        state_key = self.key_builder.build(key, "state")
+        if state is None:
+            await self.backend.delete(state_key)
+            return
+        value = state.state if isinstance(state, State) else state
+        await self.backend.set(state_key, value)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self.backend.get(self.key_builder.build(key, "state"))
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        data_key = self.key_builder.build(key, "data")
+        if not data:
+            await self.backend.delete(data_key)
+            return
+        await self.backend.set(data_key, json.dumps(data, ensure_ascii=False))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        raw = await self.backend.get(self.key_builder.build(key, "data"))
+        return json.loads(raw) if raw else {}
+
+    async def close(self) -> None:
+        pass
+
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    Возвращает хранилище FSM: общее, если состояние разделяется
+    между копиями бота, иначе обычное хранилище в памяти.
+    """
+    backend = get_backend()
+    if backend.shared:
+        return BackendStorage(backend)
+    return MemoryStorage()
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from openai import AsyncOpenAI
+from bot.config.tokens import OPENAI_API_KEY
+from bot.config.gpt_prompt import PROMPT
+from bot.config.flags import SEARCH_CACHE_ENABLE
+from bot.config.settings import (SEARCH_MODEL,
+                                 SEARCH_MAX_TOKENS,
+                                 SEARCH_TEMPERATURE,
+                                 SEARCH_MAX_CONCURRENT,
+                                 SEARCH_TIMEOUT_SECONDS)
+from bot.utils.search_cache import get_answer, save_answer
+from bot.utils.metrics import OPENAI_REQUESTS, OPENAI_SECONDS
+
+# Параметры модели для каждого запроса
+GPT_PARAMS = {
+    "model": SEARCH_MODEL,
+    "max_tokens": SEARCH_MAX_TOKENS,
+    "temperature": SEARCH_TEMPERATURE
+}
+
+# Ограничение числа одновременных запросов к OpenAI
+_semaphore = asyncio.Semaphore(SEARCH_MAX_CONCURRENT)
+_client = None
+
+
+class GptBusyError(Exception):
+    """
+    Все слоты для запросов к OpenAI заняты.
+    """
+
+
+def get_client() -> AsyncOpenAI:
+    """
+    Возвращает асинхронный клиент OpenAI (создаётся при первом вызове).
+    """
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(api_key=OPENAI_API_KEY,
+                              timeout=SEARCH_TIMEOUT_SECONDS)
+    return _client
+
+
+def build_messages(user_query: str) -> list:
+    """
+    Формирует список сообщений для запроса к модели.
+    :param user_query: Текст запроса пользователя
+    :return: Список сообщений с системным промптом
+    """
+    return [
+        {"role": "system", "content": PROMPT},
+        {"role": "user", "content": user_query}
+    ]
+
+
+def _cached_answer(user_query: str):
+    """
+    Возвращает ответ из кэша, если кэш включён.
+    """
+    if not SEARCH_CACHE_ENABLE:
+        return None
+    answer = get_answer(user_query, GPT_PARAMS)
+    if answer is not None:
+        OPENAI_REQUESTS.inc("cached")
+    return answer
+
+
+def _remember_answer(user_query: str, answer: str) -> None:
+    """
+    Сохраняет ответ в кэш, если кэш включён.
+    """
+    if SEARCH_CACHE_ENABLE and answer:
+        save_answer(user_query, GPT_PARAMS, answer)
+
+
+def _check_capacity() -> None:
+    """
+    Проверяет, есть ли свободный слот для запроса к OpenAI.
+    :raises GptBusyError: Если достигнут лимит одновременных запросов
+    """
+    if _semaphore.locked():
+        OPENAI_REQUESTS.inc("busy")
+        raise GptBusyError()
+
+
+@contextmanager
+def _track_request(mode: str):
+    """
+    Учитывает в метриках время и результат запроса к OpenAI.
+    :param mode: request — обычный запрос, stream — потоковый
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except asyncio.TimeoutError:
+        OPENAI_REQUESTS.inc("timeout")
+        raise
+    except Exception:
+        OPENAI_REQUESTS.inc("error")
+        raise
+    else:
+        OPENAI_REQUESTS.inc("ok")
+    finally:
+        OPENAI_SECONDS.observe(time.perf_counter() - start, mode)
+
+
+async def ask_gpt(user_query: str) -> str:
+    """
+    Отправляет запрос в OpenAI GPT, не блокируя цикл событий.
+    Повторные запросы обслуживаются из кэша без обращения к OpenAI.
+    :param user_query: Текст запроса пользователя
+    :return: Ответ модели
+    :raises GptBusyError: Если достигнут лимит одновременных запросов
+    :raises asyncio.TimeoutError: Если запрос не уложился в таймаут
+    """
+    cached = _cached_answer(user_query)
+    if cached is not None:
+        return cached
+
+    _check_capacity()
+    async with _semaphore:
+        with _track_request("request"):
+            response = await asyncio.wait_for(
+                get_client().chat.completions.create(
+                    messages=build_messages(user_query),
+                    **GPT_PARAMS
+                ),
+                timeout=SEARCH_TIMEOUT_SECONDS
+            )
+    answer = response.choices[0].message.content
+
+    _remember_answer(user_query, answer)
+    return answer
+
+
+async def stream_gpt(user_query: str):
+    """
+    Запрашивает ответ у OpenAI GPT в потоковом режиме.
+    Закэшированный ответ возвращается одним фрагментом.
+    :param user_query: Текст запроса пользователя
+    :return: Асинхронный генератор фрагментов ответа
+    :raises GptBusyError: Если достигнут лимит одновременных запросов
+    :raises asyncio.TimeoutError: Если очередной фрагмент не пришёл вовремя
+    """
+    cached = _cached_answer(user_query)
+    if cached is not None:
+        yield cached
+        return
+
+    _check_capacity()
+    parts = []
+    async with _semaphore:
+        with _track_request("stream"):
+            stream = await asyncio.wait_for(
+                get_client().chat.completions.create(
+                    messages=build_messages(user_query),
+                    stream=True,
+                    **GPT_PARAMS
+                ),
+                timeout=SEARCH_TIMEOUT_SECONDS
+            )
+            async for delta in _iter_deltas(stream):
+                parts.append(delta)
+                yield delta
+
+    _remember_answer(user_query, "".join(parts))
+
+
+async def _iter_deltas(stream):
+    """
+    Извлекает текст из потока фрагментов с таймаутом ожидания каждого.
+    :param stream: Поток ответа OpenAI
+    :return: Асинхронный генератор непустых фрагментов текста
+    """
+    chunks = stream.__aiter__()
+    while True:
+        try:
+            chunk = await asyncio.wait_for(anext(chunks),
+                                           timeout=SEARCH_TIMEOUT_SECONDS)
+        except StopAsyncIteration:
+            return
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
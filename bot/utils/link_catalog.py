@@ -0,0 +1,204 @@
+import asyncio
+import json
+import logging
+import re
+import tomllib
+from pathlib import Path
+from bot.config.settings import LINKS_FILE, LINKS_RELOAD_INTERVAL
+from bot.modules.menu import MenuCache, set_menus
+from bot.utils.link_search import LinkSearchIndex, set_index
+from bot.utils.link_tree import LinkTree, set_tree
+from bot.utils.message_parse import LinkMatcher, set_matcher
+from bot.utils.scheduler import cancel_tasks
+
+logger = logging.getLogger(__name__)
+
+# Путь к файлу каталога ссылок
+BASE_DIR = Path(__file__).resolve().parent.parent
+CATALOG_FILE = BASE_DIR / LINKS_FILE
+
+_watch_task = None
+# Время изменения загруженного файла и файла, который не удалось разобрать
+_loaded_mtime = None
+_failed_mtime = None
+
+
+class CatalogError(ValueError):
+    """
+    Ошибка формата каталога ссылок.
+    """
+
+
+def read_catalog(path: Path) -> dict:
+    """
+    Читает каталог ссылок из JSON- или TOML-файла.
+    Формат совпадает со структурой LINKS.
+    :param path: Путь к файлу
+    :return: Структура ссылок
+    """
+    if path.suffix == ".toml":
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def validate_catalog(links, path: str = "") -> None:
+    """
+    Проверяет структуру каталога ссылок.
+    :param links: Разделы одного уровня
+    :param path: Путь к текущему уровню (для сообщения об ошибке)
+    :raises CatalogError: Если структура некорректна
+    """
+    if not isinstance(links, dict):
+        raise CatalogError(f"{path or 'каталог'}: ожидался словарь разделов")
+    for name, content in links.items():
+        section_path = f"{path}/{name}"
+        _validate_section(content, section_path)
+        if "subsections" in content:
+            validate_catalog(content["subsections"], section_path)
+
+
+def _validate_section(content, section_path: str) -> None:
+    """
+    Проверяет поля одного раздела (без подразделов).
+    """
+    if not isinstance(content, dict):
+        raise CatalogError(f"{section_path}: ожидался словарь")
+    for field in ("key", "url"):
+        if not isinstance(content.get(field, ""), str):
+            raise CatalogError(f"{section_path}: {field} "
+                               f"должен быть строкой")
+    if "url" not in content and "subsections" not in content:
+        raise CatalogError(f"{section_path}: нет ни url, ни subsections")
+    _validate_regex(content.get("regex", []), section_path)
+    aliases = content.get("aliases", [])
+    if not (isinstance(aliases, list)
+            and all(isinstance(alias, str) for alias in aliases)):
+        raise CatalogError(f"{section_path}: aliases должен быть "
+                           f"списком строк")
+
+
+def _validate_regex(regex_list, section_path: str) -> None:
+    """
+    Проверяет список регулярных выражений раздела.
+    """
+    if not isinstance(regex_list, list):
+        raise CatalogError(f"{section_path}: regex должен быть списком")
+    for regex in regex_list:
+        try:
+            re.compile(regex, re.IGNORECASE)
+        except (re.error, TypeError) as e:
+            raise CatalogError(f"{section_path}: некорректное регулярное "
+                               f"выражение {regex!r}: {e}")
+
+
+def build_catalog(links: dict):
+    """
+    Строит дерево ссылок, матчер, меню и поисковый индекс
+    для нового каталога.
+    :param links: Проверенная структура ссылок
+    :return: Кортеж (дерево, матчер, меню, индекс)
+    """
+    tree = LinkTree(links)
+    return tree, LinkMatcher(tree), MenuCache(tree), LinkSearchIndex(tree)
+
+
+def _load_and_build(path: Path):
+    links = read_catalog(path)
+    validate_catalog(links)
+    # Матчер собирается здесь же: ошибка сборки общего шаблона
+    # считается ошибкой каталога, и продолжает работать прежний
+    try:
+        return build_catalog(links)
+    except re.error as e:
+        raise CatalogError(f"регулярные выражения не собираются "
+                           f"в общий шаблон: {e}")
+
+
+async def reload_catalog(path: Path = CATALOG_FILE) -> bool:
+    """
+    Загружает каталог из файла, если он изменился с прошлой загрузки.
+    Разбор и сборка выполняются в отдельном потоке; новые дерево,
+    матчер, меню и индекс подменяют текущие вместе, без ожидания между
+    присваиваниями. При ошибке продолжает работать прежний каталог.
+    Время изменения файла запоминается только после подмены каталога,
+    поэтому прерванная загрузка повторяется при следующей проверке.
+    :param path: Путь к файлу каталога
+    :return: True, если каталог обновлён
+    """
+    global _loaded_mtime, _failed_mtime
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    if mtime in (_loaded_mtime, _failed_mtime):
+        return False
+
+    try:
+        tree, matcher, menus, index = await asyncio.to_thread(
+            _load_and_build, path)
+    except (OSError, ValueError) as e:
+        _failed_mtime = mtime  # Не разбираем тот же файл повторно
+        logger.error(f"Каталог ссылок {path} не загружен: {e}")
+        return False
+
+    set_tree(tree)
+    set_matcher(matcher)
+    set_menus(menus)
+    set_index(index)
+    _loaded_mtime = mtime
+    logger.info(f"Каталог ссылок загружен из {path}: "
+                f"{len(tree.index)} разделов, {len(tree.leaves)} ссылок.")
+    return True
+
+
+async def watch_catalog(interval: float, path: Path = CATALOG_FILE) -> None:
+    """
+    Периодически проверяет файл каталога и перезагружает его
+    при изменении. Работает до отмены задачи.
+    :param interval: Интервал проверки в секундах
+    :param path: Путь к файлу каталога
+    """
+    while True:
+        await asyncio.sleep(interval)
+        await _safe_reload(path)
+
+
+async def _safe_reload(path: Path = CATALOG_FILE) -> None:
+    """
+    Перезагружает каталог; непредвиденная ошибка пишется в лог
+    и не останавливает бота и отслеживание файла.
+    """
+    try:
+        await reload_catalog(path)
+    except Exception:
+        logger.exception(f"Ошибка перезагрузки каталога ссылок {path}")
+
+
+async def start_catalog_watcher():
+    """
+    Загружает каталог ссылок при старте бота и запускает
+    отслеживание изменений файла.
+    """
+    global _watch_task
+    await _safe_reload()
+    _watch_task = asyncio.create_task(watch_catalog(LINKS_RELOAD_INTERVAL))
+
+
+async def stop_catalog_watcher():
+    """
+    Останавливает отслеживание каталога ссылок при остановке бота.
+    """
+    global _watch_task
+    await cancel_tasks([_watch_task])
+    _watch_task = None
+
+
+def register_link_catalog(dp):
+    """
+    Регистрирует загрузку и отслеживание каталога ссылок.
+    :param dp: Экземпляр Dispatcher
+    """
+    dp.startup.register(start_catalog_watcher)
+    dp.shutdown.register(stop_catalog_watcher)
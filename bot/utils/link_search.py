@@ -0,0 +1,197 @@
+import heapq
+import logging
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from bot.utils.link_tree import get_tree
+
+logger = logging.getLogger(__name__)
+
+# Длина n-граммы
+NGRAM_SIZE = 3
+# Минимальная оценка совпадения для /find
+MIN_SCORE = 0.3
+# n-граммы, встречающиеся чаще этой доли терминов (но не реже
+# STOP_GRAM_MIN_TERMS), не используются для отбора кандидатов
+STOP_GRAM_SHARE = 0.05
+STOP_GRAM_MIN_TERMS = 50
+
+# Транслитерация кириллицы: запросы «чарльз» и «charles»
+# приводятся к близким строкам и имеют общие n-граммы
+_TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e",
+    "ж": "zh", "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "h", "ц": "c", "ч": "ch", "ш": "sh", "щ": "sch", "ъ": "",
+    "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya", "w": "v", "q": "k",
+})
+_NON_WORD = re.compile(r"[\W_]+")
+# Служебные конструкции в регулярных выражениях LINKS
+_REGEX_NOISE = re.compile(r"\\b|\.\*|\\w\*|\^|\$")
+_REGEX_SPECIAL = set("[](){}|?+*.\\")
+
+
+class LinkSearchIndex:
+    """
+    Нечёткий поиск ссылок по инвертированному индексу n-грамм.
+    Индексируются названия, ключи и синонимы разделов-ссылок:
+    синонимы берутся из поля aliases и из простых регулярных
+    выражений. Текст транслитерируется в латиницу, поэтому поиск
+    устойчив к опечаткам и смене раскладки письма.
+    """
+
+    def __init__(self, tree, n: int = NGRAM_SIZE):
+        """
+        :param tree: Дерево ссылок (LinkTree)
+        :param n: Длина n-граммы
+        """
+        self.tree = tree
+        self.n = n
+        self._terms = []  # [(узел, n-граммы термина)]
+        postings = defaultdict(list)  # {n-грамма: [номер термина]}
+        for node in tree.leaves:
+            for term in _node_terms(node):
+                grams = self.ngrams(term)
+                if not grams:
+                    continue
+                term_id = len(self._terms)
+                self._terms.append((node, frozenset(grams)))
+                for gram in grams:
+                    postings[gram].append(term_id)
+        self._postings = {gram: tuple(ids) for gram, ids in postings.items()}
+        self._stop_gram_terms = max(STOP_GRAM_MIN_TERMS,
+                                    len(self._terms) * STOP_GRAM_SHARE)
+
+    def ngrams(self, text: str) -> set:
+        """
+        Возвращает множество n-грамм нормализованного текста.
+        """
+        grams = set()
+        for word in normalize(text).split():
+            padded = f" {word} "
+            grams.update(padded[i:i + self.n]
+                         for i in range(len(padded) - self.n + 1))
+        return grams
+
+    def search(self, query: str, limit: int = 5,
+               min_score: float = MIN_SCORE) -> list:
+        """
+        Ищет ссылки, похожие на запрос.
+        Оценка — коэффициент Дайса по n-граммам запроса и лучшего
+        термина раздела.
+        :param query: Текст запроса
+        :param limit: Максимальное количество результатов
+        :param min_score: Минимальная оценка (от 0 до 1)
+        :return: Список кортежей (оценка, узел) по убыванию оценки
+        """
+        grams = self.ngrams(query)
+        if not grams:
+            return []
+        best = {}  # {узел: оценка}
+        for term_id, common in self._count_common(grams).items():
+            node, term_grams = self._terms[term_id]
+            score = 2 * common / (len(grams) + len(term_grams))
+            if score >= min_score and score > best.get(node, 0):
+                best[node] = score
+        top = heapq.nlargest(limit, best.items(), key=lambda item: item[1])
+        return [(score, node) for node, score in top]
+
+    def _count_common(self, grams: set) -> dict:
+        """
+        Считает общие с запросом n-граммы для терминов-кандидатов.
+        Кандидаты отбираются по редким n-граммам запроса, чтобы
+        частые n-граммы не заставляли оценивать почти весь каталог.
+        :return: Словарь {номер термина: общих n-грамм}
+        """
+        postings = [ids for ids in map(self._postings.get, grams) if ids]
+        rare = [ids for ids in postings if len(ids) <= self._stop_gram_terms]
+        # Если частых n-грамм нет или нет редких, считаем все совпадения
+        if not rare or len(rare) == len(postings):
+            return Counter(chain.from_iterable(postings))
+        return {term_id: len(grams & self._terms[term_id][1])
+                for term_id in set(chain.from_iterable(rare))}
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит текст к нижнему регистру латиницей без знаков препинания.
+    """
+    text = _NON_WORD.sub(" ", text.lower()).translate(_TRANSLIT)
+    return " ".join(text.split())
+
+
+def _node_terms(node) -> list:
+    """
+    Возвращает тексты, по которым индексируется раздел.
+    """
+    terms = [node.name, *node.aliases]
+    if node.key:
+        terms.append(node.key.replace("_", " "))
+    terms.extend(filter(None, map(_regex_alias, node.regex)))
+    return terms
+
+
+def _regex_alias(regex: str):
+    """
+    Извлекает слово из простого регулярного выражения вида \\bслово.*
+    :return: Слово или None, если выражение сложнее
+    """
+    text = _REGEX_NOISE.sub("", regex).replace("\\", "")
+    if not text or _REGEX_SPECIAL.intersection(text):
+        return None
+    return text
+
+
+_index = None
+
+
+def get_index() -> LinkSearchIndex:
+    """
+    Возвращает поисковый индекс для текущего дерева ссылок.
+    После перестроения дерева индекс собирается заново один раз.
+    """
+    global _index
+    tree = get_tree()
+    if _index is None or _index.tree is not tree:
+        _index = LinkSearchIndex(tree)
+        logger.debug("Поисковый индекс ссылок собран: %s терминов.",
+                     len(_index._terms))
+    return _index
+
+
+def set_index(index: LinkSearchIndex) -> None:
+    """
+    Подменяет текущий индекс готовым (собранным для нового дерева).
+    """
+    global _index
+    _index = index
+
+
+def find_links(query: str, limit: int = 5,
+               min_score: float = MIN_SCORE) -> list:
+    """
+    Ищет ссылки по запросу с учётом опечаток.
+    :return: Список кортежей (название, ссылка) по убыванию оценки
+    """
+    return [(node.name, node.url)
+            for _, node in get_index().search(query, limit, min_score)]
+
+
+def find_links_in_text(text: str, min_score: float,
+                       min_word_length: int = 4) -> list:
+    """
+    Ищет ссылки по отдельным словам сообщения.
+    :param text: Текст сообщения
+    :param min_score: Минимальная оценка совпадения слова
+    :param min_word_length: Слова короче не учитываются
+    :return: Список кортежей (название, ссылка) по убыванию оценки
+    """
+    index = get_index()
+    best = {}
+    for word in set(normalize(text).split()):
+        if len(word) < min_word_length:
+            continue
+        for score, node in index.search(word, 1, min_score):
+            best[node] = max(score, best.get(node, 0))
+    ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+    return [(node.name, node.url) for node, _ in ranked]
@@ -0,0 +1,160 @@
+import logging
+from types import MappingProxyType
+from bot.config.links import LINKS
+
+logger = logging.getLogger(__name__)
+
+# Ключ и название корня дерева (главного меню)
+ROOT_KEY = "main"
+ROOT_NAME = "Главное меню"
+
+
+class LinkNode:
+    """
+    Узел дерева ссылок: раздел с подразделами или ссылка.
+    """
+
+    __slots__ = ("name", "key", "url", "regex", "aliases", "children",
+                 "parent")
+
+    def __init__(self, name, key=None, url=None, regex=None, aliases=None,
+                 parent=None):
+        """
+        :param name: Название раздела
+        :param key: Ключ раздела (для callback_data)
+        :param url: Ссылка (для конечных разделов)
+        :param regex: Список регулярных выражений для поиска
+        :param aliases: Синонимы названия для нечёткого поиска
+        :param parent: Родительский узел
+        """
+        self.name = name
+        self.key = key
+        self.url = url
+        self.regex = regex or []
+        self.aliases = aliases or []
+        self.children = []
+        self.parent = parent
+
+    @property
+    def is_section(self):
+        """
+        True, если узел открывает подменю, а не ведёт по ссылке.
+        """
+        return bool(self.children) or not self.url
+
+    def path(self):
+        """
+        Возвращает узлы от верхнего уровня до текущего (без корня).
+        """
+        nodes = []
+        node = self
+        while node.parent is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
+    def breadcrumbs(self, separator=" / "):
+        """
+        Возвращает путь к узлу в виде строки названий.
+        """
+        return separator.join(node.name for node in self.path())
+
+
+class LinkTree:
+    """
+    Дерево разделов, построенное один раз из LINKS.
+    Поддерживает любую глубину вложенности; узлы доступны
+    по ключу через плоский индекс без обхода дерева.
+    """
+
+    def __init__(self, links):
+        """
+        :param links: Структура ссылок в формате LINKS
+        """
+        self.root = LinkNode(ROOT_NAME, key=ROOT_KEY)
+        index = {ROOT_KEY: self.root}
+        leaves = []
+        _build_nodes(links, self.root, index, leaves)
+        self.index = MappingProxyType(index)  # {ключ: узел}
+        self.leaves = tuple(leaves)  # Ссылки в порядке LINKS
+
+    def get(self, key):
+        """
+        Возвращает узел по ключу или None.
+        """
+        return self.index.get(key)
+
+    def sections(self):
+        """
+        Возвращает все узлы, открывающие подменю, включая корень.
+        """
+        return [node for node in self.index.values() if node.children]
+
+
+def _build_nodes(data, parent, index, leaves):
+    """
+    Рекурсивно строит узлы дерева из структуры LINKS.
+    :param data: Подразделы текущего уровня
+    :param parent: Родительский узел
+    :param index: Плоский индекс {ключ: узел} (дополняется)
+    :param leaves: Список узлов-ссылок (дополняется)
+    """
+    for name, content in data.items():
+        if not isinstance(content, dict):
+            logger.warning(f"Пропущен раздел "
+                           f"'{name}' из-за некорректной структуры.")
+            continue
+        node = LinkNode(name, key=content.get("key"), url=content.get("url"),
+                        regex=content.get("regex"),
+                        aliases=content.get("aliases"), parent=parent)
+        parent.children.append(node)
+        _index_node(node, index)
+        _build_nodes(content.get("subsections", {}), node, index, leaves)
+        if node.url and not node.children:
+            leaves.append(node)
+
+
+def _index_node(node, index):
+    """
+    Добавляет узел в индекс по ключу. При повторе ключа
+    сохраняется первый узел.
+    """
+    if not node.key:
+        return
+    if node.key in index:
+        logger.warning(f"Повторяющийся ключ раздела '{node.key}' "
+                       f"в LINKS, раздел '{node.name}' не индексирован.")
+        return
+    index[node.key] = node
+
+
+_tree = LinkTree(LINKS)
+
+
+def get_tree():
+    """
+    Возвращает текущее дерево ссылок.
+    """
+    return _tree
+
+
+def set_tree(tree):
+    """
+    Подменяет текущее дерево ссылок готовым деревом.
+    """
+    global _tree
+    _tree = tree
+
+
+def rebuild_tree(links=None):
+    """
+    Перестраивает дерево ссылок (например, после изменения конфигурации).
+    Меню и поиск переходят на новое дерево при следующем обращении.
+    :param links: Новая структура ссылок (по умолчанию LINKS)
+    :return: Новое дерево
+    """
+    global _tree
+    _tree = LinkTree(LINKS if links is None else links)
+    logger.debug("Дерево ссылок перестроено: %s разделов, %s ссылок.",
+                 len(_tree.index), len(_tree.leaves))
+    return _tree
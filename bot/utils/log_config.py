@@ -0,0 +1,84 @@
+import json
+import logging
+import time
+from bot.config.settings import (LOG_LEVEL,
+                                 LOG_LEVELS,
+                                 LOG_FORMAT,
+                                 LOG_JSON,
+                                 LOG_SAMPLED_LOGGERS,
+                                 LOG_SAMPLE_PER_SECOND)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирует запись лога как одну строку JSON.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class DebugSampler(logging.Filter):
+    """
+    Ограничивает частоту DEBUG-записей: не более rate записей в секунду
+    для каждого места вызова. Записи других уровней не ограничиваются.
+    Количество пропущенных записей добавляется к следующей
+    пропущенной фильтром записи.
+    """
+
+    def __init__(self, rate: float, clock=time.monotonic):
+        """
+        :param rate: Записей в секунду для одного места вызова
+        :param clock: Функция текущего времени
+        """
+        super().__init__()
+        self.rate = rate
+        self.clock = clock
+        self._sites = {}  # {(файл, строка): [токены, время, пропущено]}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        now = self.clock()
+        site = self._sites.setdefault((record.pathname, record.lineno),
+                                      [self.rate, now, 0])
+        site[0] = min(self.rate, site[0] + (now - site[1]) * self.rate)
+        site[1] = now
+        if site[0] < 1:
+            site[2] += 1
+            return False
+        site[0] -= 1
+        if site[2]:
+            record.msg = f"{record.msg} [пропущено похожих: {site[2]}]"
+            site[2] = 0
+        return True
+
+
+def setup_logging(level: str = LOG_LEVEL, levels: dict = LOG_LEVELS,
+                  json_output: bool = LOG_JSON) -> None:
+    """
+    Настраивает логирование бота. Вызывается один раз при запуске.
+    :param level: Общий уровень логирования
+    :param levels: Уровни для отдельных подсистем {имя логгера: уровень}
+    :param json_output: Выводить записи в формате JSON
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if json_output
+                         else logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    for name, logger_level in levels.items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    sampler = DebugSampler(LOG_SAMPLE_PER_SECOND)
+    for name in LOG_SAMPLED_LOGGERS:
+        logging.getLogger(name).addFilter(sampler)
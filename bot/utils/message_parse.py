@@ -1,88 +1,180 @@
 import re
 import logging
-from bot.config.links import LINKS
+from bot.utils.link_tree import get_tree
 
-# Настройка логирования
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 
-def find_links_by_keyword(keyword):
+# Выражения, которые нельзя объединять через |: глобальные флаги
+# в начале ((?x) меняет разбор всего шаблона) и ссылки на группы
+# по номеру (\1, (?(1)...)), номера которых в общем шаблоне сдвигаются
+_STANDALONE = re.compile(r"^\(\?[aiLmsux]+\)|\\[1-9]|\(\?\(\d")
+
+
+class LinkMatcher:
     """
-    Функция для поиска ссылок по ключевому слову в структуре LINKS.
-    :param keyword: Ключевое слово для поиска
-    :return: Список кортежей (название, ссылка), соответствующих ключевому слову
+    Предкомпилированный поиск ссылок по дереву разделов.
+    Все регулярные выражения компилируются один раз: общий шаблон
+    отсекает сообщения без совпадений за один проход, а шаблоны
+    разделов определяют, какие именно ссылки вернуть. Выражения,
+    которые нельзя объединить (см. _STANDALONE), проверяются
+    по отдельности, как раньше.
     """
-    keyword = keyword.strip().lower()
-    logging.debug(f"Поиск по ключевому слову: {keyword}")
-    results = []
 
-    # Запускаем рекурсивный поиск
-    _recursive_search(LINKS, keyword, results)
+    def __init__(self, tree):
+        """
+        :param tree: Дерево ссылок (LinkTree)
+        """
+        self.tree = tree
+        self.sections = []  # [(название, ссылка, шаблон раздела)]
+        combinable = []
+        self.standalone = []  # Шаблоны, проверяемые по отдельности
+        for node in tree.leaves:
+            regexes = _valid_regexes(node.regex, node.name)
+            if not regexes:
+                continue
+            shared, single = _split_standalone(regexes)
+            single = [_compile_one(regex) for regex in single]
+            patterns = single
+            if shared:
+                patterns = [_compile_any(shared)
+                            or AnyPattern(map(_compile_one, shared))] + single
+            pattern = patterns[0] if len(patterns) == 1 else AnyPattern(
+                patterns)
+            self.sections.append((node.name, node.url, pattern))
+            combinable.extend(shared)
+            self.standalone.extend(single)
+        # None — общий шаблон не собрался, отбор только по разделам
+        self.combined = _compile_any(combinable)
+
+    def find(self, keyword):
+        """
+        Ищет разделы, регулярные выражения которых совпали с текстом.
+        :param keyword: Текст в нижнем регистре
+        :return: Список кортежей (название, ссылка) в порядке LINKS
+        """
+        if not self._may_match(keyword):
+            return []
+        return [(name, url) for name, url, pattern in self.sections
+                if pattern.search(keyword)]
+
+    def _may_match(self, keyword):
+        """
+        Быстрая проверка: может ли с текстом совпасть хоть один раздел.
+        """
+        if self.combined is None or self.combined.search(keyword):
+            return True
+        return any(pattern.search(keyword) for pattern in self.standalone)
+
+
+class AnyPattern:
+    """
+    Набор шаблонов, совпадающий, если совпал хотя бы один.
+    Используется, когда выражения нельзя объединить в один шаблон
+    (например, из-за одинаковых именованных групп).
+    """
 
-    if not results:
-        logging.debug("Совпадений не найдено.")
-    return results
+    def __init__(self, patterns):
+        """
+        :param patterns: Скомпилированные шаблоны
+        """
+        self.patterns = list(patterns)
+
+    def search(self, text):
+        for pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                return match
+        return None
 
 
-def _recursive_search(data, keyword, results, parent_name=""):
+def _compile_one(regex):
+    return re.compile(regex, re.IGNORECASE)
+
+
+def _split_standalone(regexes):
     """
-    Рекурсивный поиск по структуре LINKS.
-    :param data: Текущая структура данных
-    :param keyword: Ключевое слово для поиска
-    :param results: Список результатов
-    :param parent_name: Имя родительского раздела
+    Делит выражения на объединяемые и проверяемые по отдельности.
+    :return: Кортеж (объединяемые, отдельные)
     """
-    for key, value in data.items():
-        if _is_section(value):
-            _process_section(key, value, keyword, results)
-        elif _has_subsections(value):
-            section_name = _build_section_name(parent_name, key)
-            _recursive_search(value["subsections"],
-                              keyword,
-                              results,
-                              section_name)
+    shared, single = [], []
+    for regex in regexes:
+        (single if _STANDALONE.search(regex) else shared).append(regex)
+    return shared, single
 
 
-def _is_section(value):
+def _valid_regexes(regex_list, section_name=None):
     """
-    Проверяет, является ли элемент разделом с URL и регулярными выражениями.
-    :param value: Проверяемое значение
-    :return: True, если это раздел; иначе False
+    Возвращает корректные выражения раздела.
+    Некорректные выражения пропускаются с записью в лог.
+    :param regex_list: Список регулярных выражений
+    :param section_name: Название раздела (для лога)
+    """
+    valid = []
+    for regex in regex_list:
+        try:
+            _compile_one(regex)
+        except (re.error, TypeError) as e:
+            logger.error(f"Некорректное регулярное выражение '{regex}' "
+                         f"в разделе '{section_name}': {e}")
+            continue
+        valid.append(regex)
+    return valid
+
+
+def _compile_any(regexes):
     """
-    return isinstance(value, dict) and "url" in value and "regex" in value
+    Компилирует выражения в один шаблон-альтернативу.
+    :return: Шаблон или None, если выражений нет или их нельзя
+             объединить
+    """
+    if not regexes:
+        return None
+    try:
+        return _compile_one("|".join(f"(?:{regex})" for regex in regexes))
+    except re.error as e:
+        logger.warning("Выражения не объединяются в один шаблон: %s", e)
+        return None
+
 
+_matcher = None
 
-def _has_subsections(value):
+
+def get_matcher():
     """
-    Проверяет, есть ли у элемента вложенные подразделы.
-    :param value: Проверяемое значение
-    :return: True, если есть вложенные подразделы; иначе False
+    Возвращает матчер для текущего дерева ссылок.
+    После перестроения дерева матчер пересобирается один раз
+    и подменяет старый одним присваиванием.
     """
-    return isinstance(value, dict) and "subsections" in value
+    global _matcher
+    tree = get_tree()
+    if _matcher is None or _matcher.tree is not tree:
+        _matcher = LinkMatcher(tree)
+        logger.debug("Матчер ссылок пересобран: %s разделов.",
+                     len(_matcher.sections))
+    return _matcher
 
 
-def _process_section(key, value, keyword, results):
+def set_matcher(matcher):
     """
-    Обрабатывает текущий раздел и
-    проверяет совпадение с регулярными выражениями.
-    :param key: Название раздела
-    :param value: Данные раздела
-    :param keyword: Ключевое слово для поиска
-    :param results: Список результатов
+    Подменяет текущий матчер готовым (собранным для нового дерева).
     """
-    if is_match(keyword, value["regex"]):
-        logging.debug(f"Найдено совпадение: {key} -> {value['url']}")
-        results.append((key, value["url"]))
+    global _matcher
+    _matcher = matcher
 
 
-def _build_section_name(parent_name, key):
+def find_links_by_keyword(keyword):
     """
-    Строит имя текущего раздела с учётом родительского имени.
-    :param parent_name: Имя родительского раздела
-    :param key: Текущий ключ
-    :return: Полное имя раздела
+    Функция для поиска ссылок по ключевому слову в структуре LINKS.
+    :param keyword: Ключевое слово для поиска
+    :return: Список кортежей (название, ссылка), соответствующих ключевому слову
     """
-    return parent_name + f" > {key}" if parent_name else key
+    keyword = keyword.strip().lower()
+    results = get_matcher().find(keyword)
+
+    if not results:
+        logger.debug("Совпадений не найдено.")
+    return results
 
 
 def is_match(keyword, regex_list):
@@ -0,0 +1,202 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Границы корзин гистограмм по умолчанию, сек
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10, 30)
+
+
+class Metric:
+    """
+    Базовый класс метрики с метками.
+    Значения хранятся по кортежу значений меток, поэтому запись —
+    это поиск в словаре и сложение без блокировок (бот работает
+    в одном потоке цикла событий).
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        """
+        :param name: Имя метрики в формате Prometheus
+        :param documentation: Описание для строки # HELP
+        :param labelnames: Имена меток
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _labels(self, labels) -> str:
+        if not labels:
+            return ""
+        pairs = ",".join(f'{name}="{_escape(value)}"'
+                         for name, value in labels)
+        return "{" + pairs + "}"
+
+    def render(self) -> list:
+        """
+        Возвращает строки метрики в текстовом формате Prometheus.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            labels = list(zip(self.labelnames, key))
+            lines.extend(self._render_value(labels, value))
+        return lines
+
+    def _render_value(self, labels, value) -> list:
+        return [f"{self.name}{self._labels(labels)} {_number(value)}"]
+
+
+class Counter(Metric):
+    """
+    Монотонно растущий счётчик.
+    """
+
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        """
+        Увеличивает счётчик.
+        :param labels: Значения меток в порядке labelnames
+        :param amount: Величина приращения
+        """
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+
+class Histogram(Metric):
+    """
+    Гистограмма длительностей с фиксированными границами корзин.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Верхние границы корзин по возрастанию
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels) -> None:
+        """
+        Учитывает одно наблюдение.
+        :param value: Значение (для длительностей — секунды)
+        :param labels: Значения меток в порядке labelnames
+        """
+        state = self._values.get(labels)
+        if state is None:
+            # [счётчики корзин (+ корзина +Inf), сумма]
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        """
+        Измеряет длительность блока with, в том числе завершённого
+        исключением.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _render_value(self, labels, value) -> list:
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), counts):
+            cumulative += count
+            le = self._labels(labels + [("le", _number(bound))])
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        lines.append(f"{self.name}_sum{self._labels(labels)} "
+                     f"{_number(total)}")
+        lines.append(f"{self.name}_count{self._labels(labels)} "
+                     f"{cumulative}")
+        return lines
+
+
+def _escape(value) -> str:
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _number(value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Набор метрик, отдаваемых одним ответом /metrics.
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, documentation: str,
+                labelnames=()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(),
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames,
+                                   buckets))
+
+    def _add(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Возвращает все метрики в текстовом формате Prometheus.
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+UPDATES = registry.counter(
+    "bot_updates_total", "Полученные обновления по типам.", ["type"])
+HANDLER_SECONDS = registry.histogram(
+    "bot_handler_seconds", "Время работы обработчиков.", ["handler"])
+HANDLER_ERRORS = registry.counter(
+    "bot_handler_errors_total",
+    "Исключения, вышедшие из обработчиков.", ["handler"])
+OPENAI_SECONDS = registry.histogram(
+    "bot_openai_request_seconds",
+    "Время запросов к OpenAI (для потока — до последнего фрагмента).",
+    ["mode"], buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60))
+OPENAI_REQUESTS = registry.counter(
+    "bot_openai_requests_total",
+    "Запросы /search по результату: ok, cached, busy, timeout, error.",
+    ["result"])
+KEYWORD_MESSAGES = registry.counter(
+    "bot_keyword_messages_total",
+    "Сообщения, проверенные на ключевые слова: hit или miss.", ["result"])
+LINK_MATCHES = registry.counter(
+    "bot_link_matches_total",
+    "Найденные в сообщениях ссылки по разделам LINKS.",
+    ["section", "method"])
+ANNOUNCE_DELIVERIES = registry.counter(
+    "bot_announce_deliveries_total",
+    "Доставки рассылки по чатам: sent или failed.", ["result"])
+BOT_API_SECONDS = registry.histogram(
+    "bot_api_request_seconds", "Время вызовов Bot API.", ["method"])
+BOT_API_ERRORS = registry.counter(
+    "bot_api_errors_total", "Ошибки Bot API по методам и кодам.",
+    ["method", "code"])
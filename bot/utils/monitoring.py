@@ -0,0 +1,201 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from aiohttp import web
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import (TelegramAPIError,
+                                TelegramBadRequest,
+                                TelegramConflictError,
+                                TelegramEntityTooLarge,
+                                TelegramForbiddenError,
+                                TelegramNetworkError,
+                                TelegramNotFound,
+                                TelegramRetryAfter,
+                                TelegramServerError,
+                                TelegramUnauthorizedError)
+from bot.config.flags import METRICS_ENABLE, SLOW_UPDATE_CAPTURE_ENABLE
+from bot.config.settings import METRICS_HOST, METRICS_PORT, METRICS_PATH
+from bot.utils.metrics import (registry,
+                               UPDATES,
+                               HANDLER_SECONDS,
+                               HANDLER_ERRORS,
+                               BOT_API_SECONDS,
+                               BOT_API_ERRORS)
+
+logger = logging.getLogger(__name__)
+
+# Код ошибки Bot API для метки code (по классу исключения aiogram)
+ERROR_CODES = {
+    TelegramRetryAfter: "429",
+    TelegramBadRequest: "400",
+    TelegramUnauthorizedError: "401",
+    TelegramForbiddenError: "403",
+    TelegramNotFound: "404",
+    TelegramConflictError: "409",
+    TelegramEntityTooLarge: "413",
+    TelegramServerError: "5xx",
+    TelegramNetworkError: "network",
+}
+
+_runner = None
+
+# Этапы обработки текущего обновления: [(этап, имя, секунд)];
+# None, если этапы не собираются
+_stages = ContextVar("update_stages", default=None)
+
+
+def error_code(error: TelegramAPIError) -> str:
+    """
+    Возвращает код ошибки Bot API по классу исключения.
+    """
+    for cls in type(error).__mro__:
+        if cls in ERROR_CODES:
+            return ERROR_CODES[cls]
+    return "other"
+
+
+def record_stage(stage: str, name: str, start: float) -> None:
+    """
+    Добавляет этап к текущему обновлению, если этапы собираются.
+    :param stage: Вид этапа (handler, api)
+    :param name: Имя обработчика или метода Bot API
+    :param start: Время начала этапа по time.perf_counter()
+    """
+    stages = _stages.get()
+    if stages is not None:
+        stages.append((stage, name, time.perf_counter() - start))
+
+
+@contextmanager
+def collect_stages():
+    """
+    Собирает этапы обработки обновления (время обработчиков и вызовов
+    Bot API из middleware метрик) внутри блока with.
+    :return: Список этапов [(этап, имя, секунд)], пополняемый в блоке
+    """
+    stages = []
+    token = _stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _stages.reset(token)
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """
+    Внешний middleware обновлений: считает обновления по типам.
+    """
+
+    async def __call__(self, handler, event, data):
+        UPDATES.inc(event.event_type)
+        return await handler(event, data)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware событий: измеряет время работы
+    сработавшего обработчика и считает вышедшие из него исключения.
+    """
+
+    async def __call__(self, handler, event, data):
+        name = data["handler"].callback.__name__
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(name)
+            raise
+        finally:
+            HANDLER_SECONDS.observe(time.perf_counter() - start, name)
+            record_stage("handler", name, start)
+
+
+class BotApiMetricsMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: время вызовов Bot API и коды ошибок
+    (в том числе 429 от flood control).
+    """
+
+    async def __call__(self, make_request, bot, method):
+        name = method.__api_method__
+        start = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except TelegramAPIError as e:
+            BOT_API_ERRORS.inc(name, error_code(e))
+            raise
+        finally:
+            BOT_API_SECONDS.observe(time.perf_counter() - start, name)
+            record_stage("api", name, start)
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """
+    Отдаёт метрики в текстовом формате Prometheus.
+    """
+    return web.Response(text=registry.render(),
+                        content_type="text/plain",
+                        charset="utf-8",
+                        headers={"Cache-Control": "no-cache"})
+
+
+def create_metrics_app(path: str = METRICS_PATH) -> web.Application:
+    """
+    Создаёт aiohttp-приложение с одним маршрутом метрик.
+    """
+    app = web.Application()
+    app.router.add_get(path, handle_metrics)
+    return app
+
+
+async def attach_api_metrics(bot: Bot):
+    """
+    Подключает учёт вызовов Bot API при старте бота.
+    """
+    bot.session.middleware(BotApiMetricsMiddleware())
+
+
+async def start_metrics():
+    """
+    Запускает HTTP-сервер метрик при старте бота. Сервер отдельный
+    от webhook, чтобы метрики не публиковались на внешнем адресе.
+    """
+    global _runner
+    _runner = web.AppRunner(create_metrics_app())
+    await _runner.setup()
+    await web.TCPSite(_runner, METRICS_HOST, METRICS_PORT).start()
+    logger.info(f"Метрики доступны на "
+                f"{METRICS_HOST}:{METRICS_PORT}{METRICS_PATH}")
+
+
+async def stop_metrics():
+    """
+    Останавливает HTTP-сервер метрик.
+    """
+    global _runner
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
+
+
+def register_metrics(dp: Dispatcher):
+    """
+    Регистрирует сбор метрик обновлений, обработчиков и Bot API
+    и сервер метрик. Middleware подключаются и без сервера метрик,
+    если включено сохранение медленных обновлений: оно берёт из них
+    время этапов.
+    :param dp: Экземпляр Dispatcher
+    """
+    if not (METRICS_ENABLE or SLOW_UPDATE_CAPTURE_ENABLE):
+        return
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    handler_metrics = HandlerMetricsMiddleware()
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware(handler_metrics)
+    dp.startup.register(attach_api_metrics)
+    if METRICS_ENABLE:
+        dp.startup.register(start_metrics)
+        dp.shutdown.register(stop_metrics)
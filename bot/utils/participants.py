@@ -0,0 +1,79 @@
+import random
+import time
+from collections import OrderedDict, namedtuple
+from bot.config.settings import (PARTICIPANTS_MAX_PER_CHAT,
+                                 PARTICIPANTS_MAX_CHATS,
+                                 PARTICIPANTS_MAX_AGE_DAYS)
+
+# Компактная запись об участнике (совместима по полям с aiogram User)
+Participant = namedtuple("Participant", ["id", "full_name", "username"])
+
+
+class ParticipantIndex:
+    """
+    Индекс недавно активных участников по чатам.
+    Участники чата хранятся в порядке последней активности:
+    давно молчавшие снимаются с начала очереди, размер ограничен
+    как для одного чата, так и по числу чатов.
+    """
+
+    def __init__(self, max_per_chat: int, max_chats: int, max_age: float,
+                 clock=time.monotonic):
+        """
+        :param max_per_chat: Максимум участников на один чат
+        :param max_chats: Максимум отслеживаемых чатов
+        :param max_age: Время в секундах, после которого участник забывается
+        :param clock: Функция текущего времени
+        """
+        self.max_per_chat = max_per_chat
+        self.max_chats = max_chats
+        self.max_age = max_age
+        self.clock = clock
+        self._chats = OrderedDict()  # {chat_id: OrderedDict{user_id: ...}}
+
+    def touch(self, chat_id: int, user) -> None:
+        """
+        Отмечает активность пользователя в чате.
+        :param chat_id: ID чата
+        :param user: Пользователь aiogram (боты пропускаются)
+        """
+        if user is None or user.is_bot:
+            return
+        members = self._chats.get(chat_id)
+        if members is None:
+            members = self._chats[chat_id] = OrderedDict()
+            while len(self._chats) > self.max_chats:
+                self._chats.popitem(last=False)
+        else:
+            self._chats.move_to_end(chat_id)
+        members[user.id] = (self.clock(),
+                            Participant(user.id, user.full_name,
+                                        user.username))
+        members.move_to_end(user.id)
+        while len(members) > self.max_per_chat:
+            members.popitem(last=False)
+
+    def participants(self, chat_id: int) -> list:
+        """
+        Возвращает недавно активных участников чата.
+        """
+        members = self._chats.get(chat_id)
+        if not members:
+            return []
+        deadline = self.clock() - self.max_age
+        while members and next(iter(members.values()))[0] < deadline:
+            members.popitem(last=False)
+        return [participant for _, participant in members.values()]
+
+    def choose(self, chat_id: int):
+        """
+        Выбирает случайного недавно активного участника чата.
+        :return: Participant или None, если активных участников нет
+        """
+        members = self.participants(chat_id)
+        return random.choice(members) if members else None
+
+
+participant_index = ParticipantIndex(PARTICIPANTS_MAX_PER_CHAT,
+                                     PARTICIPANTS_MAX_CHATS,
+                                     PARTICIPANTS_MAX_AGE_DAYS * 24 * 60 * 60)
@@ -0,0 +1,348 @@
+import asyncio
+import io
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import Counter, deque
+from collections.abc import Mapping
+from aiogram.types import TelegramObject
+from bot.config.settings import (PROFILE_SAMPLE_INTERVAL,
+                                 PROFILE_TOP_N,
+                                 PROFILE_TRACEMALLOC_FRAMES)
+
+# Контейнеры, содержимое которых учитывается при оценке размера
+_CONTAINERS = (list, tuple, set, frozenset, deque)
+# Значения, которые не содержат ссылок на другие объекты
+_ATOMS = (str, bytes, int, float, bool, type(None))
+# Объекты, атрибуты которых не относятся к данным бота: код, модули,
+# цикл событий, задачи, потоки, соединения, файлы и журналы
+_OPAQUE = (type, types.ModuleType, types.FunctionType,
+           types.BuiltinFunctionType, types.MethodType, types.CodeType,
+           types.FrameType, types.CoroutineType, types.GeneratorType,
+           asyncio.AbstractEventLoop, asyncio.Future, asyncio.BaseTransport,
+           threading.Thread, socket.socket, io.IOBase,
+           logging.Logger, logging.Handler)
+
+
+class StackSampler:
+    """
+    Выборочный профилировщик: отдельный поток с заданным интервалом
+    снимает стек потока цикла событий и считает, в каких функциях
+    он находится. Сам цикл событий не замедляется трассировкой.
+    """
+
+    def __init__(self, interval: float, thread_id: int = None):
+        """
+        :param interval: Интервал между выборками, сек
+        :param thread_id: Поток, стек которого снимается (по умолчанию
+                          текущий)
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = 0
+        self.own = Counter()  # {функция: выборок на вершине стека}
+        self.total = Counter()  # {функция: выборок в любом месте стека}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="stack-sampler")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame) -> None:
+        self.samples += 1
+        self.own[_frame_key(frame)] += 1
+        seen = set()
+        while frame is not None:
+            key = _frame_key(frame)
+            if key not in seen:
+                seen.add(key)
+                self.total[key] += 1
+            frame = frame.f_back
+
+
+def _frame_key(frame) -> tuple:
+    code = frame.f_code
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+class ProfileSession:
+    """
+    Сеанс профилирования диспетчера: выборки стека, время обработки
+    обновлений и выделения памяти (tracemalloc). Учёт обновлений
+    подключается к диспетчеру только на время сеанса, поэтому вне
+    сеанса профилирование ничего не стоит.
+    """
+
+    def __init__(self, dp, interval: float = PROFILE_SAMPLE_INTERVAL,
+                 top_n: int = PROFILE_TOP_N,
+                 trace_frames: int = PROFILE_TRACEMALLOC_FRAMES):
+        """
+        :param dp: Экземпляр Dispatcher
+        :param interval: Интервал между выборками стека, сек
+        :param top_n: Количество строк в каждом разделе отчёта
+        :param trace_frames: Глубина стека выделений памяти
+        """
+        self.dp = dp
+        self.top_n = top_n
+        self.trace_frames = trace_frames
+        self.sampler = StackSampler(interval)
+        self.updates = {}  # {тип: [количество, суммарное время, максимум]}
+        self.update_count = 0
+        self.max_updates = None
+        self.duration = 0.0
+        self._done = asyncio.Event()
+        self._started_tracemalloc = False
+
+    async def run(self, seconds: float, max_updates: int = None) -> str:
+        """
+        Профилирует бота seconds секунд или до обработки
+        max_updates обновлений.
+        :return: Текст отчёта
+        """
+        self.max_updates = max_updates
+        before = self._start()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            after = self._stop()
+            self.duration = time.monotonic() - start
+        allocations = await asyncio.to_thread(self._allocations,
+                                              before, after)
+        holders = largest_holders(self.top_n,
+                                  {"Dispatcher.storage": self.dp.storage})
+        return self.format_report(allocations, holders)
+
+    async def _track_update(self, handler, event, data):
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            self._count_update(event.event_type, time.perf_counter() - start)
+
+    def _count_update(self, event_type: str, elapsed: float) -> None:
+        stats = self.updates.setdefault(event_type, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        self.update_count += 1
+        if self.max_updates and self.update_count >= self.max_updates:
+            self._done.set()
+
+    def _start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracemalloc = True
+        before = tracemalloc.take_snapshot()
+        self.dp.update.outer_middleware.register(self._track_update)
+        self.sampler.start()
+        return before
+
+    def _stop(self):
+        self.sampler.stop()
+        self.dp.update.outer_middleware.unregister(self._track_update)
+        after = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        return after
+
+    def _allocations(self, before, after) -> list:
+        """
+        Возвращает места, где за время сеанса выросла занятая память.
+        """
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                   tracemalloc.Filter(False, __file__)]
+        diff = after.filter_traces(filters).compare_to(
+            before.filter_traces(filters), "traceback")
+        return [stat for stat in diff if stat.size_diff > 0][:self.top_n]
+
+    def format_report(self, allocations, holders) -> str:
+        """
+        Формирует текстовый отчёт сеанса.
+        """
+        lines = [f"Профилирование: {self.duration:.1f} сек, "
+                 f"обновлений {self.update_count}, "
+                 f"выборок стека {self.sampler.samples}.", ""]
+        lines += self._format_updates()
+        lines += self._format_functions(
+            "Горячие функции (собственное время)", self.sampler.own)
+        lines += self._format_functions(
+            "Горячие функции (с вызванными функциями)", self.sampler.total)
+        lines += _format_allocations(allocations)
+        lines += _format_holders(holders)
+        return "\n".join(lines)
+
+    def _format_updates(self) -> list:
+        lines = ["Обновления по типам:"]
+        for event_type, (count, total, longest) in sorted(
+                self.updates.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {event_type}: {count}, "
+                         f"в среднем {total / count * 1000:.1f} мс, "
+                         f"максимум {longest * 1000:.1f} мс")
+        return lines + [""]
+
+    def _format_functions(self, title: str, counts: Counter) -> list:
+        samples = self.sampler.samples or 1
+        lines = [f"{title}:"]
+        for key, count in counts.most_common(self.top_n):
+            lines.append(f"  {count / samples:6.1%} {count:6}  "
+                         f"{_format_function(key)}")
+        return lines + [""]
+
+
+def _format_function(key: tuple) -> str:
+    filename, lineno, name = key
+    return f"{name} ({_short_path(filename)}:{lineno})"
+
+
+def _short_path(filename: str) -> str:
+    """
+    Сокращает путь к файлу: относительно рабочего каталога
+    или до последних компонентов пути.
+    """
+    relative = os.path.relpath(filename)
+    if not relative.startswith(".."):
+        return relative
+    return os.path.join(*filename.split(os.sep)[-3:])
+
+
+def _format_allocations(allocations) -> list:
+    lines = ["Память, выделенная за время профилирования (tracemalloc):"]
+    for stat in allocations:
+        frame = stat.traceback[-1]
+        lines.append(f"  {_format_size(stat.size_diff)} в "
+                     f"{stat.count_diff} блоках: "
+                     f"{_short_path(frame.filename)}:{frame.lineno}")
+        caller = _bot_frame(stat.traceback)
+        if caller is not None and caller != frame:
+            lines.append(f"    вызвано из {_short_path(caller.filename)}"
+                         f":{caller.lineno}")
+    return lines + [""]
+
+
+def _bot_frame(traceback):
+    """
+    Возвращает ближайший к месту выделения кадр из кода бота.
+    """
+    bot_dir = os.path.dirname(os.path.dirname(__file__))
+    for frame in reversed(traceback):
+        if frame.filename.startswith(bot_dir):
+            return frame
+    return None
+
+
+def _format_holders(holders) -> list:
+    lines = ["Крупные структуры бота (оценка; общие объекты "
+             "учитываются в каждой структуре):"]
+    for name, size in holders:
+        lines.append(f"  {_format_size(size):>10}  {name}")
+    return lines
+
+
+def _format_size(size: int) -> str:
+    for unit in ("Б", "КБ", "МБ"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} ГБ"
+
+
+def deep_sizeof(obj) -> int:
+    """
+    Оценивает память, занятую объектом и доступными из него данными:
+    содержимым контейнеров и атрибутами объектов (например, записями
+    MemoryStorage aiogram). Код, модули, задачи, потоки и соединения
+    учитываются только собственным размером.
+    """
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj, 0)
+        stack.extend(_referents(obj))
+    return size
+
+
+def _referents(obj):
+    """
+    Возвращает объекты, размер которых входит в размер obj.
+    """
+    if isinstance(obj, _ATOMS):
+        return ()
+    if isinstance(obj, Mapping):
+        return [*obj.keys(), *obj.values()]
+    if isinstance(obj, _CONTAINERS):
+        return obj
+    if isinstance(obj, _OPAQUE):
+        return ()
+    return _attributes(obj)
+
+
+def _is_bot_object(obj) -> bool:
+    return (type(obj).__module__.startswith("bot.")
+            or isinstance(obj, TelegramObject))
+
+
+def _attributes(obj) -> list:
+    values = [obj.__dict__] if hasattr(obj, "__dict__") else []
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(obj, name):
+                values.append(getattr(obj, name))
+    return values
+
+
+def largest_holders(top_n: int, extra: dict = None) -> list:
+    """
+    Оценивает размер глобальных объектов модулей бота
+    (кэши, индексы, реестры) и дополнительных объектов.
+    Объект, импортированный в несколько модулей, учитывается один раз.
+    :param top_n: Количество крупнейших объектов
+    :param extra: Дополнительные объекты {имя: объект}
+                  (например, хранилище FSM)
+    :return: Список кортежей (имена, размер в байтах) по убыванию размера
+    """
+    holders = {id(obj): ([name], obj) for name, obj in (extra or {}).items()}
+    for module_name, module in list(sys.modules.items()):
+        if not module_name.startswith("bot.") or module_name == __name__:
+            continue
+        for name, value in vars(module).items():
+            if not name.startswith("__") and _is_data(value):
+                names, _ = holders.setdefault(id(value), ([], value))
+                names.append(f"{module_name}.{name}")
+    sizes = [(", ".join(names), deep_sizeof(value))
+             for names, value in holders.values()]
+    sizes.sort(key=lambda item: item[1], reverse=True)
+    return sizes[:top_n]
+
+
+def _is_data(value) -> bool:
+    """
+    True для данных модуля, а не импортированных функций, классов
+    и модулей.
+    """
+    return not (isinstance(value, (type, type(sys)))
+                or callable(value) and not _is_bot_object(value))
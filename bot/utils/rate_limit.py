@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from aiogram.exceptions import TelegramRetryAfter
+from bot.config.settings import (SEND_GLOBAL_RATE,
+                                 SEND_CHAT_RATE,
+                                 SEND_MAX_RETRIES)
+
+logger = logging.getLogger(__name__)
+
+# Сколько корзин чатов хранить, прежде чем удалить простаивающие
+MAX_CHAT_BUCKETS = 10000
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты по алгоритму token bucket.
+    Ожидающие вызовы обслуживаются по очереди.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        :param rate: Скорость пополнения (токенов в секунду)
+        :param capacity: Ёмкость корзины (по умолчанию равна rate)
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waiters = 0  # Вызовы, которые ждут или забирают токен
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостанавливает выдачу токенов на указанное время.
+        """
+        self.paused_until = max(self.paused_until,
+                                time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """
+        Ожидает и забирает один токен.
+        """
+        self.waiters += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._take()
+                    if delay <= 0:
+                        return
+                    await asyncio.sleep(delay)
+        finally:
+            self.waiters -= 1
+
+    def _take(self) -> float:
+        """
+        Пытается забрать токен.
+        :return: 0, если токен получен; иначе время ожидания в секундах
+        """
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Ограничитель вызовов Bot API: общий лимит бота и лимит на каждый чат.
+    Ответ TelegramRetryAfter приостанавливает все отправки на
+    запрошенное время, после чего вызов повторяется.
+    """
+
+    def __init__(self, global_rate: float, chat_rate: float,
+                 max_retries: int = 3):
+        """
+        :param global_rate: Сообщений в секунду для всего бота
+        :param chat_rate: Сообщений в секунду для одного чата
+        :param max_retries: Количество повторов после TelegramRetryAfter
+        """
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self._chat_buckets = {}
+
+    async def acquire(self, chat_id: int) -> None:
+        """
+        Ожидает разрешения на отправку в чат.
+        """
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= MAX_CHAT_BUCKETS:
+                self._drop_idle_buckets()
+            bucket = TokenBucket(self.chat_rate, capacity=1)
+            self._chat_buckets[chat_id] = bucket
+        await bucket.acquire()
+        await self.global_bucket.acquire()
+
+    async def call(self, chat_id: int, func, *args, **kwargs):
+        """
+        Выполняет вызов Bot API с учётом лимитов и повторов.
+        :param chat_id: ID чата назначения
+        :param func: Асинхронная функция вызова
+        :return: Результат вызова
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(chat_id)
+            try:
+                return await func(*args, **kwargs)
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Flood control при отправке в чат "
+                               f"{chat_id}: пауза {e.retry_after} сек.")
+                self.global_bucket.pause(e.retry_after)
+
+    def _drop_idle_buckets(self) -> None:
+        """
+        Удаляет корзины чатов, которые успели полностью наполниться
+        и которых никто не ждёт: иначе следующий вызов для чата создал
+        бы новую корзину и обошёл лимит ожидающих.
+        """
+        now = time.monotonic()
+        idle_after = 1 / self.chat_rate
+        self._chat_buckets = {
+            chat_id: bucket for chat_id, bucket in self._chat_buckets.items()
+            if bucket.waiters or now - bucket.updated < idle_after
+        }
+
+
+# Общий ограничитель отправки для рассылок и фоновых задач бота
+limiter = RateLimiter(SEND_GLOBAL_RATE, SEND_CHAT_RATE, SEND_MAX_RETRIES)
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class RecentLinks:
+    """
+    Недавно отправленные ссылки по чатам с ограниченным временем жизни.
+    Ссылки чата хранятся в порядке отправки, поэтому он совпадает с
+    порядком истечения: просроченные записи снимаются с начала очереди
+    при обращении и периодической очисткой. Размер ограничен как
+    для одного чата, так и суммарно по числу чатов.
+    """
+
+    def __init__(self, ttl: float, max_links_per_chat: int,
+                 max_chats: int, clock=time.monotonic):
+        """
+        :param ttl: Время, в течение которого ссылка не отправляется повторно
+        :param max_links_per_chat: Максимум ссылок на один чат
+        :param max_chats: Максимум отслеживаемых чатов
+        :param clock: Функция текущего времени
+        """
+        self.ttl = ttl
+        self.max_links_per_chat = max_links_per_chat
+        self.max_chats = max_chats
+        self.clock = clock
+        self._chats = OrderedDict()  # {chat_id: OrderedDict{url: истечение}}
+
+    def __len__(self):
+        return sum(len(links) for links in self._chats.values())
+
+    def filter(self, chat_id: int, results: list) -> list:
+        """
+        Отбрасывает ссылки, недавно отправленные в чат,
+        и запоминает оставшиеся как отправленные.
+        :param chat_id: ID чата
+        :param results: Список кортежей (название, ссылка)
+        :return: Отфильтрованный список
+        """
+        now = self.clock()
+        links = self._get_chat(chat_id, now)
+        filtered = []
+        for name, url in results:
+            expires_at = links.get(url)
+            if expires_at is not None and expires_at > now:
+                logger.debug("Пропуск отправки ссылки '%s' для чата %s, так "
+                             "как она отправлялась недавно.", url, chat_id)
+                continue
+            filtered.append((name, url))
+            links[url] = now + self.ttl
+            links.move_to_end(url)
+        while len(links) > self.max_links_per_chat:
+            links.popitem(last=False)
+        return filtered
+
+    def sweep(self) -> int:
+        """
+        Удаляет просроченные ссылки и опустевшие чаты.
+        :return: Количество удалённых ссылок
+        """
+        now = self.clock()
+        removed = 0
+        for chat_id in list(self._chats):
+            removed += _drop_expired(self._chats[chat_id], now)
+            if not self._chats[chat_id]:
+                del self._chats[chat_id]
+        return removed
+
+    async def run_sweeper(self, interval: float) -> None:
+        """
+        Периодически очищает просроченные записи. Работает до отмены задачи.
+        :param interval: Интервал очистки в секундах
+        """
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug("Из кэша недавних ссылок удалено %s записей.",
+                             removed)
+
+    def _get_chat(self, chat_id: int, now: float) -> OrderedDict:
+        """
+        Возвращает ссылки чата без просроченных записей,
+        вытесняя самые давно активные чаты при превышении лимита.
+        """
+        links = self._chats.get(chat_id)
+        if links is None:
+            links = self._chats[chat_id] = OrderedDict()
+            while len(self._chats) > self.max_chats:
+                self._chats.popitem(last=False)
+        else:
+            self._chats.move_to_end(chat_id)
+            _drop_expired(links, now)
+        return links
+
+
+def _drop_expired(links: OrderedDict, now: float) -> int:
+    """
+    Снимает просроченные ссылки с начала очереди.
+    :return: Количество удалённых ссылок
+    """
+    removed = 0
+    while links:
+        url, expires_at = next(iter(links.items()))
+        if expires_at > now:
+            break
+        del links[url]
+        removed += 1
+    return removed
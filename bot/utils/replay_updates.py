@@ -0,0 +1,269 @@
+import argparse
+import asyncio
+import cProfile
+import itertools
+import pstats
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Union, get_args, get_origin
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.types import Chat, Message, Update, User
+from bot.utils import (announce_jobs, chat_registry, gpt_client,
+                       search_cache, state_backend, storage)
+from bot.utils.handlers import register_handlers
+from bot.utils.log_config import setup_logging
+from bot.utils.slow_updates import CAPTURE_FILE, CaptureFile
+from bot.utils.state_backend import MemoryBackend
+from bot.utils.ttl_cache import TTLCache
+
+# Воспроизведение сохранённых медленных обновлений без доступа
+# к Telegram:
+#   python -m bot.utils.replay_updates --repeat 5 --profile
+
+# Токен-заглушка: ID бота берётся из части до двоеточия
+REPLAY_TOKEN = "42:replay"
+# Ответ заглушки OpenAI
+REPLAY_ANSWER = "Ответ воспроизведения."
+
+
+class ReplaySession(BaseSession):
+    """
+    Сессия бота, которая не обращается к Telegram: каждый вызов
+    Bot API считается успешным и возвращает правдоподобный результат.
+    """
+
+    def __init__(self, api_latency: float = 0.0):
+        """
+        :param api_latency: Искусственная задержка каждого вызова, сек
+        """
+        super().__init__()
+        self.api_latency = api_latency
+        self.calls = Counter()  # {метод Bot API: количество вызовов}
+        self._message_ids = itertools.count(1)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls[method.__api_method__] += 1
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+        return self.fake_result(bot, method)
+
+    def fake_result(self, bot, method):
+        """
+        Формирует результат вызова по типу, который возвращает метод.
+        """
+        returning = method.__returning__
+        options = (get_args(returning) if get_origin(returning) is Union
+                   else (returning,))
+        if Message in options:
+            return self._fake_message(bot, method)
+        if User in options:
+            return User(id=bot.id, is_bot=True, first_name="Replay")
+        if get_origin(returning) is list:
+            return []
+        return True
+
+    def _fake_message(self, bot, method) -> Message:
+        chat_id = getattr(method, "chat_id", None)
+        return Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(),
+            chat=Chat(id=chat_id if isinstance(chat_id, int) else 0,
+                      type="private"),
+            text=getattr(method, "text", None)
+        ).as_(bot)
+
+    async def stream_content(self, url, headers=None, timeout=30,
+                             chunk_size=65536, raise_for_status=True):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+class ReplayOpenAI:
+    """
+    Заглушка клиента OpenAI: отвечает REPLAY_ANSWER без обращения к сети,
+    обычным ответом или потоком из одного фрагмента.
+    """
+
+    def __init__(self):
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, messages, stream=False, **params):
+        if stream:
+            return self._stream()
+        message = SimpleNamespace(content=REPLAY_ANSWER)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _stream(self):
+        delta = SimpleNamespace(content=REPLAY_ANSWER)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@contextmanager
+def isolated_state(data_dir: Path):
+    """
+    Подменяет на время воспроизведения данные бота: база, реестр чатов,
+    задания рассылок и кэш /search — во временном каталоге (база —
+    копия рабочей), общее состояние — в памяти, OpenAI — заглушка.
+    Рабочие файлы и Redis не изменяются.
+    :param data_dir: Временный каталог
+    """
+    db_file = data_dir / "bot.db"
+    if storage.DB_FILE.exists():
+        _copy_database(storage.DB_FILE, db_file)
+    replacements = [
+        (storage, "DATA_DIR", data_dir), (storage, "DB_FILE", db_file),
+        (storage, "_storage", None), (chat_registry, "_registry", None),
+        (announce_jobs, "JOBS_DIR", data_dir / "announce_jobs"),
+        (search_cache, "DATA_DIR", data_dir),
+        (search_cache, "CACHE_FILE", data_dir / "search_cache.json"),
+        (search_cache, "_cache", TTLCache(search_cache._cache.maxsize,
+                                          search_cache._cache.ttl,
+                                          search_cache._cache.clock)),
+        (search_cache, "_loaded", True),
+        (state_backend, "_backend", MemoryBackend()),
+        (gpt_client, "_client", ReplayOpenAI()),
+    ]
+    saved = [(module, name, getattr(module, name))
+             for module, name, _ in replacements]
+    for module, name, value in replacements:
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        if chat_registry._registry is not None:
+            chat_registry._registry.flush()
+        if search_cache._dirty:
+            search_cache.save_cache()
+        if storage._storage is not None:
+            storage._storage.close()
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+
+def _copy_database(source: Path, target: Path) -> None:
+    """
+    Копирует базу SQLite (в том числе открытую ботом в режиме WAL).
+    """
+    with sqlite3.connect(f"file:{source}?mode=ro", uri=True) as src, \
+            sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+async def replay(entries: list, repeat: int = 1,
+                 api_latency: float = 0.0) -> list:
+    """
+    Прогоняет сохранённые обновления через настоящий Dispatcher
+    со всеми обработчиками register_handlers, не изменяя рабочие
+    данные бота (см. isolated_state). Фоновые задачи startup
+    (рассылки, расписания) не запускаются.
+    :param entries: Записи файла медленных обновлений
+    :param repeat: Сколько раз воспроизвести каждое обновление
+    :param api_latency: Искусственная задержка вызовов Bot API, сек
+    :return: Список кортежей (запись, лучшее время, вызовы Bot API, ошибка)
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        with isolated_state(Path(data_dir)):
+            return await _replay(entries, repeat, api_latency)
+
+
+async def _replay(entries: list, repeat: int, api_latency: float) -> list:
+    session = ReplaySession(api_latency)
+    bot = Bot(REPLAY_TOKEN, session=session)
+    dp = Dispatcher()
+    register_handlers(dp)
+    results = []
+    for entry in entries:
+        session.calls.clear()
+        best, error = None, None
+        for _ in range(repeat):
+            update = Update.model_validate(entry["update"],
+                                           context={"bot": bot})
+            start = time.perf_counter()
+            try:
+                await dp.feed_update(bot, update)
+            except Exception as e:
+                error = repr(e)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append((entry, best, dict(session.calls), error))
+    return results
+
+
+def format_result(number: int, entry: dict, best: float, calls: dict,
+                  error: str = None) -> str:
+    """
+    Формирует строку отчёта по одному обновлению.
+    """
+    stages = ", ".join(f"{stage['name']} {stage['seconds']:.3f}"
+                       for stage in entry.get("stages", []))
+    api = ", ".join(f"{name}×{count}" for name, count in calls.items())
+    line = (f"#{number} update {entry['update'].get('update_id')} "
+            f"({entry.get('update_type')}): "
+            f"при захвате {entry['total']:.3f} сек "
+            f"[{stages or 'без этапов'}], "
+            f"воспроизведение {best:.3f} сек, Bot API: {api or 'нет'}")
+    if error:
+        line += f"\n    Ошибка: {error}"
+    return line
+
+
+def select_entries(entries: list, numbers: list = None) -> list:
+    """
+    Выбирает записи по номерам (с 1) или возвращает все.
+    """
+    if not numbers:
+        return entries
+    return [entries[number - 1] for number in numbers
+            if 0 < number <= len(entries)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Воспроизводит сохранённые медленные обновления "
+                    "через Dispatcher бота без обращения к Telegram.")
+    parser.add_argument("file", nargs="?", default=str(CAPTURE_FILE),
+                        help="Файл медленных обновлений (JSON Lines)")
+    parser.add_argument("-n", "--number", type=int, action="append",
+                        help="Номер записи (с 1); можно указать несколько")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Сколько раз воспроизвести каждое обновление")
+    parser.add_argument("--api-latency", type=float, default=0.0,
+                        help="Задержка каждого вызова Bot API, сек")
+    parser.add_argument("--profile", action="store_true",
+                        help="Профилировать воспроизведение (cProfile)")
+    parser.add_argument("--top", type=int, default=25,
+                        help="Строк в отчёте профилировщика")
+    args = parser.parse_args()
+
+    setup_logging()
+    entries = select_entries(CaptureFile(Path(args.file), 0).read(),
+                             args.number)
+    if not entries:
+        print("Нет обновлений для воспроизведения.")
+        return
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    results = asyncio.run(replay(entries, args.repeat, args.api_latency))
+    if profiler:
+        profiler.disable()
+
+    for number, result in enumerate(results, start=1):
+        print(format_result(number, *result))
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import asyncio
+from collections import defaultdict
+from urllib.parse import urlparse
+
+
+class RespError(Exception):
+    """
+    Ошибка, возвращённая сервером Redis.
+    """
+
+
+# Команды, которые можно безопасно повторить после обрыва соединения:
+# повторное выполнение не меняет результат
+_IDEMPOTENT_COMMANDS = {"GET", "DEL", "EXISTS", "TTL", "PTTL", "PING"}
+
+
+class RespProtocolError(RespError):
+    """
+    Ответ сервера не удалось разобрать; соединение непригодно.
+    """
+
+
+class RespClient:
+    """
+    Минимальный асинхронный клиент протокола Redis (RESP2).
+    Использует одно соединение; команды выполняются по очереди.
+    Если команда прервана (обрыв, отмена, повреждённый ответ),
+    соединение закрывается: в нём мог остаться непрочитанный ответ.
+    Повторно после обрыва выполняются только идемпотентные команды.
+    """
+
+    def __init__(self, url: str):
+        """
+        :param url: Адрес вида redis://[:пароль@]хост[:порт][/номер базы]
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args):
+        """
+        Выполняет команду и возвращает ответ сервера.
+        :param args: Команда и её аргументы
+        :raises RespError: Если сервер вернул ошибку
+        """
+        async with self._lock:
+            try:
+                return await self._execute_once(args)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not is_idempotent(args):
+                    raise
+                return await self._execute_once(args)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+    async def _execute_once(self, args):
+        """
+        Выполняет команду; при любом сбое, кроме ошибки от сервера,
+        соединение сбрасывается.
+        """
+        try:
+            return await self._execute(args)
+        except BaseException as e:
+            if type(e) is not RespError:
+                self._drop()
+            raise
+
+    async def _execute(self, args):
+        if self._writer is None:
+            await self._connect()
+        self._writer.write(encode_command(args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+    async def _connect(self) -> None:
+        """
+        Открывает соединение и выполняет AUTH и SELECT. Если сервер
+        отклонил любую из команд, соединение закрывается: иначе
+        следующие команды ушли бы в неавторизованное соединение
+        или в чужую базу.
+        """
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port)
+        try:
+            if self.password:
+                self._writer.write(encode_command(("AUTH", self.password)))
+                await read_reply(self._reader)
+            if self.db:
+                self._writer.write(encode_command(("SELECT", self.db)))
+                await read_reply(self._reader)
+        except BaseException:
+            self._drop()
+            raise
+
+    async def _disconnect(self) -> None:
+        writer = self._writer
+        self._drop()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _drop(self) -> None:
+        """
+        Закрывает соединение без ожидания: подходит и при отмене задачи.
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def is_idempotent(args) -> bool:
+    """
+    Проверяет, что команду можно повторить: SET без NX/XX/GET
+    и команды из _IDEMPOTENT_COMMANDS.
+    """
+    command = str(args[0]).upper()
+    if command == "SET":
+        options = {str(arg).upper() for arg in args[3:]}
+        return not options & {"NX", "XX", "GET"}
+    return command in _IDEMPOTENT_COMMANDS
+
+
+def encode_command(args) -> bytes:
+    """
+    Кодирует команду в массив bulk-строк RESP.
+    """
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """
+    Читает один ответ RESP. Bulk-строки возвращаются как str.
+    :raises RespError: Если сервер вернул ошибку
+    """
+    line = (await reader.readuntil(b"\r\n"))[:-2]
+    kind, payload = line[:1], line[1:].decode()
+    if kind == b"-":
+        raise RespError(payload)
+    if kind == b"$" and payload != "-1":
+        data = await reader.readexactly(int(payload) + 2)
+        return data[:-2].decode()
+    if kind == b"*" and payload != "-1":
+        return await _read_array(reader, int(payload))
+    if kind in (b"$", b"*"):
+        return None
+    return _SIMPLE_REPLIES[kind](payload)
+
+
+async def _read_array(reader: asyncio.StreamReader, length: int) -> list:
+    """
+    Читает массив целиком, даже если в нём есть ошибки,
+    чтобы в соединении не осталось непрочитанных элементов.
+    :raises RespError: Первая ошибка из элементов массива
+    """
+    items, error = [], None
+    for _ in range(length):
+        try:
+            items.append(await read_reply(reader))
+        except RespError as e:
+            error = error or e
+    if error is not None:
+        raise error
+    return items
+
+
+def _unknown_reply(payload):
+    raise RespProtocolError(f"Неизвестный тип ответа: {payload!r}")
+
+
+# Однострочные ответы: строка состояния и целое число
+_SIMPLE_REPLIES = defaultdict(lambda: _unknown_reply,
+                              {b"+": str, b":": int})
@@ -3,6 +3,17 @@ from aiogram import Bot, Dispatcher
 from bot.config.tokens import API_TOKEN
 from bot.utils.handlers import register_handlers
 from bot.modules.commands_list import set_bot_commands
+from bot.commands.announce import resume_announce_jobs
+from bot.utils.chat_registry import flush_registry
+from bot.utils.search_cache import flush_cache
+from bot.utils.webhook import run_webhook
+from bot.utils.fsm_storage import create_fsm_storage
+from bot.utils.state_backend import close_backend
+from bot.utils.log_config import setup_logging
+from bot.utils.slow_updates import register_slow_update_capture
+from bot.config.settings import BOT_MODE
+
+logger = logging.getLogger(__name__)
 
 
 async def run_bot():
@@ -10,17 +21,27 @@ async def run_bot():
     Главная функция для запуска бота.
     """
     # Настройка логирования
-    logging.basicConfig(level=logging.DEBUG)
+    setup_logging()
 
     # Инициализация бота и диспетчера
     bot = Bot(token=API_TOKEN)
-    dp = Dispatcher()
+    dp = Dispatcher(storage=create_fsm_storage())
 
     # Регистрация обработчиков
     register_handlers(dp)
+    register_slow_update_capture(dp)
+    dp.shutdown.register(flush_registry)
+    dp.shutdown.register(flush_cache)
+    dp.shutdown.register(close_backend)
 
     # Запуск бота
-    logging.info("Запуск бота...")
-    await bot.delete_webhook(drop_pending_updates=True)
+    logger.info(f"Запуск бота в режиме {BOT_MODE}...")
     await set_bot_commands(bot)
+    await resume_announce_jobs(bot)
+    if BOT_MODE == "webhook":
+        await run_webhook(dp, bot)
+        return
+
+    # Накопившиеся за время перезапуска обновления не сбрасываются
+    await bot.delete_webhook(drop_pending_updates=False)
     await dp.start_polling(bot)
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from datetime import datetime, time, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+
+def seconds_until(at: time, now: datetime = None) -> float:
+    """
+    Возвращает количество секунд до ближайшего наступления времени at (UTC).
+    """
+    now = now or datetime.now(timezone.utc)
+    target = datetime.combine(now.date(), at, tzinfo=timezone.utc)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def is_past_today(at: time, now: datetime = None) -> bool:
+    """
+    Проверяет, наступило ли сегодня время at (UTC).
+    """
+    now = now or datetime.now(timezone.utc)
+    return now.time() >= at
+
+
+async def run_daily(at: time, job, *args, run_if_missed: bool = False):
+    """
+    Выполняет задачу каждый день в указанное время (UTC).
+    Ошибка задачи записывается в лог и не останавливает расписание.
+    Работает до отмены задачи.
+    :param at: Время запуска (UTC)
+    :param job: Асинхронная функция задачи
+    :param run_if_missed: Выполнить сразу, если сегодняшнее время уже прошло
+    """
+    if run_if_missed and is_past_today(at):
+        await _run_job(job, *args)
+    while True:
+        await asyncio.sleep(seconds_until(at))
+        await _run_job(job, *args)
+
+
+async def cancel_tasks(tasks) -> None:
+    """
+    Отменяет фоновые задачи и дожидается их завершения
+    (при остановке бота).
+    :param tasks: Задачи; None и завершённые пропускаются
+    """
+    tasks = [task for task in tasks if task is not None and not task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _run_job(job, *args) -> None:
+    try:
+        await job(*args)
+    except Exception as e:
+        logger.error(f"Ошибка при выполнении задачи по расписанию "
+                     f"{job.__name__}: {e}")
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from bot.config.gpt_prompt import PROMPT
+from bot.config.flags import SEARCH_CACHE_PERSIST_ENABLE
+from bot.config.settings import (SEARCH_CACHE_MAX_SIZE,
+                                 SEARCH_CACHE_TTL_SECONDS,
+                                 SEARCH_CACHE_FLUSH_DELAY_SECONDS)
+from bot.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Путь к файлу кэша
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+CACHE_FILE = DATA_DIR / "search_cache.json"
+
+# Время истечения хранится в unix-времени, чтобы пережить перезапуск
+_cache = TTLCache(SEARCH_CACHE_MAX_SIZE, SEARCH_CACHE_TTL_SECONDS,
+                  clock=time.time)
+# Кэш читается из файла при первом обращении, а не при импорте
+_loaded = False
+# Есть ответы, ещё не записанные в файл
+_dirty = False
+_flush_task = None
+_save_lock = asyncio.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Приводит запрос к каноническому виду: нижний регистр,
+    одиночные пробелы, без завершающих знаков препинания.
+    """
+    query = re.sub(r"\s+", " ", query.strip().lower())
+    return query.rstrip("?!. ")
+
+
+def make_key(query: str, params: dict) -> str:
+    """
+    Строит ключ кэша из запроса, системного промпта и параметров модели.
+    :param query: Текст запроса пользователя
+    :param params: Параметры модели
+    :return: Хэш ключа
+    """
+    raw = json.dumps([normalize_query(query), PROMPT, params],
+                     sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_answer(query: str, params: dict):
+    """
+    Возвращает закэшированный ответ или None.
+    """
+    answer = _get_cache().get(make_key(query, params))
+    if answer is not None:
+        logger.debug("Ответ на запрос найден в кэше (попаданий: %s, "
+                     "промахов: %s)", _cache.hits, _cache.misses)
+    return answer
+
+
+def save_answer(query: str, params: dict, answer: str) -> None:
+    """
+    Сохраняет ответ в кэш и, если включено, планирует запись на диск:
+    ответы, полученные за SEARCH_CACHE_FLUSH_DELAY_SECONDS, записываются
+    одним разом в отдельном потоке.
+    """
+    _get_cache().set(make_key(query, params), answer)
+    if SEARCH_CACHE_PERSIST_ENABLE:
+        _schedule_save()
+
+
+def cache_stats() -> dict:
+    """
+    Возвращает счётчики кэша.
+    """
+    cache = _get_cache()
+    return {"size": len(cache), "hits": cache.hits, "misses": cache.misses}
+
+
+def _get_cache() -> TTLCache:
+    """
+    Возвращает кэш, при первом обращении загружая его из файла.
+    """
+    global _loaded
+    if not _loaded:
+        _loaded = True
+        if SEARCH_CACHE_PERSIST_ENABLE:
+            load_cache()
+    return _cache
+
+
+def _schedule_save() -> None:
+    """
+    Запускает отложенную запись, если она ещё не запланирована.
+    Вне цикла событий кэш записывается сразу.
+    """
+    global _dirty, _flush_task
+    _dirty = True
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        save_cache()
+        return
+    if _flush_task is None or _flush_task.done():
+        _flush_task = loop.create_task(_delayed_save())
+
+
+async def _delayed_save() -> None:
+    await asyncio.sleep(SEARCH_CACHE_FLUSH_DELAY_SECONDS)
+    await flush_cache()
+
+
+async def flush_cache() -> None:
+    """
+    Записывает несохранённые ответы в файл, не блокируя цикл событий
+    (в том числе при остановке бота).
+    """
+    global _dirty
+    async with _save_lock:
+        if not _dirty:
+            return
+        _dirty = False
+        await asyncio.to_thread(_write_entries, _snapshot())
+
+
+def save_cache() -> None:
+    """
+    Сразу сохраняет непросроченные записи кэша в файл.
+    """
+    global _dirty
+    _dirty = False
+    _write_entries(_snapshot())
+
+
+def _snapshot() -> list:
+    return [[key, value, expires_at] for key, value, expires_at
+            in _cache.items()]
+
+
+def _write_entries(entries: list) -> None:
+    """
+    Атомарно записывает записи кэша в файл.
+    """
+    DATA_DIR.mkdir(exist_ok=True)
+    tmp_file = CACHE_FILE.with_suffix(".tmp")
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump(entries, file, ensure_ascii=False)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError as e:
+        logger.error(f"Не удалось сохранить кэш /search: {e}")
+
+
+def load_cache() -> None:
+    """
+    Загружает кэш из файла, пропуская просроченные
+    и повреждённые записи.
+    """
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as file:
+            entries = json.load(file)
+    except FileNotFoundError:
+        return
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Ошибка чтения файла {CACHE_FILE}: {e}")
+        return
+
+    if not isinstance(entries, list):
+        logger.warning(f"Файл {CACHE_FILE} не содержит список записей.")
+        return
+    skipped = _load_entries(entries, time.time())
+    if skipped:
+        logger.warning(f"В файле {CACHE_FILE} пропущено "
+                       f"повреждённых записей: {skipped}.")
+    logger.debug("Кэш /search загружен: %s записей.", len(_cache))
+
+
+def _load_entries(entries: list, now: float) -> int:
+    """
+    Добавляет в кэш действующие записи вида [ключ, ответ, истечение].
+    :return: Количество пропущенных повреждённых записей
+    """
+    skipped = 0
+    for entry in entries:
+        try:
+            key, value, expires_at = entry
+            expires_at = float(expires_at)
+            if expires_at > now:
+                _cache.set(key, value, expires_at=expires_at)
+        except (TypeError, ValueError):
+            skipped += 1
+    return skipped
@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from aiogram import BaseMiddleware, Dispatcher
+from bot.config.flags import SLOW_UPDATE_CAPTURE_ENABLE
+from bot.config.settings import (SLOW_UPDATE_THRESHOLD_SECONDS,
+                                 SLOW_UPDATES_FILE,
+                                 SLOW_UPDATES_KEEP)
+from bot.utils.monitoring import collect_stages
+
+logger = logging.getLogger(__name__)
+
+# Путь к файлу с медленными обновлениями (относительно каталога bot)
+BASE_DIR = Path(__file__).resolve().parent.parent
+CAPTURE_FILE = BASE_DIR / SLOW_UPDATES_FILE
+
+
+class CaptureFile:
+    """
+    Файл JSON Lines с ограниченным числом записей.
+    Новые записи дописываются в конец; когда их становится вдвое
+    больше keep, файл переписывается с keep последними.
+    """
+
+    def __init__(self, path: Path, keep: int):
+        """
+        :param path: Путь к файлу
+        :param keep: Сколько последних записей хранить
+        """
+        self.path = path
+        self.keep = keep
+        self._count = None
+
+    def append(self, entry: dict) -> None:
+        if self._count is None:
+            self._count = len(self.read())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._count += 1
+        if self._count >= 2 * self.keep:
+            self._trim()
+
+    def read(self) -> list:
+        """
+        Возвращает записи файла; повреждённые строки пропускаются.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Пропущена повреждённая запись в "
+                               f"{self.path}.")
+        return entries
+
+    def _trim(self) -> None:
+        entries = self.read()[-self.keep:]
+        tmp_file = self.path.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            for entry in entries:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_file, self.path)
+        self._count = len(entries)
+
+
+class SlowUpdateMiddleware(BaseMiddleware):
+    """
+    Внешний middleware обновлений: измеряет полное время обработки
+    и сохраняет обновление вместе с этапами, если оно обрабатывалось
+    дольше порога. Время этапов записывают middleware метрик
+    (bot.utils.monitoring).
+    """
+
+    def __init__(self, capture: CaptureFile, threshold: float):
+        """
+        :param capture: Файл для медленных обновлений
+        :param threshold: Порог в секундах
+        """
+        self.capture = capture
+        self.threshold = threshold
+
+    async def __call__(self, handler, event, data):
+        with collect_stages() as stages:
+            start = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                total = time.perf_counter() - start
+                if total >= self.threshold:
+                    self.save(event, total, stages)
+
+    def save(self, update, total: float, stages: list) -> None:
+        logger.warning(f"Медленное обновление {update.update_id} "
+                       f"({update.event_type}): {total:.3f} сек.")
+        try:
+            self.capture.append({
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "update_type": update.event_type,
+                "total": round(total, 6),
+                "stages": [{"stage": stage, "name": name,
+                            "seconds": round(seconds, 6)}
+                           for stage, name, seconds in stages],
+                "update": update.model_dump(mode="json", exclude_none=True),
+            })
+        except OSError as e:
+            logger.error(f"Не удалось сохранить медленное обновление: {e}")
+
+
+def register_slow_update_capture(dp: Dispatcher):
+    """
+    Включает сохранение медленных обновлений для всех обработчиков
+    диспетчера (порог и размер файла — в настройках SLOW_UPDATE_*).
+    :param dp: Экземпляр Dispatcher
+    """
+    if not SLOW_UPDATE_CAPTURE_ENABLE:
+        return
+    capture = CaptureFile(CAPTURE_FILE, SLOW_UPDATES_KEEP)
+    dp.update.outer_middleware(
+        SlowUpdateMiddleware(capture, SLOW_UPDATE_THRESHOLD_SECONDS))
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import time
+import uuid
+from typing import Optional
+from bot.config.settings import (STATE_BACKEND,
+                                 REDIS_URL,
+                                 STATE_KEY_PREFIX,
+                                 LOCK_TTL_SECONDS,
+                                 LOCK_TIMEOUT_SECONDS)
+from bot.utils.resp_client import RespClient
+
+logger = logging.getLogger(__name__)
+
+# Удаляет ключ, только если он всё ещё принадлежит владельцу блокировки
+RELEASE_LOCK_SCRIPT = ("if redis.call('get', KEYS[1]) == ARGV[1] then "
+                       "return redis.call('del', KEYS[1]) "
+                       "else return 0 end")
+
+# Интервалы повторных попыток захвата блокировки, сек
+LOCK_RETRY_MIN = 0.05
+LOCK_RETRY_MAX = 0.5
+
+
+class LockTimeout(TimeoutError):
+    """
+    Не удалось захватить блокировку за отведённое время.
+    """
+
+
+class StateBackend(ABC):
+    """
+    Хранилище общего состояния бота: короткоживущие ключи,
+    счётчики и блокировки. Реализации с shared = True видны
+    всем запущенным копиям бота.
+    """
+
+    shared = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Возвращает значение или None, если ключа нет.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float = None,
+                  only_if_missing: bool = False) -> bool:
+        """
+        Сохраняет значение.
+        :param ttl: Время жизни в секундах (None — без ограничения)
+        :param only_if_missing: Не перезаписывать существующий ключ
+        :return: True, если значение записано
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Удаляет ключ.
+        """
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """
+        Увеличивает счётчик на 1 и возвращает новое значение.
+        """
+
+    @abstractmethod
+    async def release_lock(self, name: str, token: str) -> None:
+        """
+        Снимает блокировку, если она ещё принадлежит владельцу token.
+        """
+
+    async def close(self) -> None:
+        pass
+
+    def lock(self, name: str, ttl: float = LOCK_TTL_SECONDS,
+             timeout: float = LOCK_TIMEOUT_SECONDS):
+        """
+        Возвращает блокировку для использования в async with.
+        :param name: Имя блокировки
+        :param ttl: Время, после которого блокировка снимается сама
+                    (если владелец завершился, не сняв её)
+        :param timeout: Максимальное время ожидания захвата
+        """
+        return BackendLock(self, name, ttl, timeout)
+
+
+class BackendLock:
+    """
+    Блокировка на ключе хранилища: захват — запись ключа с уникальным
+    токеном, если ключа нет; освобождение — удаление ключа владельцем.
+    """
+
+    def __init__(self, backend: StateBackend, name: str,
+                 ttl: float, timeout: float):
+        self.backend = backend
+        self.key = f"lock:{name}"
+        self.ttl = ttl
+        self.timeout = timeout
+        self.token = None
+
+    async def __aenter__(self):
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.timeout
+        delay = LOCK_RETRY_MIN
+        while not await self.backend.set(self.key, token, ttl=self.ttl,
+                                         only_if_missing=True):
+            if time.monotonic() + delay > deadline:
+                raise LockTimeout(f"Блокировка {self.key} занята.")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LOCK_RETRY_MAX)
+        self.token = token
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.backend.release_lock(self.key, self.token)
+        self.token = None
+
+
+class MemoryBackend(StateBackend):
+    """
+    Состояние в памяти процесса (одна копия бота).
+    Блокировки — обычные asyncio.Lock без ожидания по таймеру.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._data = {}  # {ключ: (значение, время истечения или None)}
+        self._locks = {}
+
+    async def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key, value, ttl=None, only_if_missing=False):
+        if only_if_missing and await self.get(key) is not None:
+            return False
+        expires_at = None if ttl is None else self.clock() + ttl
+        self._data[key] = (str(value), expires_at)
+        return True
+
+    async def delete(self, key):
+        self._data.pop(key, None)
+
+    async def incr(self, key):
+        value = int(await self.get(key) or 0) + 1
+        self._data[key] = (str(value), None)
+        return value
+
+    async def release_lock(self, name, token):
+        if await self.get(name) == token:
+            await self.delete(name)
+
+    def lock(self, name, ttl=LOCK_TTL_SECONDS, timeout=LOCK_TIMEOUT_SECONDS):
+        return self._locks.setdefault(name, asyncio.Lock())
+
+
+class RedisBackend(StateBackend):
+    """
+    Состояние в Redis (или совместимом сервере), общее для всех
+    копий бота. Ключи получают общий префикс.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = STATE_KEY_PREFIX):
+        """
+        :param url: Адрес сервера redis://...
+        :param prefix: Префикс всех ключей бота
+        """
+        self.client = RespClient(url)
+        self.prefix = prefix
+
+    async def get(self, key):
+        return await self.client.execute("GET", self.prefix + key)
+
+    async def set(self, key, value, ttl=None, only_if_missing=False):
+        args = ["SET", self.prefix + key, value]
+        if ttl is not None:
+            args += ["PX", max(1, int(ttl * 1000))]
+        if only_if_missing:
+            args.append("NX")
+        return await self.client.execute(*args) == "OK"
+
+    async def delete(self, key):
+        await self.client.execute("DEL", self.prefix + key)
+
+    async def incr(self, key):
+        return await self.client.execute("INCR", self.prefix + key)
+
+    async def release_lock(self, name, token):
+        await self.client.execute("EVAL", RELEASE_LOCK_SCRIPT, 1,
+                                  self.prefix + name, token)
+
+    async def close(self):
+        await self.client.close()
+
+
+_backend = None
+
+
+def get_backend() -> StateBackend:
+    """
+    Возвращает общее хранилище состояния, выбранное в STATE_BACKEND.
+    """
+    global _backend
+    if _backend is None:
+        if STATE_BACKEND == "redis":
+            _backend = RedisBackend(REDIS_URL)
+        else:
+            _backend = MemoryBackend()
+        logger.info(f"Хранилище состояния: {STATE_BACKEND}.")
+    return _backend
+
+
+async def close_backend() -> None:
+    """
+    Закрывает соединение с хранилищем состояния (при остановке бота).
+    """
+    if _backend is not None:
+        await _backend.close()
@@ -0,0 +1,481 @@
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from bot.config.settings import SQLITE_JOURNAL_MODE
+
+logger = logging.getLogger(__name__)
+
+# Путь к базе данных и к JSON-файлам прежнего формата
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+DB_FILE = DATA_DIR / "bot.db"
+CHAT_LIST_FILE = DATA_DIR / "chat_list.json"
+STATS_FILE = DATA_DIR / "best_qa_stats.json"
+LAST_WINNER_FILE = DATA_DIR / "last_winner.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    added_by TEXT,
+    added_at TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    deleted_by TEXT,
+    deleted_at TEXT
+);
+CREATE TABLE IF NOT EXISTS best_qa_chats (
+    chat_id INTEGER PRIMARY KEY,
+    chat_title TEXT
+);
+CREATE TABLE IF NOT EXISTS best_qa_stats (
+    chat_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    full_name TEXT,
+    username TEXT,
+    wins INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (chat_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS best_qa_stats_user ON best_qa_stats (user_id);
+CREATE INDEX IF NOT EXISTS best_qa_stats_rating
+    ON best_qa_stats (chat_id, wins DESC, user_id);
+CREATE TABLE IF NOT EXISTS best_qa_global (
+    user_id INTEGER PRIMARY KEY,
+    full_name TEXT,
+    username TEXT,
+    wins INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS best_qa_global_rating
+    ON best_qa_global (wins DESC, user_id);
+CREATE TABLE IF NOT EXISTS best_qa_wins (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    won_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS best_qa_wins_time ON best_qa_wins (won_at);
+CREATE TABLE IF NOT EXISTS best_qa_period_stats (
+    chat_id INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    full_name TEXT,
+    username TEXT,
+    wins INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (chat_id, period, bucket, user_id)
+);
+CREATE INDEX IF NOT EXISTS best_qa_period_rating
+    ON best_qa_period_stats (chat_id, period, bucket, wins DESC, user_id);
+CREATE TABLE IF NOT EXISTS best_qa_auto_chats (
+    chat_id INTEGER PRIMARY KEY,
+    chat_title TEXT,
+    enabled_by TEXT,
+    enabled_at TEXT
+);
+CREATE TABLE IF NOT EXISTS last_winners (
+    chat_id INTEGER PRIMARY KEY,
+    chat_title TEXT,
+    last_datetime TEXT,
+    user_id INTEGER,
+    full_name TEXT,
+    username TEXT
+);
+"""
+
+CHAT_FIELDS = ("id", "title", "added_by", "added_at",
+               "deleted", "deleted_by", "deleted_at")
+
+# Рейтинг по всем чатам хранится в агрегатах под этим ID
+GLOBAL_CHAT_ID = 0
+
+# Периоды рейтинга /best_qa
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+ALL_TIME = "all"
+
+# Сколько дней хранить агрегаты за прошедшие периоды и журнал побед
+PERIOD_RETENTION_DAYS = {DAY: 31, WEEK: 12 * 7, MONTH: 366}
+WIN_LOG_RETENTION_DAYS = 2 * 366
+
+
+class Storage:
+    """
+    Хранилище данных бота в локальной базе SQLite:
+    список чатов, статистика и последние победители /best_qa.
+    """
+
+    def __init__(self, path, journal_mode: str = SQLITE_JOURNAL_MODE):
+        """
+        :param path: Путь к файлу базы данных
+        :param journal_mode: Режим журнала SQLite (WAL, DELETE и т. п.)
+        """
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.conn.executescript(SCHEMA)
+        if self._global_leaderboard_missing():
+            self.rebuild_global_leaderboard()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # Чаты
+
+    def get_chats(self) -> list:
+        """
+        Возвращает все чаты в формате словарей chat_list.
+        """
+        rows = self.conn.execute("SELECT * FROM chats ORDER BY id")
+        return [_chat_from_row(row) for row in rows]
+
+    def get_chat(self, chat_id: int):
+        """
+        Возвращает чат по ID или None.
+        """
+        row = self.conn.execute("SELECT * FROM chats WHERE id = ?",
+                                (chat_id,)).fetchone()
+        return _chat_from_row(row) if row else None
+
+    def save_chats(self, chats) -> None:
+        """
+        Добавляет или обновляет чаты одной транзакцией.
+        :param chats: Итерируемый набор словарей чатов
+        """
+        with self.conn:
+            self._insert_chats(chats)
+
+    def _insert_chats(self, chats) -> None:
+        rows = [tuple(chat.get(field) for field in CHAT_FIELDS)
+                for chat in chats]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO chats "
+            "(id, title, added_by, added_at, deleted, deleted_by, "
+            "deleted_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def save_chat(self, chat: dict) -> None:
+        """
+        Добавляет или обновляет чат.
+        """
+        self.save_chats([chat])
+
+    # Статистика /best_qa
+
+    def record_win(self, chat_id, chat_title, user_id,
+                   full_name, username, won_at=None) -> None:
+        """
+        Записывает победу в журнал и увеличивает счётчики побед
+        участника: в чате и во всех чатах, за день, неделю, месяц
+        и за всё время.
+        :param won_at: Время победы (по умолчанию текущее, UTC)
+        """
+        won_at = won_at or datetime.now(timezone.utc)
+        user = (user_id, full_name, username or "")
+        buckets = period_buckets(won_at)
+        with self.conn:
+            self._set_chat_title(chat_id, chat_title)
+            self.conn.execute(
+                "INSERT INTO best_qa_wins (chat_id, user_id, won_at) "
+                "VALUES (?, ?, ?)", (chat_id, user_id, won_at.isoformat()))
+            self.conn.execute(
+                "INSERT INTO best_qa_stats "
+                "(chat_id, user_id, full_name, username, wins) "
+                "VALUES (?, ?, ?, ?, 1) "
+                "ON CONFLICT (chat_id, user_id) DO UPDATE SET "
+                "wins = wins + 1, full_name = excluded.full_name, "
+                "username = excluded.username", (chat_id, *user))
+            self.conn.execute(
+                "INSERT INTO best_qa_global "
+                "(user_id, full_name, username, wins) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (user_id) DO UPDATE SET "
+                "wins = wins + 1, full_name = excluded.full_name, "
+                "username = excluded.username", user)
+            self.conn.executemany(
+                "INSERT INTO best_qa_period_stats "
+                "(chat_id, period, bucket, user_id, full_name, username, "
+                "wins) VALUES (?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT (chat_id, period, bucket, user_id) DO UPDATE "
+                "SET wins = wins + 1, full_name = excluded.full_name, "
+                "username = excluded.username",
+                [(scope, period, bucket, *user)
+                 for scope in (chat_id, GLOBAL_CHAT_ID)
+                 for period, bucket in buckets.items()])
+
+    def get_chat_title(self, chat_id: int):
+        """
+        Возвращает название чата из статистики или None.
+        """
+        row = self.conn.execute(
+            "SELECT chat_title FROM best_qa_chats WHERE chat_id = ?",
+            (chat_id,)).fetchone()
+        return row["chat_title"] if row else None
+
+    def get_leaderboard(self, chat_id: int, limit: int, offset: int = 0,
+                        period: str = ALL_TIME):
+        """
+        Возвращает страницу рейтинга по убыванию побед.
+        Строки читаются по индексу готовых агрегатов,
+        без сортировки и пересчёта журнала побед.
+        :param chat_id: ID чата или GLOBAL_CHAT_ID для всех чатов
+        :param period: Период: day, week, month или all
+        :return: Список словарей (user_id, full_name, username, wins)
+        """
+        source, params = _rating_source(chat_id, period)
+        rows = self.conn.execute(
+            f"SELECT user_id, full_name, username, wins FROM {source} "
+            f"ORDER BY wins DESC, user_id LIMIT ? OFFSET ?",
+            (*params, limit, offset))
+        return [dict(row) for row in rows]
+
+    def count_winners(self, chat_id: int, period: str = ALL_TIME) -> int:
+        """
+        Возвращает количество победителей в рейтинге.
+        :param chat_id: ID чата или GLOBAL_CHAT_ID для всех чатов
+        :param period: Период: day, week, month или all
+        """
+        source, params = _rating_source(chat_id, period)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {source}",
+                                 params).fetchone()[0]
+
+    def compact_history(self, now=None) -> None:
+        """
+        Удаляет из журнала побед записи старше срока хранения
+        и агрегаты за давно прошедшие периоды.
+        Итоги за всё время при этом не меняются.
+        :param now: Текущее время (по умолчанию текущее, UTC)
+        """
+        now = now or datetime.now(timezone.utc)
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM best_qa_wins WHERE won_at < ?",
+                ((now - timedelta(days=WIN_LOG_RETENTION_DAYS)).isoformat(),))
+            for period, days in PERIOD_RETENTION_DAYS.items():
+                oldest = period_buckets(now - timedelta(days=days))[period]
+                self.conn.execute(
+                    "DELETE FROM best_qa_period_stats "
+                    "WHERE period = ? AND bucket < ?", (period, oldest))
+        logger.debug("Журнал побед /best_qa сжат.")
+
+    def rebuild_global_leaderboard(self) -> None:
+        """
+        Пересчитывает общий рейтинг из статистики чатов.
+        """
+        with self.conn:
+            self._fill_global_leaderboard()
+
+    def _fill_global_leaderboard(self) -> None:
+        self.conn.execute("DELETE FROM best_qa_global")
+        self.conn.execute(
+            "INSERT INTO best_qa_global "
+            "(user_id, full_name, username, wins) "
+            "SELECT user_id, MAX(full_name), MAX(username), SUM(wins) "
+            "FROM best_qa_stats GROUP BY user_id")
+
+    def _global_leaderboard_missing(self) -> bool:
+        """
+        Проверяет, что общий рейтинг пуст при непустой статистике
+        (база создана до появления общего рейтинга).
+        """
+        return (self.conn.execute(
+            "SELECT 1 FROM best_qa_global LIMIT 1").fetchone() is None
+            and self.conn.execute(
+                "SELECT 1 FROM best_qa_stats LIMIT 1").fetchone() is not None)
+
+    def set_last_winner(self, chat_id, chat_title, last_datetime,
+                        user_id, full_name, username) -> None:
+        """
+        Сохраняет последнего победителя чата.
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO last_winners "
+                "(chat_id, chat_title, last_datetime, user_id, full_name, "
+                "username) VALUES (?, ?, ?, ?, ?, ?)",
+                (chat_id, chat_title, last_datetime,
+                 user_id, full_name, username or ""))
+
+    def get_last_winner(self, chat_id: int):
+        """
+        Возвращает последнего победителя в формате last_winner.json или None.
+        """
+        row = self.conn.execute(
+            "SELECT * FROM last_winners WHERE chat_id = ?",
+            (chat_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "chat_title": row["chat_title"],
+            "last_datetime": row["last_datetime"],
+            "winner": {
+                "user_id": row["user_id"],
+                "full_name": row["full_name"],
+                "username": row["username"]
+            }
+        }
+
+    def set_auto_draw(self, chat_id, chat_title, enabled: bool,
+                      enabled_by=None) -> None:
+        """
+        Включает или выключает ежедневный автоматический выбор в чате.
+        """
+        with self.conn:
+            if not enabled:
+                self.conn.execute(
+                    "DELETE FROM best_qa_auto_chats WHERE chat_id = ?",
+                    (chat_id,))
+                return
+            self.conn.execute(
+                "INSERT OR REPLACE INTO best_qa_auto_chats "
+                "(chat_id, chat_title, enabled_by, enabled_at) "
+                "VALUES (?, ?, ?, ?)",
+                (chat_id, chat_title, enabled_by,
+                 datetime.now(timezone.utc).isoformat()))
+
+    def get_auto_draw_chats(self) -> list:
+        """
+        Возвращает чаты с включённым автоматическим выбором.
+        :return: Список словарей {'id': <int>, 'title': <str>}
+        """
+        rows = self.conn.execute(
+            "SELECT chat_id, chat_title FROM best_qa_auto_chats "
+            "ORDER BY chat_id")
+        return [{"id": row["chat_id"], "title": row["chat_title"]}
+                for row in rows]
+
+    def _set_chat_title(self, chat_id, chat_title) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO best_qa_chats (chat_id, chat_title) "
+            "VALUES (?, ?)", (chat_id, chat_title))
+
+    # Импорт из JSON
+
+    def import_json_files(self) -> None:
+        """
+        Однократно переносит данные из JSON-файлов прежнего формата
+        одной транзакцией: при ошибке в базе не остаётся частичных данных.
+        Файлы остаются на месте.
+        """
+        chats = _load_json(CHAT_LIST_FILE, [])
+        stats = _load_json(STATS_FILE, {})
+        last_winners = _load_json(LAST_WINNER_FILE, {})
+
+        with self.conn:
+            self._insert_chats(chats)
+            for chat_id, chat_stats in stats.items():
+                self._import_chat_stats(int(chat_id), chat_stats)
+            for chat_id, data in last_winners.items():
+                self._import_last_winner(int(chat_id), data)
+            self._fill_global_leaderboard()
+        logger.info(f"Импортировано из JSON: {len(chats)} чатов, "
+                    f"статистика {len(stats)} чатов, "
+                    f"{len(last_winners)} последних победителей.")
+
+    def _import_chat_stats(self, chat_id, chat_stats) -> None:
+        self._set_chat_title(chat_id, chat_stats.get("chat_title"))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO best_qa_stats "
+            "(chat_id, user_id, full_name, username, wins) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(chat_id, int(user_id), winner["full_name"],
+              winner.get("username", ""), winner["wins"])
+             for user_id, winner in chat_stats.get("winners", {}).items()])
+
+    def _import_last_winner(self, chat_id, data) -> None:
+        winner = data["winner"]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO last_winners "
+            "(chat_id, chat_title, last_datetime, user_id, full_name, "
+            "username) VALUES (?, ?, ?, ?, ?, ?)",
+            (chat_id, data.get("chat_title"), data.get("last_datetime"),
+             winner["user_id"], winner["full_name"],
+             winner.get("username", "")))
+
+
+def period_buckets(moment: datetime) -> dict:
+    """
+    Возвращает ключи периодов (день, ISO-неделя, месяц) для момента времени.
+    """
+    year, week, _ = moment.isocalendar()
+    return {DAY: moment.strftime("%Y-%m-%d"),
+            WEEK: f"{year}-W{week:02d}",
+            MONTH: moment.strftime("%Y-%m")}
+
+
+def _rating_source(chat_id: int, period: str):
+    """
+    Возвращает таблицу с условием выборки рейтинга и его параметры.
+    """
+    if period != ALL_TIME:
+        bucket = period_buckets(datetime.now(timezone.utc))[period]
+        return ("best_qa_period_stats "
+                "WHERE chat_id = ? AND period = ? AND bucket = ?",
+                (chat_id, period, bucket))
+    if chat_id == GLOBAL_CHAT_ID:
+        return "best_qa_global", ()
+    return "best_qa_stats WHERE chat_id = ?", (chat_id,)
+
+
+def _chat_from_row(row) -> dict:
+    """
+    Преобразует строку таблицы chats в словарь формата chat_list.
+    """
+    chat = dict(row)
+    chat["deleted"] = bool(chat["deleted"])
+    return chat
+
+
+def _load_json(file_path, default):
+    """
+    Загружает данные из JSON-файла прежнего формата.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default
+    except json.JSONDecodeError as e:
+        logger.error(f"Ошибка декодирования JSON в {file_path}: {e}")
+        return default
+
+
+_storage = None
+
+
+def get_storage() -> Storage:
+    """
+    Возвращает общее хранилище, открывая базу при первом вызове.
+    Если базы ещё не было, в неё импортируются данные из JSON-файлов.
+    """
+    global _storage
+    if _storage is None:
+        DATA_DIR.mkdir(exist_ok=True)
+        if not DB_FILE.exists():
+            _create_database()
+        _storage = Storage(DB_FILE)
+    return _storage
+
+
+def _create_database() -> None:
+    """
+    Создаёт базу во временном файле, импортирует в неё данные из JSON
+    и переносит на место DB_FILE только после успешного импорта.
+    При ошибке временный файл удаляется, а при следующем запуске
+    импорт выполняется заново.
+    """
+    tmp_file = DB_FILE.with_name(DB_FILE.name + ".tmp")
+    _remove_database(tmp_file)
+    storage = Storage(tmp_file)
+    try:
+        storage.import_json_files()
+    except Exception:
+        storage.close()
+        _remove_database(tmp_file)
+        raise
+    storage.close()
+    tmp_file.replace(DB_FILE)
+
+
+def _remove_database(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import Message
+from bot.config.settings import (MESSAGE_MAX_LENGTH,
+                                 SEARCH_STREAM_EDIT_INTERVAL)
+
+logger = logging.getLogger(__name__)
+
+
+def split_text(text: str, limit: int = MESSAGE_MAX_LENGTH) -> list:
+    """
+    Разбивает текст на части не длиннее limit,
+    по возможности по границе строки или слова.
+    :param text: Исходный текст
+    :param limit: Максимальная длина части
+    :return: Список частей
+    """
+    parts = []
+    while len(text) > limit:
+        head, text = _split_head(text, limit)
+        parts.append(head)
+    if text:
+        parts.append(text)
+    return parts
+
+
+def _split_head(text: str, limit: int):
+    """
+    Отделяет от текста первую часть не длиннее limit.
+    :return: Кортеж (первая часть, остаток)
+    """
+    cut = text.rfind("\n", 0, limit + 1)
+    if cut <= 0:
+        cut = text.rfind(" ", 0, limit + 1)
+    if cut <= 0:
+        cut = limit
+    return text[:cut], text[cut:].lstrip()
+
+
+class StreamingReply:
+    """
+    Ответ, который постепенно дописывается правками одного сообщения.
+    Правки не чаще одной за interval секунд; при превышении лимита
+    длины текст продолжается в новом сообщении.
+    """
+
+    def __init__(self, message: Message,
+                 interval: float = SEARCH_STREAM_EDIT_INTERVAL,
+                 limit: int = MESSAGE_MAX_LENGTH):
+        """
+        :param message: Сообщение бота, которое будет редактироваться
+        :param interval: Минимальный интервал между правками в секундах
+        :param limit: Максимальная длина одного сообщения
+        """
+        self.message = message
+        self.interval = interval
+        self.limit = limit
+        self.text = ""  # Текст текущего сообщения
+        self.shown = message.text or ""  # Текст, уже показанный в чате
+        self.next_edit = 0.0
+        self.full = False  # Текущее сообщение заполнено, нужно новое
+
+    async def append(self, chunk: str) -> None:
+        """
+        Добавляет фрагмент ответа и обновляет сообщение, если пора.
+        """
+        self.text += chunk
+        if time.monotonic() >= self.next_edit:
+            await self.flush()
+
+    async def finish(self) -> None:
+        """
+        Показывает итоговый текст, дождавшись снятия ограничений Telegram.
+        """
+        await self.flush(final=True)
+
+    async def flush(self, final: bool = False) -> None:
+        """
+        Переносит накопленный текст в чат. Новое сообщение начинается,
+        только когда для него есть непустой текст.
+        :param final: Ждать окончания ограничения частоты правок
+        """
+        while True:
+            if self.full and self.text.strip():
+                await self._start_message()
+            if self.full or len(self.text) <= self.limit:
+                break
+            head, self.text = _split_head(self.text, self.limit)
+            await self._edit(head, wait=True)
+            self.full = True
+        if not self.full:
+            await self._edit(self.text, wait=final)
+
+    async def _start_message(self) -> None:
+        """
+        Продолжает ответ в новом сообщении.
+        """
+        self.text = self.text.lstrip()
+        self.shown = self.text[:self.limit]
+        self.message = await self.message.answer(self.shown)
+        self.full = False
+
+    async def _edit(self, text: str, wait: bool) -> None:
+        """
+        Редактирует текущее сообщение, если текст изменился.
+        :param text: Новый текст
+        :param wait: Повторить правку после паузы, запрошенной Telegram
+        """
+        if not text.strip() or text == self.shown:
+            return
+        try:
+            await self.message.edit_text(text)
+        except TelegramRetryAfter as e:
+            self.next_edit = time.monotonic() + e.retry_after
+            if not wait:
+                return
+            await asyncio.sleep(e.retry_after)
+            return await self._edit(text, wait)
+        except TelegramBadRequest as e:
+            logger.debug("Не удалось отредактировать сообщение: %s", e)
+            return
+        self.shown = text
+        self.next_edit = time.monotonic() + self.interval
@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Кэш с ограниченным размером (вытеснение LRU) и временем жизни записей.
+    Просроченные записи удаляются при обращении к ним.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock=time.monotonic):
+        """
+        :param maxsize: Максимальное количество записей
+        :param ttl: Время жизни записи в секундах
+        :param clock: Функция текущего времени
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # {ключ: (время истечения, значение)}
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Возвращает значение по ключу и обновляет счётчики попаданий.
+        :param key: Ключ
+        :param default: Значение, если ключ отсутствует или просрочен
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value, expires_at=None):
+        """
+        Сохраняет значение, вытесняя самые давно использованные записи.
+        :param key: Ключ
+        :param value: Значение
+        :param expires_at: Время истечения (по умолчанию сейчас + ttl)
+        """
+        if expires_at is None:
+            expires_at = self.clock() + self.ttl
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Удаляет запись и возвращает её значение.
+        """
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        """
+        Удаляет все записи.
+        """
+        self._data.clear()
+
+    def items(self):
+        """
+        Возвращает непросроченные записи в порядке от старых к новым.
+        :return: Список кортежей (ключ, значение, время истечения)
+        """
+        now = self.clock()
+        return [(key, value, expires_at) for key, (expires_at, value)
+                in self._data.items() if expires_at > now]
+
+    def _get_entry(self, key):
+        """
+        Возвращает запись, удаляя её, если срок жизни истёк.
+        """
+        entry = self._data.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            del self._data[key]
+            return None
+        return entry
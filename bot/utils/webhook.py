@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import (SimpleRequestHandler,
+                                            setup_application)
+from bot.config.settings import (WEBHOOK_BASE_URL,
+                                 WEBHOOK_PATH,
+                                 WEBHOOK_HOST,
+                                 WEBHOOK_PORT)
+from bot.config.tokens import WEBHOOK_SECRET
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(dp: Dispatcher, bot: Bot, path: str = WEBHOOK_PATH,
+               secret: str = WEBHOOK_SECRET) -> web.Application:
+    """
+    Создаёт aiohttp-приложение, принимающее обновления от Telegram.
+    Запросы без верного заголовка X-Telegram-Bot-Api-Secret-Token
+    отклоняются. Запуск и остановка приложения вызывают хуки
+    startup/shutdown диспетчера.
+    :param dp: Экземпляр Dispatcher
+    :param bot: Экземпляр бота
+    :param path: Путь, по которому принимаются обновления
+    :param secret: Секретный токен webhook (пустой — без проверки)
+    :return: Приложение aiohttp
+    """
+    app = web.Application()
+    SimpleRequestHandler(dispatcher=dp, bot=bot,
+                         secret_token=secret or None).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def set_webhook(bot: Bot, dispatcher: Dispatcher):
+    """
+    Сообщает Telegram адрес webhook при запуске бота.
+    Без WEBHOOK_BASE_URL (локальная проверка) адрес не устанавливается.
+    """
+    if not WEBHOOK_BASE_URL:
+        logger.warning("WEBHOOK_BASE_URL не задан, "
+                       "адрес webhook в Telegram не обновлён.")
+        return
+    await bot.set_webhook(
+        f"{WEBHOOK_BASE_URL.rstrip('/')}{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET or None,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        drop_pending_updates=False
+    )
+    logger.info(f"Webhook установлен: {WEBHOOK_BASE_URL}{WEBHOOK_PATH}")
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot,
+                      host: str = WEBHOOK_HOST, port: int = WEBHOOK_PORT):
+    """
+    Запускает встроенный HTTP-сервер и обрабатывает обновления
+    до отмены задачи.
+    :param dp: Экземпляр Dispatcher
+    :param bot: Экземпляр бота
+    :param host: Адрес, на котором слушает сервер
+    :param port: Порт сервера
+    """
+    if not WEBHOOK_SECRET:
+        logger.warning("WEBHOOK_SECRET не задан, "
+                       "запросы к webhook не проверяются.")
+    dp.startup.register(set_webhook)
+    runner = web.AppRunner(create_app(dp, bot))
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Webhook-сервер слушает {host}:{port}{WEBHOOK_PATH}")
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await bot.session.close()
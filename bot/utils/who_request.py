@@ -2,6 +2,8 @@ import logging
 from aiogram.types import Message, FSInputFile
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Путь к папке с изображениями
 BASE_DIR = Path(__file__).resolve().parent.parent
 IMG_DIR = BASE_DIR / "utils" / "img"
@@ -27,7 +29,7 @@ async def handle_who_request(message: Message,
 
     # Проверяем, есть ли текст в сообщении
     if not message.text:
-        logging.debug("Сообщение не содержит текста. Пропускаем обработку.")
+        logger.debug("Сообщение не содержит текста. Пропускаем обработку.")
         return
 
     # Проверяем, начинается ли сообщение с одной из триггерных фраз
@@ -35,16 +37,16 @@ async def handle_who_request(message: Message,
     if not any(message_text.startswith(trigger) for trigger in TRIGGERS):
         return
 
-    logging.debug(f"Обнаружен запрос '{message_text}' "
-                  f"с одним из триггеров: {TRIGGERS}")
+    logger.debug("Обнаружен запрос '%s' с одним из триггеров: %s",
+                 message_text, TRIGGERS)
 
     # Путь к конкретному изображению
     image_path = IMG_DIR / "a_kto_cenz.png"
     if not image_path.exists():
-        logging.warning(f"Изображение '{image_path}' не найдено.")
+        logger.warning(f"Изображение '{image_path}' не найдено.")
         return
 
-    logging.debug(f"Отправка изображения: {image_path}")
+    logger.debug("Отправка изображения: %s", image_path)
 
     # Создаем объект FSInputFile с указанием пути к файлу
     photo = FSInputFile(image_path)
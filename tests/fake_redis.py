@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import time
+from bot.utils.state_backend import RELEASE_LOCK_SCRIPT
+
+# Локальная замена сервера Redis для проверки общего состояния
+# без установленного Redis. Поддерживает только команды,
+# которые использует бот:
+#   python -m tests.fake_redis --port 6379
+
+
+class FakeRedis:
+    """
+    Сервер протокола Redis с данными в памяти.
+    """
+
+    def __init__(self):
+        self._data = {}  # {ключ: (значение, время истечения или None)}
+        self._commands = {
+            "PING": self._ping, "AUTH": self._ok, "SELECT": self._ok,
+            "GET": self._get, "SET": self._set, "DEL": self._del,
+            "INCR": self._incr, "EVAL": self._eval,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 6379):
+        """
+        Запускает сервер.
+        :return: asyncio.Server
+        """
+        return await asyncio.start_server(self._serve, host, port)
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                args = await _read_command(reader)
+                writer.write(self._dispatch(args))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, args) -> bytes:
+        handler = self._commands.get(args[0].upper())
+        if handler is None:
+            return f"-ERR unknown command '{args[0]}'\r\n".encode()
+        return handler(*args[1:])
+
+    def _value(self, key):
+        entry = self._data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[0] if entry else None
+
+    def _ping(self, *args):
+        return b"+PONG\r\n"
+
+    def _ok(self, *args):
+        return b"+OK\r\n"
+
+    def _get(self, key):
+        value = self._value(key)
+        if value is None:
+            return b"$-1\r\n"
+        data = value.encode()
+        return f"${len(data)}\r\n".encode() + data + b"\r\n"
+
+    def _set(self, key, value, *options):
+        options = [option.upper() for option in options]
+        if "NX" in options and self._value(key) is not None:
+            return b"$-1\r\n"
+        expires_at = None
+        for unit, scale in (("PX", 1000), ("EX", 1)):
+            if unit in options:
+                ttl = int(options[options.index(unit) + 1]) / scale
+                expires_at = time.monotonic() + ttl
+        self._data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+    def _del(self, *keys):
+        removed = sum(self._data.pop(key, None) is not None for key in keys)
+        return f":{removed}\r\n".encode()
+
+    def _incr(self, key):
+        value = int(self._value(key) or 0) + 1
+        self._data[key] = (str(value), None)
+        return f":{value}\r\n".encode()
+
+    def _eval(self, script, numkeys, *args):
+        # Lua не исполняется: поддержан только скрипт снятия блокировки
+        if script != RELEASE_LOCK_SCRIPT:
+            return b"-ERR script is not supported\r\n"
+        key, token = args
+        if self._value(key) == token:
+            return self._del(key)
+        return b":0\r\n"
+
+
+async def _read_command(reader):
+    """
+    Читает команду клиента (массив bulk-строк RESP).
+    """
+    line = await reader.readuntil(b"\r\n")
+    if not line.startswith(b"*"):  # Inline-команда (например, из telnet)
+        return line.decode().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        size = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args.append((await reader.readexactly(size + 2))[:-2].decode())
+    return args
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Локальная замена сервера Redis.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    async def serve():
+        server = await FakeRedis().start(args.host, args.port)
+        print(f"Замена Redis слушает {args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import itertools
+import time
+import aiohttp
+from bot.config.settings import WEBHOOK_PATH, WEBHOOK_PORT
+from bot.config.tokens import WEBHOOK_SECRET
+
+# Локальная замена доставки обновлений Telegram для проверки
+# webhook-режима без доступа к сети:
+#   python -m tests.fake_telegram "/find чарльз"
+
+_update_ids = itertools.count(int(time.time()))
+
+
+def make_message_update(text: str, chat_id: int = 1, user_id: int = 1,
+                        chat_type: str = "private") -> dict:
+    """
+    Формирует обновление с текстовым сообщением в формате Bot API.
+    :param text: Текст сообщения
+    :param chat_id: ID чата
+    :param user_id: ID отправителя
+    :param chat_type: Тип чата (private, group, supergroup)
+    :return: Словарь обновления
+    """
+    update_id = next(_update_ids)
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": chat_type,
+                     "title": None if chat_type == "private" else "Test"},
+            "from": {"id": user_id, "is_bot": False,
+                     "first_name": "Test", "username": "test"},
+            "text": text,
+        },
+    }
+
+
+async def deliver_update(url: str, update: dict,
+                         secret: str = WEBHOOK_SECRET) -> int:
+    """
+    Отправляет обновление на webhook так же, как это делает Telegram.
+    :param url: Адрес webhook
+    :param update: Словарь обновления
+    :param secret: Секретный токен webhook
+    :return: HTTP-статус ответа
+    """
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=update, headers=headers) as resp:
+            return resp.status
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Отправляет тестовое сообщение на локальный webhook.")
+    parser.add_argument("text", help="Текст сообщения")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{WEBHOOK_PORT}"
+                                         f"{WEBHOOK_PATH}")
+    parser.add_argument("--chat-id", type=int, default=1)
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--chat-type", default="private")
+    parser.add_argument("--secret", default=WEBHOOK_SECRET)
+    args = parser.parse_args()
+
+    update = make_message_update(args.text, args.chat_id, args.user_id,
+                                 args.chat_type)
+    status = asyncio.run(deliver_update(args.url, update, args.secret))
+    print(f"update_id={update['update_id']}: HTTP {status}")
+
+
+if __name__ == "__main__":
+    main()
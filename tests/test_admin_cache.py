@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from bot.utils.admin_cache import AdminCache
+
+
+class FakeBot:
+    """
+    Бот, у которого запрос администраторов можно задержать
+    или завершить ошибкой.
+    """
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def get_chat_administrators(self, chat_id):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [f"admin of {chat_id}"]
+
+
+def test_concurrent_requests_share_one_call():
+    async def run():
+        cache, bot = AdminCache(60, 10), FakeBot(delay=0.01)
+        results = await asyncio.gather(*(cache.get(bot, 1)
+                                         for _ in range(5)))
+        return results, bot.calls
+
+    results, calls = asyncio.run(run())
+    assert results == [["admin of 1"]] * 5
+    assert calls == 1
+
+
+def test_cached_result_is_reused():
+    async def run():
+        cache, bot = AdminCache(60, 10), FakeBot()
+        await cache.get(bot, 1)
+        await cache.get(bot, 1)
+        return bot.calls
+
+    assert asyncio.run(run()) == 1
+
+
+def test_error_is_passed_to_waiters_and_not_cached():
+    async def run():
+        cache, bot = AdminCache(60, 10), FakeBot(delay=0.01,
+                                                 error=RuntimeError("x"))
+        results = await asyncio.gather(cache.get(bot, 1), cache.get(bot, 1),
+                                       return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        bot.error = None
+        return await cache.get(bot, 1)
+
+    assert asyncio.run(run()) == ["admin of 1"]
+
+
+def test_cancelled_leader_does_not_block_waiters():
+    async def run():
+        cache, bot = AdminCache(60, 10), FakeBot(delay=0.05)
+        leader = asyncio.create_task(cache.get(bot, 1))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get(bot, 1))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        result = await asyncio.wait_for(waiter, timeout=1)
+        return result, cache._pending
+
+    result, pending = asyncio.run(run())
+    assert result == ["admin of 1"]
+    assert pending == {}
@@ -0,0 +1,136 @@
+import asyncio
+import functools
+from types import SimpleNamespace
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from bot.commands import announce
+from bot.commands.announce import (check_access, handle_announce,
+                                   handle_announce_status,
+                                   report_announce_result)
+from bot.utils import announce_jobs, state_backend
+from bot.utils.announce_jobs import create_job
+from bot.utils.state_backend import MemoryBackend
+
+
+ADMIN_ID = 100
+
+
+@pytest.fixture(autouse=True)
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(announce_jobs, "JOBS_DIR", tmp_path / "jobs")
+    monkeypatch.setattr(announce, "BOT_ADMIN_IDS", [ADMIN_ID])
+
+
+class FakeMessage:
+    """
+    Сообщение пользователя: запоминает ответы бота.
+    """
+
+    def __init__(self, text, user_id, chat_type="private"):
+        self.text = text
+        self.from_user = SimpleNamespace(id=user_id)
+        self.chat = SimpleNamespace(id=user_id, type=chat_type)
+        self.answers = []
+
+    async def answer(self, text):
+        self.answers.append(text)
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+class FailingStatus:
+    async def edit_text(self, text):
+        raise TelegramBadRequest(method=None, message="message not found")
+
+
+def make_job():
+    return create_job([], created_by=1, report_chat_id=10,
+                      announce_message="текст", forward_from=None)
+
+
+@pytest.mark.parametrize("user_id, chat_type, enabled, allowed", [
+    (ADMIN_ID, "private", True, True),
+    (ADMIN_ID, "group", True, False),
+    (ADMIN_ID, "private", False, False),
+    (1, "private", True, False),
+])
+def test_check_access(user_id, chat_type, enabled, allowed):
+    message = FakeMessage("/announce текст", user_id, chat_type)
+    assert (check_access(message, enabled) is None) is allowed
+
+
+def test_non_admin_cannot_announce():
+    message = FakeMessage("/announce текст", user_id=1)
+    asyncio.run(handle_announce(message))
+    assert message.answers == [
+        "Команда доступна только администраторам бота."]
+    assert announce_jobs.list_jobs() == []
+
+
+def test_status_is_shown_to_author_and_admins_only():
+    job = make_job()  # created_by=1
+
+    def status(user_id, text):
+        message = FakeMessage(text, user_id)
+        asyncio.run(handle_announce_status(message))
+        return "\n".join(message.answers)
+
+    for user_id in (1, ADMIN_ID):
+        assert job.id in status(user_id, f"/announce_status {job.id}")
+        assert job.id in status(user_id, "/announce_status")
+    assert status(2, f"/announce_status {job.id}") == (
+        f"Рассылка {job.id} не найдена.")
+    assert job.id not in status(2, "/announce_status")
+
+
+@pytest.mark.parametrize("status", [None, FailingStatus()])
+def test_report_falls_back_to_new_message(status):
+    bot = FakeBot()
+    asyncio.run(report_announce_result(bot, make_job(), status))
+    assert [chat_id for chat_id, _ in bot.sent] == [10]
+
+
+def test_report_does_not_hide_unexpected_errors():
+    class BrokenStatus:
+        async def edit_text(self, text):
+            raise ValueError("bug")
+
+    with pytest.raises(ValueError):
+        asyncio.run(report_announce_result(FakeBot(), make_job(),
+                                           BrokenStatus()))
+
+
+def test_delivery_stops_when_lease_is_lost(monkeypatch):
+    backend = MemoryBackend()
+    monkeypatch.setattr(state_backend, "_backend", backend)
+    monkeypatch.setattr(announce, "hold_job",
+                        functools.partial(announce_jobs.hold_job, lease=0.06))
+    sent = []
+
+    async def slow_send(chat, bot, announce_message=None, forward_from=None):
+        await asyncio.sleep(0.01)
+        sent.append(chat["id"])
+
+    monkeypatch.setattr(announce, "send_announce_to_chat", slow_send)
+    job = create_job([{"id": chat_id, "title": "chat"}
+                      for chat_id in range(100)],
+                     created_by=1, report_chat_id=10, announce_message="hi")
+
+    async def main():
+        assert await announce_jobs.claim_job(job)
+        run = asyncio.create_task(announce.run_announce_job(FakeBot(), job))
+        await asyncio.sleep(0.005)
+        await backend.set(f"announce_job:{job.id}", "other-replica")
+        with pytest.raises(announce_jobs.LeaseLost):
+            await run
+
+    asyncio.run(main())
+    assert 0 < len(sent) < 100
+    assert not job.finished
+    assert announce.active_jobs == {}
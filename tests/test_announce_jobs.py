@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from bot.utils import announce_jobs, state_backend
+from bot.utils.announce_jobs import AnnounceJob, claim_job, release_job
+from bot.utils.state_backend import MemoryBackend
+
+
+@pytest.fixture(autouse=True)
+def backend(monkeypatch):
+    backend = MemoryBackend()
+    monkeypatch.setattr(state_backend, "_backend", backend)
+    return backend
+
+
+def make_job(job_id="job1"):
+    return AnnounceJob({"id": job_id, "status": announce_jobs.RUNNING,
+                        "deliveries": {}})
+
+
+def claim_as(monkeypatch, instance_id, job):
+    monkeypatch.setattr(announce_jobs, "INSTANCE_ID", instance_id)
+    return asyncio.run(claim_job(job))
+
+
+def test_only_one_instance_claims_a_job(monkeypatch):
+    job = make_job()
+    assert claim_as(monkeypatch, "replica-a", job)
+    assert not claim_as(monkeypatch, "replica-b", job)
+    assert claim_as(monkeypatch, "replica-a", job)
+
+
+def test_released_job_can_be_claimed_by_another_instance(monkeypatch):
+    job = make_job()
+    assert claim_as(monkeypatch, "replica-a", job)
+    asyncio.run(release_job(job))
+    assert claim_as(monkeypatch, "replica-b", job)
+
+
+def test_expired_lease_can_be_claimed(monkeypatch, backend):
+    now = [0.0]
+    backend.clock = lambda: now[0]
+    job = make_job()
+    assert claim_as(monkeypatch, "replica-a", job)
+    now[0] = announce_jobs.ANNOUNCE_JOB_LEASE_SECONDS + 1
+    assert claim_as(monkeypatch, "replica-b", job)
+
+
+@pytest.mark.parametrize("job_id", ["../secret", "../../bot/x", "ABCDEF12",
+                                    "1234567", "123456789", ""])
+def test_load_job_rejects_foreign_ids(job_id, tmp_path, monkeypatch):
+    jobs_dir = tmp_path / "jobs"
+    jobs_dir.mkdir()
+    (tmp_path / "secret.json").write_text(
+        '{"id": "secret", "status": "running", "deliveries": {}}',
+        encoding="utf-8")
+    monkeypatch.setattr(announce_jobs, "JOBS_DIR", jobs_dir)
+    assert announce_jobs.load_job(job_id) is None
+
+
+def test_load_job_reads_created_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(announce_jobs, "JOBS_DIR", tmp_path)
+    job = announce_jobs.create_job([{"id": 1, "title": "chat"}], 1, 1, "hi")
+    assert announce_jobs.load_job(job.id).data == job.data
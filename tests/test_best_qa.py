@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from bot.commands import best_qa, best_qa_auto
+from bot.commands.best_qa import draw_best_qa
+from bot.commands.best_qa_auto import run_daily_draw
+from bot.utils import state_backend, storage
+from bot.utils.participants import participant_index
+from bot.utils.state_backend import MemoryBackend
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db = storage.Storage(tmp_path / "bot.db")
+    monkeypatch.setattr(storage, "_storage", db)
+    monkeypatch.setattr(best_qa, "_last_winners", {})
+    monkeypatch.setattr(state_backend, "_backend", MemoryBackend())
+    monkeypatch.setattr(best_qa_auto, "BEST_QA_DRAW_BATCH_PAUSE", 0)
+    user = SimpleNamespace(id=10, full_name="Ann", username="ann")
+    monkeypatch.setattr(participant_index, "choose", lambda chat_id: user)
+    yield db
+    db.close()
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append(chat_id)
+
+
+def test_concurrent_draws_pick_one_winner_per_day(db):
+    async def scenario():
+        return await asyncio.gather(
+            *(draw_best_qa(None, -1, "chat") for _ in range(3)))
+
+    winners = asyncio.run(scenario())
+
+    assert [winner is not None for winner in winners].count(True) == 1
+    assert db.count_winners(-1) == 1
+    assert db.get_leaderboard(-1, 10)[0]["wins"] == 1
+    assert db.get_last_winner(-1)["winner"]["user_id"] == 10
+
+
+def test_daily_draw_is_idempotent(db):
+    db.set_auto_draw(-1, "one", True)
+    db.set_auto_draw(-2, "two", True)
+    bot = FakeBot()
+
+    asyncio.run(run_daily_draw(bot))
+    # Повторный запуск в тот же день (например, после перезапуска бота)
+    asyncio.run(run_daily_draw(bot))
+
+    assert sorted(bot.sent) == [-2, -1]
+    assert db.get_leaderboard(storage.GLOBAL_CHAT_ID, 10)[0]["wins"] == 2
+    assert db.conn.execute(
+        "SELECT COUNT(*) FROM best_qa_wins").fetchone()[0] == 2
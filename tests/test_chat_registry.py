@@ -0,0 +1,60 @@
+import asyncio
+from bot.commands.add_chat import added_chat
+from bot.commands.remove_chat import deleted_chat
+from bot.utils.chat_registry import ChatRegistry
+from bot.utils.state_backend import RedisBackend
+from bot.utils.storage import Storage
+from tests.fake_redis import FakeRedis
+
+
+def run_instances(tmp_path, scenario, count=2):
+    """
+    Запускает сценарий с несколькими копиями реестра, которые
+    разделяют базу и хранилище состояния (FakeRedis).
+    """
+    async def main():
+        server = await FakeRedis().start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        storage = Storage(tmp_path / "bot.db")
+        backends = [RedisBackend(f"redis://127.0.0.1:{port}", prefix="t:")
+                    for _ in range(count)]
+        registries = [ChatRegistry(storage, flush_delay=0, backend=backend)
+                      for backend in backends]
+        try:
+            await scenario(*registries)
+            return storage.get_chats()
+        finally:
+            for backend in backends:
+                await backend.close()
+            server.close()
+            storage.close()
+
+    return asyncio.run(main())
+
+
+def test_update_sees_changes_of_other_instance(tmp_path):
+    async def scenario(first, second):
+        assert await first.update(
+            -1, lambda chat: added_chat(chat, -1, "chat", "ann"))
+        assert await second.update(
+            -1, lambda chat: deleted_chat(chat, -1, "bob"))
+        assert not await first.update(
+            -1, lambda chat: deleted_chat(chat, -1, "ann"))
+        assert first.get(-1)["deleted_by"] == "bob"
+
+    [chat] = run_instances(tmp_path, scenario)
+    assert chat["deleted"] and chat["deleted_by"] == "bob"
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    def bump(chat):
+        return {**chat, "title": str(int(chat["title"]) + 1)}
+
+    async def scenario(first, second):
+        await first.update(-1, lambda chat: {"id": -1, "title": "0"})
+        await asyncio.gather(*(registry.update(-1, bump)
+                               for _ in range(3)
+                               for registry in (first, second)))
+
+    [chat] = run_instances(tmp_path, scenario)
+    assert chat["title"] == "6"
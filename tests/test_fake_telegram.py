@@ -0,0 +1,10 @@
+from aiogram.types import Update
+from tests.fake_telegram import make_message_update
+
+
+def test_message_update_is_valid_bot_api_update():
+    update = Update.model_validate(
+        make_message_update("/find чарльз", chat_id=5, chat_type="group"))
+    assert update.message.text == "/find чарльз"
+    assert update.message.chat.id == 5
+    assert update.message.chat.title == "Test"
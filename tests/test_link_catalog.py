@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from bot.modules import menu
+from bot.utils import link_catalog, link_search, link_tree, message_parse
+from bot.utils.link_tree import get_tree
+
+
+@pytest.fixture(autouse=True)
+def restore_catalog(monkeypatch):
+    """
+    Каталог хранится в глобальных переменных модулей: после теста
+    возвращаем прежние дерево, матчер, меню и индекс.
+    """
+    monkeypatch.setattr(link_tree, "_tree", link_tree._tree)
+    monkeypatch.setattr(message_parse, "_matcher", message_parse._matcher)
+    monkeypatch.setattr(menu, "_menus", menu._menus)
+    monkeypatch.setattr(link_search, "_index", link_search._index)
+    monkeypatch.setattr(link_catalog, "_loaded_mtime", None)
+    monkeypatch.setattr(link_catalog, "_failed_mtime", None)
+
+
+def write_catalog(path, regex):
+    path.write_text(json.dumps({"Foo": {"key": "foo",
+                                        "url": "https://example.com",
+                                        "regex": regex}}),
+                    encoding="utf-8")
+
+
+def test_reload_accepts_inline_flags(tmp_path):
+    path = tmp_path / "links.json"
+    write_catalog(path, ["(?i)foo", "(?P<x>bar)", "(?P<x>baz)"])
+    assert asyncio.run(link_catalog.reload_catalog(path))
+    assert message_parse.find_links_by_keyword("foo") == [
+        ("Foo", "https://example.com")]
+
+
+def test_reload_keeps_previous_catalog_on_bad_regex(tmp_path):
+    path = tmp_path / "links.json"
+    tree = get_tree()
+    write_catalog(path, ["a(?i)b"])
+    assert not asyncio.run(link_catalog.reload_catalog(path))
+    assert get_tree() is tree
+
+
+def test_interrupted_reload_is_retried(tmp_path, monkeypatch):
+    path = tmp_path / "links.json"
+    write_catalog(path, ["foo"])
+    load_and_build = link_catalog._load_and_build
+
+    def failing_load(path):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(link_catalog, "_load_and_build", failing_load)
+    with pytest.raises(RuntimeError):
+        asyncio.run(link_catalog.reload_catalog(path))
+    monkeypatch.setattr(link_catalog, "_load_and_build", load_and_build)
+    assert asyncio.run(link_catalog.reload_catalog(path))
+    assert not asyncio.run(link_catalog.reload_catalog(path))
+
+
+def test_watch_survives_unexpected_errors(tmp_path, monkeypatch):
+    calls = []
+
+    async def failing_reload(path):
+        calls.append(path)
+        raise RuntimeError("boom")
+
+    async def run_watch():
+        task = asyncio.create_task(
+            link_catalog.watch_catalog(0.01, tmp_path / "links.json"))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+
+    monkeypatch.setattr(link_catalog, "reload_catalog", failing_reload)
+    asyncio.run(run_watch())
+    assert len(calls) > 1
+
+
+def test_watcher_is_cancelled_on_shutdown(tmp_path, monkeypatch):
+    async def reload_catalog(path=None):
+        return False
+
+    async def run():
+        await link_catalog.start_catalog_watcher()
+        task = link_catalog._watch_task
+        await link_catalog.stop_catalog_watcher()
+        return task
+
+    monkeypatch.setattr(link_catalog, "reload_catalog", reload_catalog)
+    assert asyncio.run(run()).cancelled()
+    assert link_catalog._watch_task is None
@@ -0,0 +1,101 @@
+import re
+import pytest
+from bot.config.links import LINKS
+from bot.utils.link_tree import LinkTree
+from bot.utils.message_parse import LinkMatcher, AnyPattern, is_match
+
+MESSAGES = [
+    "",
+    "привет всем",
+    "как настроить charles?",
+    "где документация по postman и swagger",
+    "у меня не работает прокси чарльз",
+    "FOO bar",
+    "строка\nс переводом foo",
+    "baz" * 1000,
+    "yy",
+    "xx yy",
+    "abab",
+]
+
+LINKS_TREE = LinkTree(LINKS)
+LINKS_REGEXES = [regex for node in LINKS_TREE.leaves
+                 for regex in node.regex or []]
+
+
+def loop_find(tree, keyword):
+    """
+    Поиск ссылок прежним способом: каждое выражение по отдельности.
+    """
+    return [(node.name, node.url) for node in tree.leaves
+            if node.regex and is_match(keyword, node.regex)]
+
+
+def sample_for(regex):
+    """
+    Текст, совпадающий с простым выражением LINKS: выражение без
+    якорей и «.*».
+    """
+    return re.sub(r"\\b|\.\*|[$^]", "", regex).lower()
+
+
+def make_tree(*sections):
+    return LinkTree({name: {"url": f"https://example.com/{name}",
+                            "regex": regex}
+                     for name, regex in sections})
+
+
+@pytest.mark.parametrize("keyword", MESSAGES)
+def test_matcher_matches_per_regex_loop_on_links(keyword):
+    keyword = keyword.lower()
+    expected = loop_find(LINKS_TREE, keyword)
+    assert LinkMatcher(LINKS_TREE).find(keyword) == expected
+
+
+@pytest.mark.parametrize("regex", LINKS_REGEXES)
+def test_matcher_matches_per_regex_loop_for_every_links_regex(regex):
+    keyword = sample_for(regex)
+    assert is_match(keyword, [regex])
+    expected = loop_find(LINKS_TREE, keyword)
+    assert LinkMatcher(LINKS_TREE).find(keyword) == expected
+
+
+@pytest.mark.parametrize("keyword", MESSAGES)
+def test_matcher_handles_inline_flags_and_named_groups(keyword):
+    tree = make_tree(("flags", [r"(?i)foo"]),
+                     ("dotall", [r"(?s)строка.foo"]),
+                     ("group_a", [r"(?P<word>bar)"]),
+                     ("group_b", [r"(?P<word>baz)", r"(?P<word>qux)"]),
+                     ("plain", [r"\bпрокси"]),
+                     ("verbose", [r"(?x) f o o  # комментарий"]),
+                     ("backref_x", [r"(x)\1"]),
+                     ("backref_y", [r"(y)\1", r"(ab)\1"]),
+                     ("conditional", [r"(a)?(?(1)b|q)b"]))
+    matcher = LinkMatcher(tree)
+    keyword = keyword.lower()
+    assert matcher.find(keyword) == loop_find(tree, keyword)
+
+
+def test_duplicate_named_groups_disable_combined_pattern():
+    tree = make_tree(("a", [r"(?P<word>bar)"]), ("b", [r"(?P<word>baz)"]))
+    matcher = LinkMatcher(tree)
+    assert matcher.combined is None
+    assert [name for name, _ in matcher.find("bar baz")] == ["a", "b"]
+
+
+def test_section_with_conflicting_regexes_uses_any_pattern():
+    matcher = LinkMatcher(make_tree(("a", [r"(?P<w>x)", r"(?P<w>y)"])))
+    assert isinstance(matcher.sections[0][2], AnyPattern)
+    assert matcher.find("y") == [("a", "https://example.com/a")]
+
+
+def test_invalid_regex_is_skipped():
+    matcher = LinkMatcher(make_tree(("bad", [r"a(?i)b", "("]),
+                                    ("good", ["ok"])))
+    assert [name for name, _, _ in matcher.sections] == ["good"]
+
+
+def test_numbered_backreferences_are_matched_separately():
+    matcher = LinkMatcher(make_tree(("x", [r"(x)\1"]), ("y", [r"(y)\1"])))
+    assert matcher.find("yy") == [("y", "https://example.com/y")]
+    assert len(matcher.standalone) == 2
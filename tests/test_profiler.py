@@ -0,0 +1,28 @@
+import asyncio
+import logging
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from bot.utils.profiler import deep_sizeof
+
+
+def test_memory_storage_contents_are_counted():
+    storage = MemoryStorage()
+    empty = deep_sizeof(storage)
+
+    async def fill():
+        for user_id in range(100):
+            key = StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+            await storage.set_data(key, {"text": f"{user_id:04}" * 250})
+
+    asyncio.run(fill())
+    assert deep_sizeof(storage) - empty > 100 * 1000
+
+
+def test_shared_objects_are_not_walked():
+    class Holder:
+        def __init__(self):
+            self.logger = logging.getLogger("bot.test")
+            self.data = ["x" * 1000]
+
+    size = deep_sizeof(Holder())
+    assert 1000 < size < 1000 + deep_sizeof(logging.root.manager.loggerDict)
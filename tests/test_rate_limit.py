@@ -0,0 +1,82 @@
+import asyncio
+import time
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from bot.utils import rate_limit
+from bot.utils.rate_limit import RateLimiter, TokenBucket
+
+
+def test_bucket_spends_capacity_then_waits_for_refill():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    async def main():
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 2 / 20 * 0.9
+
+
+def test_pause_delays_next_token():
+    bucket = TokenBucket(rate=1000)
+    bucket.pause(0.05)
+
+    async def main():
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 0.04
+
+
+def flaky_call(failures: int):
+    """
+    Вызов, который failures раз отвечает flood control.
+    """
+    calls = []
+
+    async def call():
+        calls.append(True)
+        if len(calls) <= failures:
+            raise TelegramRetryAfter(method=None, message="flood",
+                                     retry_after=0)
+        return "ok"
+
+    return call, calls
+
+
+def test_call_retries_after_flood_control():
+    call, calls = flaky_call(2)
+    limiter = RateLimiter(1000, 1000, max_retries=3)
+    assert asyncio.run(limiter.call(1, call)) == "ok"
+    assert len(calls) == 3
+
+
+def test_call_gives_up_after_max_retries():
+    call, calls = flaky_call(5)
+    limiter = RateLimiter(1000, 1000, max_retries=1)
+    with pytest.raises(TelegramRetryAfter):
+        asyncio.run(limiter.call(1, call))
+    assert len(calls) == 2
+
+
+def test_idle_buckets_with_waiters_are_kept(monkeypatch):
+    monkeypatch.setattr(rate_limit, "MAX_CHAT_BUCKETS", 2)
+    limiter = RateLimiter(1000, chat_rate=10)
+
+    async def main():
+        await limiter.acquire(1)
+        await limiter.acquire(2)
+        waited = limiter._chat_buckets[1]
+        waiter = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+        for bucket in limiter._chat_buckets.values():
+            bucket.updated -= 1  # Обе корзины простаивают дольше 1/rate
+        await limiter.acquire(3)
+        assert limiter._chat_buckets[1] is waited
+        assert 2 not in limiter._chat_buckets
+        await waiter
+        assert waited.waiters == 0
+
+    asyncio.run(main())
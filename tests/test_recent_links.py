@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from bot.modules import messages
+from bot.utils import state_backend
+from bot.utils.recent_links import RecentLinks
+from bot.utils.state_backend import MemoryBackend
+
+LINKS = [("Doc", "https://example.com/doc"), ("Faq", "https://example.com/faq")]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_links(clock, max_links_per_chat=100, max_chats=100):
+    return RecentLinks(ttl=60, max_links_per_chat=max_links_per_chat,
+                       max_chats=max_chats, clock=clock)
+
+
+def test_link_is_skipped_until_ttl_expires(clock):
+    links = make_links(clock)
+
+    assert links.filter(1, LINKS) == LINKS
+    clock.now = 59
+    assert links.filter(1, LINKS) == []
+    assert links.filter(2, LINKS[:1]) == LINKS[:1]
+    clock.now = 60
+    assert links.filter(1, LINKS) == LINKS
+
+
+def test_per_chat_cap_forgets_oldest_links(clock):
+    links = make_links(clock, max_links_per_chat=2)
+    extra = [("Wiki", "https://example.com/wiki")]
+
+    links.filter(1, LINKS)
+    links.filter(1, extra)
+
+    assert len(links) == 2
+    assert links.filter(1, LINKS) == LINKS[:1]
+    assert links.filter(1, extra) == []
+
+
+def test_chat_cap_forgets_least_recently_active_chat(clock):
+    links = make_links(clock, max_chats=2)
+
+    links.filter(1, LINKS)
+    links.filter(2, LINKS)
+    links.filter(1, [])  # Чат 1 снова активен
+    links.filter(3, LINKS)
+
+    assert links.filter(1, LINKS) == []
+    assert links.filter(2, LINKS) == LINKS
+
+
+def test_sweeper_removes_expired_links_and_empty_chats(clock):
+    links = make_links(clock)
+    links.filter(1, LINKS)
+    clock.now = 30
+    links.filter(2, LINKS[:1])
+
+    async def sweep_after(moment):
+        clock.now = moment
+        task = asyncio.create_task(links.run_sweeper(0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(sweep_after(60))
+    assert len(links) == 1
+    assert list(links._chats) == [2]
+    asyncio.run(sweep_after(90))
+    assert len(links) == 0
+    assert not links._chats
+
+
+class FakeMessage:
+    def __init__(self, chat_id=1):
+        self.chat = SimpleNamespace(id=chat_id)
+        self.message_id = 1
+        self.answers = []
+
+    async def answer(self, text, **kwargs):
+        self.answers.append(text)
+
+
+def test_message_does_not_repeat_links_within_window(clock, monkeypatch):
+    monkeypatch.setattr(messages, "recent_links", make_links(clock))
+    monkeypatch.setattr(messages, "TIMEOUT_RESPONSES_ENABLE", True)
+    monkeypatch.setattr(state_backend, "_backend", MemoryBackend())
+
+    def reply_count(results):
+        message = FakeMessage()
+        asyncio.run(messages.process_results(message, results))
+        return len(message.answers)
+
+    assert reply_count(LINKS) == 1
+    clock.now = 30
+    assert reply_count(LINKS) == 0
+    assert reply_count(LINKS[:1]) == 0
+    clock.now = 60
+    assert reply_count(LINKS[:1]) == 1
@@ -0,0 +1,36 @@
+import asyncio
+import time
+from bot.utils import announce_jobs, search_cache, storage
+from bot.utils.replay_updates import REPLAY_ANSWER, replay
+from bot.utils.storage import Storage
+
+
+def make_entry(text: str, chat_id: int = 7) -> dict:
+    return {"update_type": "message", "total": 1.0, "stages": [],
+            "update": {"update_id": 1, "message": {
+                "message_id": 1, "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "T"},
+                "text": text}}}
+
+
+def test_replay_does_not_touch_production_data(tmp_path, monkeypatch,
+                                               caplog):
+    production = Storage(tmp_path / "bot.db")
+    production.save_chat({"id": 1, "title": "prod", "deleted": False})
+    production.close()
+    before = (tmp_path / "bot.db").read_bytes()
+    monkeypatch.setattr(storage, "DB_FILE", tmp_path / "bot.db")
+    monkeypatch.setattr(search_cache, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(announce_jobs, "JOBS_DIR", tmp_path / "jobs")
+
+    results = asyncio.run(replay([make_entry("/search что такое charles")]))
+
+    _, _, calls, error = results[0]
+    assert error is None
+    assert "OpenAI" not in caplog.text
+    assert calls.get("sendMessage") or calls.get("editMessageText")
+    assert (tmp_path / "bot.db").read_bytes() == before
+    assert not (tmp_path / "cache.json").exists()
+    assert not (tmp_path / "jobs").exists()
+    assert search_cache.get_answer("что такое charles", {}) != REPLAY_ANSWER
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from bot.utils.resp_client import RespClient, RespError, is_idempotent
+
+
+class ScriptedServer:
+    """
+    Сервер RESP, который отвечает на каждую команду следующим ответом
+    из списка; None — закрыть соединение, ... — не отвечать.
+    """
+
+    def __init__(self, replies, db=0):
+        self.replies = list(replies)
+        self.db = db
+        self.commands = 0
+        self.connections = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return RespClient(f"redis://127.0.0.1:{port}/{self.db}")
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while await self._reply(reader, writer):
+                pass
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, reader, writer) -> bool:
+        line = await reader.readuntil(b"\r\n")
+        for _ in range(2 * int(line[1:-2])):
+            await reader.readuntil(b"\r\n")
+        self.commands += 1
+        reply = self.replies.pop(0)
+        if reply is None:
+            return False
+        if reply is not ...:
+            writer.write(reply)
+            await writer.drain()
+        return True
+
+
+def run(server, scenario):
+    async def main():
+        client = await server.start()
+        try:
+            return await scenario(client)
+        finally:
+            await client.close()
+            server.server.close()
+
+    return asyncio.run(main())
+
+
+def test_cancelled_command_drops_connection():
+    server = ScriptedServer([..., b"+PONG\r\n"])
+
+    async def scenario(client):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.execute("GET", "key"), 0.05)
+        return await client.execute("PING")
+
+    assert run(server, scenario) == "PONG"
+    assert server.connections == 2
+
+
+def test_idempotent_command_is_retried_after_disconnect():
+    server = ScriptedServer([None, b"$1\r\nv\r\n"])
+
+    async def scenario(client):
+        return await client.execute("GET", "key")
+
+    assert run(server, scenario) == "v"
+    assert server.commands == 2
+
+
+def test_rejected_select_drops_connection():
+    server = ScriptedServer([b"-ERR DB index is out of range\r\n",
+                             b"+OK\r\n", b"+PONG\r\n"], db=1)
+
+    async def scenario(client):
+        with pytest.raises(RespError):
+            await client.execute("PING")
+        return await client.execute("PING")
+
+    assert run(server, scenario) == "PONG"
+    assert server.connections == 2
+    assert server.commands == 3
+
+
+def test_non_idempotent_command_is_not_retried():
+    server = ScriptedServer([None, b":2\r\n"])
+
+    async def scenario(client):
+        with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+            await client.execute("INCR", "key")
+
+    run(server, scenario)
+    assert server.commands == 1
+
+
+def test_error_inside_array_keeps_connection_in_sync():
+    server = ScriptedServer([b"*2\r\n-ERR bad\r\n:1\r\n", b"+PONG\r\n"])
+
+    async def scenario(client):
+        with pytest.raises(RespError):
+            await client.execute("EXEC")
+        return await client.execute("PING")
+
+    assert run(server, scenario) == "PONG"
+    assert server.connections == 1
+
+
+@pytest.mark.parametrize("args, expected", [
+    (("GET", "k"), True),
+    (("set", "k", "v", "PX", 100), True),
+    (("SET", "k", "v", "NX", "PX", 100), False),
+    (("INCR", "k"), False),
+    (("EVAL", "script", 1, "k"), False),
+])
+def test_is_idempotent(args, expected):
+    assert is_idempotent(args) is expected
@@ -0,0 +1,24 @@
+import asyncio
+from bot.utils.scheduler import cancel_tasks
+
+
+def test_cancel_tasks_waits_for_cleanup():
+    cleaned = []
+
+    async def worker():
+        try:
+            await asyncio.sleep(60)
+        finally:
+            await asyncio.sleep(0)
+            cleaned.append(True)
+
+    async def main():
+        task = asyncio.create_task(worker())
+        done = asyncio.create_task(asyncio.sleep(0))
+        await asyncio.sleep(0.01)
+        await cancel_tasks([task, done, None])
+        return task
+
+    task = asyncio.run(main())
+    assert task.cancelled()
+    assert cleaned == [True]
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import time
+import pytest
+from bot.utils import search_cache
+from bot.utils.ttl_cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    """
+    Пустой незагруженный кэш с файлом во временном каталоге.
+    """
+    monkeypatch.setattr(search_cache, "_cache",
+                        TTLCache(10, 60, clock=time.time))
+    monkeypatch.setattr(search_cache, "_loaded", False)
+    monkeypatch.setattr(search_cache, "_dirty", False)
+    monkeypatch.setattr(search_cache, "_flush_task", None)
+    monkeypatch.setattr(search_cache, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(search_cache, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(search_cache, "SEARCH_CACHE_FLUSH_DELAY_SECONDS",
+                        0.05)
+    return tmp_path / "cache.json"
+
+
+def test_cache_is_loaded_on_first_use(cache_file):
+    key = search_cache.make_key("вопрос", {})
+    cache_file.write_text(json.dumps([[key, "ответ", time.time() + 60]]),
+                          encoding="utf-8")
+    assert search_cache.get_answer("Вопрос?", {}) == "ответ"
+
+
+def test_malformed_entries_are_skipped(cache_file, caplog):
+    key = search_cache.make_key("вопрос", {})
+    expires_at = time.time() + 60
+    cache_file.write_text(json.dumps([
+        [key, "ответ", expires_at], [key], "строка", None,
+        ["ключ", "ответ", "завтра"], [["ключ"], "ответ", expires_at],
+    ]), encoding="utf-8")
+
+    assert search_cache.get_answer("Вопрос?", {}) == "ответ"
+    assert len(search_cache._cache) == 1
+    assert "повреждённых записей: 5" in caplog.text
+
+
+def test_non_list_file_is_ignored(cache_file):
+    cache_file.write_text(json.dumps({"key": "value"}), encoding="utf-8")
+    assert search_cache.get_answer("Вопрос?", {}) is None
+
+
+def test_answers_are_written_once_after_delay(cache_file, monkeypatch):
+    writes = []
+    write_entries = search_cache._write_entries
+
+    def counting_write(entries):
+        writes.append(len(entries))
+        write_entries(entries)
+
+    async def main():
+        for number in range(3):
+            search_cache.save_answer(f"вопрос {number}", {}, "ответ")
+        assert not cache_file.exists()
+        await asyncio.sleep(0.2)
+
+    monkeypatch.setattr(search_cache, "_write_entries", counting_write)
+    asyncio.run(main())
+    assert writes == [3]
+    assert len(json.loads(cache_file.read_text(encoding="utf-8"))) == 3
+
+
+def test_flush_writes_pending_answers(cache_file):
+    async def main():
+        search_cache.save_answer("вопрос", {}, "ответ")
+        await search_cache.flush_cache()
+
+    asyncio.run(main())
+    assert cache_file.exists()
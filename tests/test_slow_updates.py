@@ -0,0 +1,30 @@
+import asyncio
+import time
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from bot.utils.monitoring import BotApiMetricsMiddleware, register_metrics
+from bot.utils.replay_updates import REPLAY_TOKEN, ReplaySession
+from bot.utils.slow_updates import CaptureFile, SlowUpdateMiddleware
+
+
+async def handle_echo(message):
+    await message.answer(message.text)
+
+
+def test_capture_reads_stages_from_metrics_middlewares(tmp_path):
+    capture = CaptureFile(tmp_path / "slow.jsonl", 10)
+    dp = Dispatcher()
+    dp.message.register(handle_echo)
+    register_metrics(dp)
+    dp.update.outer_middleware(SlowUpdateMiddleware(capture, 0))
+    bot = Bot(REPLAY_TOKEN, session=ReplaySession())
+    bot.session.middleware(BotApiMetricsMiddleware())
+    update = Update.model_validate({"update_id": 1, "message": {
+        "message_id": 1, "date": int(time.time()), "text": "hi",
+        "chat": {"id": 1, "type": "private"}}}, context={"bot": bot})
+
+    asyncio.run(dp.feed_update(bot, update))
+
+    [entry] = capture.read()
+    assert [(stage["stage"], stage["name"]) for stage in entry["stages"]] == [
+        ("api", "sendMessage"), ("handler", "handle_echo")]
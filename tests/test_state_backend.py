@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from bot.utils.fsm_storage import BackendStorage
+from bot.utils.state_backend import (LockTimeout, MemoryBackend,
+                                     RedisBackend, StateBackend)
+from tests.fake_redis import FakeRedis
+
+
+def run_with_redis(scenario):
+    """
+    Запускает сценарий с RedisBackend, подключённым к FakeRedis.
+    """
+    async def main():
+        server = await FakeRedis().start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        backend = RedisBackend(f"redis://127.0.0.1:{port}/1", prefix="test:")
+        try:
+            return await scenario(backend)
+        finally:
+            await backend.close()
+            server.close()
+
+    return asyncio.run(main())
+
+
+def test_get_set_delete_incr():
+    async def scenario(backend):
+        assert await backend.get("key") is None
+        assert await backend.set("key", "value")
+        assert await backend.get("key") == "value"
+        await backend.delete("key")
+        assert await backend.get("key") is None
+        assert [await backend.incr("n") for _ in range(3)] == [1, 2, 3]
+
+    run_with_redis(scenario)
+
+
+def test_set_only_if_missing_and_ttl():
+    async def scenario(backend):
+        assert await backend.set("key", "a", ttl=0.05, only_if_missing=True)
+        assert not await backend.set("key", "b", only_if_missing=True)
+        assert await backend.get("key") == "a"
+        await asyncio.sleep(0.1)
+        assert await backend.get("key") is None
+
+    run_with_redis(scenario)
+
+
+def test_release_lock_checks_owner():
+    async def scenario(backend):
+        await backend.set("lock:x", "owner")
+        await backend.release_lock("lock:x", "other")
+        assert await backend.get("lock:x") == "owner"
+        await backend.release_lock("lock:x", "owner")
+        assert await backend.get("lock:x") is None
+
+    run_with_redis(scenario)
+
+
+def test_lock_serializes_holders():
+    async def scenario(backend):
+        events = []
+
+        async def worker(name):
+            async with backend.lock("draw", ttl=5, timeout=5):
+                events.append(f"{name}+")
+                await asyncio.sleep(0.05)
+                events.append(f"{name}-")
+
+        await asyncio.gather(worker("a"), worker("b"))
+        return events
+
+    events = run_with_redis(scenario)
+    assert events in (["a+", "a-", "b+", "b-"], ["b+", "b-", "a+", "a-"])
+
+
+def test_lock_times_out_while_held():
+    async def scenario(backend):
+        async with backend.lock("draw", ttl=5, timeout=5):
+            with pytest.raises(LockTimeout):
+                async with backend.lock("draw", ttl=5, timeout=0.1):
+                    pass
+
+    run_with_redis(scenario)
+
+
+def test_fsm_storage_round_trip():
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+    async def scenario(backend):
+        storage = BackendStorage(backend)
+        await storage.set_state(key, "Form:text")
+        await storage.set_data(key, {"text": "привет"})
+        assert await storage.get_state(key) == "Form:text"
+        assert await storage.get_data(key) == {"text": "привет"}
+        await storage.set_state(key, None)
+        await storage.set_data(key, {})
+        assert await storage.get_state(key) is None
+        assert await storage.get_data(key) == {}
+
+    run_with_redis(scenario)
+
+
+def test_backend_must_implement_all_operations():
+    class PartialBackend(StateBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError, match="release_lock"):
+        PartialBackend()
+    assert isinstance(MemoryBackend(), StateBackend)
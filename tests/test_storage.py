@@ -0,0 +1,150 @@
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from bot.utils import storage
+from bot.utils.storage import Storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(storage, "DB_FILE", tmp_path / "bot.db")
+    monkeypatch.setattr(storage, "CHAT_LIST_FILE", tmp_path / "chats.json")
+    monkeypatch.setattr(storage, "STATS_FILE", tmp_path / "stats.json")
+    monkeypatch.setattr(storage, "LAST_WINNER_FILE", tmp_path / "last.json")
+    monkeypatch.setattr(storage, "_storage", None)
+    yield tmp_path
+    if storage._storage is not None:
+        storage._storage.close()
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.mark.parametrize("journal_mode", ["WAL", "DELETE"])
+def test_journal_mode_is_configurable(tmp_path, journal_mode):
+    db = Storage(tmp_path / "bot.db", journal_mode)
+    try:
+        mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.upper() == journal_mode
+        db.save_chat({"id": 1, "title": "chat", "deleted": False})
+        assert db.get_chat(1)["title"] == "chat"
+    finally:
+        db.close()
+
+
+def test_failed_import_leaves_no_database(data_dir):
+    write_json(data_dir / "chats.json", [{"id": -1, "title": "chat"}])
+    write_json(data_dir / "last.json", {"-1": {"winner": {}}})
+
+    with pytest.raises(KeyError):
+        storage.get_storage()
+    assert storage._storage is None
+    assert list(data_dir.glob("bot.db*")) == []
+
+    write_json(data_dir / "last.json", {})
+    assert storage.get_storage().get_chat(-1)["title"] == "chat"
+    assert (data_dir / "bot.db").exists()
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Storage(tmp_path / "bot.db")
+    yield db
+    db.close()
+
+
+def win(db, chat_id, user_id, times=1, won_at=None):
+    for _ in range(times):
+        db.record_win(chat_id, f"chat {chat_id}", user_id,
+                      f"user {user_id}", f"u{user_id}", won_at)
+
+
+def ranking(db, chat_id, limit=10, offset=0, period=storage.ALL_TIME):
+    return [(row["user_id"], row["wins"]) for row in
+            db.get_leaderboard(chat_id, limit, offset, period)]
+
+
+def test_record_win_updates_chat_and_global_leaderboards(db):
+    win(db, -1, 10, times=2)
+    win(db, -1, 20)
+    win(db, -2, 20, times=3)
+
+    assert ranking(db, -1) == [(10, 2), (20, 1)]
+    assert ranking(db, -2) == [(20, 3)]
+    assert ranking(db, storage.GLOBAL_CHAT_ID) == [(20, 4), (10, 2)]
+    assert db.get_chat_title(-2) == "chat -2"
+    assert db.get_leaderboard(-1, 1)[0] == {
+        "user_id": 10, "full_name": "user 10", "username": "u10", "wins": 2}
+
+
+def test_leaderboard_is_sorted_and_paginated(db):
+    for user_id, wins in [(1, 1), (2, 3), (3, 2), (4, 3), (5, 1)]:
+        win(db, -1, user_id, times=wins)
+
+    assert ranking(db, -1, limit=2) == [(2, 3), (4, 3)]
+    assert ranking(db, -1, limit=2, offset=2) == [(3, 2), (1, 1)]
+    assert ranking(db, -1, limit=2, offset=4) == [(5, 1)]
+    assert ranking(db, -1, limit=2, offset=6) == []
+    assert db.count_winners(-1) == 5
+    assert db.count_winners(storage.GLOBAL_CHAT_ID) == 5
+    assert db.count_winners(-2) == 0
+
+
+@pytest.mark.parametrize("period", [storage.DAY, storage.WEEK, storage.MONTH])
+def test_period_leaderboard_counts_only_current_period(db, period):
+    now = datetime.now(timezone.utc)
+    win(db, -1, 10, times=3, won_at=now - timedelta(days=40))
+    win(db, -1, 20, won_at=now)
+    win(db, -2, 20, won_at=now)
+
+    assert ranking(db, -1, period=period) == [(20, 1)]
+    assert ranking(db, storage.GLOBAL_CHAT_ID, period=period) == [(20, 2)]
+    assert db.count_winners(-1, period) == 1
+    assert ranking(db, -1) == [(10, 3), (20, 1)]
+    assert db.count_winners(-1) == 2
+
+
+def test_compact_history_keeps_all_time_totals(db):
+    now = datetime.now(timezone.utc)
+    win(db, -1, 10, times=2, won_at=now - timedelta(days=800))
+    win(db, -1, 20, won_at=now)
+
+    db.compact_history(now)
+
+    assert ranking(db, -1) == [(10, 2), (20, 1)]
+    assert ranking(db, storage.GLOBAL_CHAT_ID) == [(10, 2), (20, 1)]
+    assert ranking(db, -1, period=storage.DAY) == [(20, 1)]
+    wins_log = db.conn.execute(
+        "SELECT user_id FROM best_qa_wins").fetchall()
+    assert [row["user_id"] for row in wins_log] == [20]
+    old_periods = db.conn.execute(
+        "SELECT COUNT(*) FROM best_qa_period_stats WHERE user_id = 10")
+    assert old_periods.fetchone()[0] == 0
+
+
+def test_import_json_files(data_dir):
+    write_json(data_dir / "chats.json", [
+        {"id": -1, "title": "one", "deleted": False},
+        {"id": -2, "title": "two", "deleted": True}])
+    write_json(data_dir / "stats.json", {
+        "-1": {"chat_title": "one", "winners": {
+            "10": {"full_name": "Ann", "username": "ann", "wins": 2},
+            "20": {"full_name": "Bob", "wins": 1}}},
+        "-2": {"chat_title": "two", "winners": {
+            "20": {"full_name": "Bob", "username": "bob", "wins": 4}}}})
+    last = {"chat_title": "one", "last_datetime": "2026-01-01T00:00:00",
+            "winner": {"user_id": 10, "full_name": "Ann",
+                       "username": "ann"}}
+    write_json(data_dir / "last.json", {"-1": last})
+
+    db = storage.get_storage()
+
+    assert [chat["id"] for chat in db.get_chats()] == [-2, -1]
+    assert db.get_chat(-2)["deleted"]
+    assert ranking(db, -1) == [(10, 2), (20, 1)]
+    assert ranking(db, storage.GLOBAL_CHAT_ID) == [(20, 5), (10, 2)]
+    assert db.get_chat_title(-2) == "two"
+    assert db.get_last_winner(-1) == last
+    assert db.get_last_winner(-2) is None
@@ -0,0 +1,49 @@
+import asyncio
+from bot.utils.stream_reply import StreamingReply, split_text
+
+
+class FakeMessage:
+    """
+    Сообщение бота: запоминает свой текст и отправленные ответы.
+    """
+
+    def __init__(self, chat: list, text: str = ""):
+        self.chat = chat
+        self.text = text
+        chat.append(self)
+
+    async def edit_text(self, text):
+        assert text.strip()
+        self.text = text
+
+    async def answer(self, text):
+        assert text.strip()
+        return FakeMessage(self.chat, text)
+
+
+def stream(chunks, limit=100):
+    chat = []
+
+    async def main():
+        reply = StreamingReply(FakeMessage(chat, "..."), 0, limit)
+        for chunk in chunks:
+            await reply.append(chunk)
+        await reply.finish()
+
+    asyncio.run(main())
+    return [message.text for message in chat]
+
+
+def test_whitespace_tail_does_not_send_empty_message():
+    assert stream(["a" * 90 + " " * 20]) == ["a" * 90 + " " * 10]
+
+
+def test_text_after_whitespace_tail_goes_to_new_message():
+    assert stream(["a" * 90 + " " * 20, "  bbb"]) == [
+        "a" * 90 + " " * 10, "bbb"]
+
+
+def test_long_answer_is_split_like_split_text():
+    text = " ".join(["word"] * 100)
+    assert stream([text[i:i + 7] for i in range(0, len(text), 7)]) == \
+        split_text(text, 100)
@@ -0,0 +1,33 @@
+import asyncio
+from aiogram import Bot, Dispatcher
+from aiohttp.test_utils import TestServer
+from bot.utils.replay_updates import REPLAY_TOKEN, ReplaySession
+from bot.utils.webhook import create_app
+from tests.fake_telegram import deliver_update, make_message_update
+
+SECRET = "test-secret"
+
+
+def test_webhook_checks_secret_token():
+    received = []
+
+    async def handle_message(message):
+        received.append(message.text)
+
+    async def scenario():
+        dp = Dispatcher()
+        dp.message.register(handle_message)
+        bot = Bot(REPLAY_TOKEN, session=ReplaySession())
+        app = create_app(dp, bot, path="/webhook", secret=SECRET)
+        async with TestServer(app) as server:
+            url = str(server.make_url("/webhook"))
+            statuses = [
+                await deliver_update(url, make_message_update("ok"), SECRET),
+                await deliver_update(url, make_message_update("no"), ""),
+                await deliver_update(url, make_message_update("bad"), "x"),
+            ]
+            await asyncio.sleep(0.05)  # Обработка идёт в фоне
+        return statuses
+
+    assert asyncio.run(scenario()) == [200, 401, 401]
+    assert received == ["ok"]